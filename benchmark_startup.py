@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Report per-import cold-start cost of the API and its model backends
+"""
+
+import os
+import subprocess
+import sys
+
+# Modules a worker may import, cheapest expected first
+MODULES = [
+    "pandas",
+    "sklearn.ensemble",
+    "scipy.signal",
+    "xgboost",
+    "statsmodels.tsa.arima.model",
+    "tensorflow",
+    "src.prediction.ml_models",
+    "src.api.main",
+    "src.api.main_fixed",
+]
+
+def measure_import(module):
+    """Import a module in a fresh interpreter and return the wall-clock seconds it took"""
+    code = (
+        "import time; start = time.perf_counter(); "
+        f"import {module}; "
+        "print(time.perf_counter() - start)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    if result.returncode != 0:
+        return None
+    return float(result.stdout.strip().splitlines()[-1])
+
+def check_backend_registry():
+    """Show which optional model backends are installed without importing them"""
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from src import backends
+
+    print("\nOptional model backends (probed, not imported):")
+    for name in backends.BACKENDS:
+        print(f"  {name:<12} {'available' if backends.is_available(name) else 'missing'}")
+
+if __name__ == "__main__":
+    print(f"{'module':<32} {'import time':>12}")
+    print("-" * 45)
+    for module in MODULES:
+        seconds = measure_import(module)
+        if seconds is None:
+            print(f"{module:<32} {'not installed':>12}")
+        else:
+            print(f"{module:<32} {seconds:>11.3f}s")
+
+    check_backend_registry()
@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Check the recursive indicator kernels against plain-Python reference loops
+and time them on a long series of minute bars.
+
+Exits non-zero if any implementation disagrees with its reference.
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.analysis import compiled_kernels
+from src.analysis.array_indicators import ArrayIndicators
+from src.analysis.streaming_indicators import IndicatorState
+from src.analysis.technical_indicators import TechnicalIndicators, calculate_all_indicators
+
+# One year of regular-session minute bars
+MINUTE_BARS = 390 * 252
+# Bars replayed through the (much slower) streaming state
+STREAMING_BARS = 5000
+TOLERANCE = 1e-8
+
+def make_bars(n, seed=0):
+    """Random-walk OHLCV minute bars with a few flat bars and a missing stretch"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.001, n)))
+    high = close * (1 + np.abs(rng.normal(0, 0.0005, n)))
+    low = close * (1 - np.abs(rng.normal(0, 0.0005, n)))
+    volume = rng.integers(100, 10000, n).astype(float)
+    flat = rng.choice(n, n // 100, replace=False)
+    high[flat] = low[flat] = close[flat]
+    index = pd.date_range('2024-01-02 09:30', periods=n, freq='min')
+    return pd.DataFrame({'open': close, 'high': high, 'low': low, 'close': close, 'volume': volume}, index=index)
+
+def reference_wilder(values, window):
+    out = [float('nan')] * len(values)
+    start = next((i for i, v in enumerate(values) if v == v), len(values))
+    if start + window > len(values):
+        return out
+    value = sum(values[start:start + window]) / window
+    out[start + window - 1] = value
+    for i in range(start + window, len(values)):
+        value = value + (values[i] - value) / window
+        out[i] = value
+    return out
+
+def reference_adx(high, low, close, window=14):
+    n = len(close)
+    plus_dm, minus_dm, tr = [float('nan')], [float('nan')], [float('nan')]
+    for i in range(1, n):
+        up, down = high[i] - high[i - 1], low[i - 1] - low[i]
+        plus_dm.append(up if up > down and up > 0 else 0.0)
+        minus_dm.append(down if down > up and down > 0 else 0.0)
+        tr.append(max(high[i] - low[i], abs(high[i] - close[i - 1]), abs(low[i] - close[i - 1])))
+
+    smoothed_tr = reference_wilder(tr, window)
+    smoothed_plus, smoothed_minus = reference_wilder(plus_dm, window), reference_wilder(minus_dm, window)
+    dx = []
+    for s_tr, s_plus, s_minus in zip(smoothed_tr, smoothed_plus, smoothed_minus):
+        plus_di = 0.0 if s_tr == 0 else 100 * s_plus / s_tr
+        minus_di = 0.0 if s_tr == 0 else 100 * s_minus / s_tr
+        total = plus_di + minus_di
+        dx.append(0.0 if total == 0 else 100 * abs(plus_di - minus_di) / total)
+    return reference_wilder(dx, window)
+
+def reference_psar(high, low, step=0.02, max_step=0.2):
+    out = [float('nan')] * len(high)
+    uptrend, sar, extreme, factor = True, low[0], high[0], step
+    for i in range(1, len(high)):
+        sar = sar + factor * (extreme - sar)
+        if uptrend:
+            sar = min(sar, low[i - 1], low[max(i - 2, 0)])
+            if low[i] < sar:
+                uptrend, sar, extreme, factor = False, extreme, low[i], step
+            elif high[i] > extreme:
+                extreme, factor = high[i], min(factor + step, max_step)
+        else:
+            sar = max(sar, high[i - 1], high[max(i - 2, 0)])
+            if high[i] > sar:
+                uptrend, sar, extreme, factor = True, extreme, high[i], step
+            elif low[i] < extreme:
+                extreme, factor = low[i], min(factor + step, max_step)
+        out[i] = sar
+    return out
+
+def reference_obv(close, volume):
+    out = [volume[0]]
+    for i in range(1, len(close)):
+        if close[i] > close[i - 1]:
+            out.append(out[-1] + volume[i])
+        elif close[i] < close[i - 1]:
+            out.append(out[-1] - volume[i])
+        else:
+            out.append(out[-1])
+    return out
+
+def reference_ad(high, low, close, volume):
+    out, total = [], 0.0
+    for h, l, c, v in zip(high, low, close, volume):
+        total += 0.0 if h == l else ((c - l) - (h - c)) / (h - l) * v
+        out.append(total)
+    return out
+
+def max_error(expected, actual):
+    """Largest relative difference, or inf if the NaN positions differ"""
+    expected, actual = np.asarray(expected, dtype=float), np.asarray(actual, dtype=float)
+    if not np.array_equal(np.isnan(expected), np.isnan(actual)):
+        return float('inf')
+    valid = ~np.isnan(expected)
+    if not valid.any():
+        return 0.0
+    return float(np.max(np.abs(expected[valid] - actual[valid]) / np.maximum(1, np.abs(expected[valid]))))
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+if __name__ == "__main__":
+    bars = make_bars(MINUTE_BARS)
+    high, low, close, volume = (bars[col].to_numpy() for col in ['high', 'low', 'close', 'volume'])
+    true_range = ArrayIndicators.true_range(high, low, close)
+    lists = [high.tolist(), low.tolist(), close.tolist(), volume.tolist()]
+
+    references = {
+        'Wilder(TR)': timed(reference_wilder, true_range.tolist(), 14),
+        'ADX': timed(reference_adx, *lists[:3]),
+        'PSAR': timed(reference_psar, *lists[:2]),
+        'OBV': timed(reference_obv, lists[2], lists[3]),
+        'AD_Line': timed(reference_ad, *lists),
+    }
+
+    modes = {'fallback': False}
+    if compiled_kernels.jit_enabled(True):
+        modes['compiled'] = True
+        # Compile outside the timed runs
+        compiled_kernels.parabolic_sar(high[:10], low[:10], jit=True)
+        compiled_kernels.wilder_smooth(true_range[:20], jit=True)
+    else:
+        print("numba is not installed; only the fallback kernels are checked\n")
+
+    candidates = []
+    for mode, jit in modes.items():
+        candidates += [
+            ('Wilder(TR)', mode, lambda jit=jit: compiled_kernels.wilder_smooth(true_range, 14, jit=jit)),
+            ('ADX', mode, lambda jit=jit: compiled_kernels.wilder_adx(high, low, true_range, 14, jit=jit)),
+            ('PSAR', mode, lambda jit=jit: compiled_kernels.parabolic_sar(high, low, jit=jit)),
+        ]
+    candidates += [
+        ('ADX', 'pandas', lambda: TechnicalIndicators.adx(bars['high'], bars['low'], bars['close'])),
+        ('ADX', 'numpy', lambda: ArrayIndicators.adx(high, low, close)),
+        ('PSAR', 'numpy', lambda: ArrayIndicators.parabolic_sar(high, low)),
+        ('OBV', 'pandas', lambda: TechnicalIndicators.obv(bars['close'], bars['volume'])),
+        ('OBV', 'numpy', lambda: ArrayIndicators.obv(close, volume)),
+        ('AD_Line', 'pandas', lambda: TechnicalIndicators.accumulation_distribution(
+            bars['high'], bars['low'], bars['close'], bars['volume'])),
+        ('AD_Line', 'numpy', lambda: ArrayIndicators.accumulation_distribution(high, low, close, volume)),
+    ]
+
+    failures = 0
+    print(f"{MINUTE_BARS} minute bars")
+    print(f"{'indicator':<12} {'implementation':<16} {'time':>10} {'max rel err':>12}")
+    print("-" * 53)
+    for name, (expected, seconds) in references.items():
+        print(f"{name:<12} {'python loop':<16} {seconds:>9.3f}s {'-':>12}")
+        for candidate, mode, func in candidates:
+            if candidate != name:
+                continue
+            result, seconds = timed(func)
+            error = max_error(expected, result)
+            ok = error <= TOLERANCE
+            failures += not ok
+            print(f"{'':<12} {mode:<16} {seconds:>9.3f}s {error:>12.2e}{'' if ok else '  MISMATCH'}")
+
+    # Streaming state and the graph backends on a shorter prefix
+    prefix = bars.iloc[:STREAMING_BARS]
+    state = IndicatorState()
+    streamed = pd.DataFrame([state.update(bar._asdict()) for bar in prefix.itertuples(index=False)])
+    print(f"\nStreaming vs reference over {STREAMING_BARS} bars")
+    for name, column in [('ADX', 'ADX'), ('PSAR', 'PSAR'), ('OBV', 'OBV'), ('AD_Line', 'AD_Line')]:
+        error = max_error(references[name][0][:STREAMING_BARS], streamed[column])
+        ok = error <= TOLERANCE
+        failures += not ok
+        print(f"  {name:<10} {error:>12.2e}{'' if ok else '  MISMATCH'}")
+
+    print("\nGraph backends (pandas vs numpy), all indicator columns")
+    by_pandas, pandas_seconds = timed(calculate_all_indicators, bars)
+    by_numpy, numpy_seconds = timed(calculate_all_indicators, bars, backend='numpy')
+    worst = max((max_error(by_pandas[col], by_numpy[col]), col) for col in by_pandas.columns)
+    failures += worst[0] > TOLERANCE
+    print(f"  pandas {pandas_seconds:.3f}s, numpy {numpy_seconds:.3f}s, worst {worst[1]} {worst[0]:.2e}")
+
+    if failures:
+        print(f"\n{failures} mismatch(es)")
+        sys.exit(1)
+    print("\nAll kernels match their references")
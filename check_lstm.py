@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Train the LSTM on a short synthetic series for a few epochs and check that
+a pickled StockPredictor reloads the saved network and forecasts the same,
+then check that it also trains on the target series /predict derives from
+the default year of daily bars.
+
+Exits 0 without checking anything when TensorFlow is not installed, and
+non-zero if training fails or the forecasts differ.
+"""
+
+import os
+import sys
+import time
+import pickle
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from src.prediction import lstm
+from src.prediction.ml_models import StockPredictor, TENSORFLOW_AVAILABLE
+
+# Long enough for a validation tail after purging the 30-day horizon
+BARS = 800
+# Trading days in the 365 calendar days /predict fetches by default
+DEFAULT_HISTORY_BARS = 252
+EPOCHS = 3
+TOLERANCE = 1e-6
+
+def make_closes(n, seed=0):
+    """Random-walk daily closes"""
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, n)))
+    return pd.Series(close, index=pd.bdate_range('2020-01-01', periods=n), name='close')
+
+def default_history_target():
+    """Close series train_models hands the LSTM for a default /predict history"""
+    from src.prediction.pipeline import INDICATOR_COLUMNS, MODEL_GRAPH_FEATURES, calculate_all_indicators
+    close = make_closes(DEFAULT_HISTORY_BARS, seed=1)
+    frame = pd.DataFrame({
+        'open': close,
+        'high': close * 1.01,
+        'low': close * 0.99,
+        'close': close,
+        'volume': 1e6
+    })
+    indicators = calculate_all_indicators(frame, columns=INDICATOR_COLUMNS + MODEL_GRAPH_FEATURES)
+    return StockPredictor().prepare_features(indicators)[1]
+
+def forecast(predictor, closes):
+    """Forecast curve from the last SEQUENCE_LENGTH closes, as predict_future"""
+    window = closes.to_numpy(dtype=np.float32)[-lstm.SEQUENCE_LENGTH:].reshape(-1, 1)
+    model = predictor._lstm_for_inference()
+    if model is None:
+        raise RuntimeError("No LSTM to forecast with")
+    return predictor._lstm_unscale(lstm.lstm_forecast(model, predictor.lstm_scaler.transform(window)))
+
+if __name__ == "__main__":
+    if not TENSORFLOW_AVAILABLE:
+        print("TensorFlow is not installed; skipping the LSTM check")
+        sys.exit(0)
+
+    lstm.LSTM_MAX_EPOCHS = EPOCHS
+    closes = make_closes(BARS)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        lstm.settings.model.cache_dir = cache_dir
+        predictor = StockPredictor('CHECK')
+
+        start = time.perf_counter()
+        metrics = predictor.train_lstm_model(closes)
+        print(f"Trained on {BARS} bars in {time.perf_counter() - start:.1f}s: {metrics}")
+        if 'error' in metrics or not predictor.lstm_path:
+            print("\nLSTM training failed")
+            sys.exit(1)
+
+        before = forecast(predictor, closes)
+        restored = pickle.loads(pickle.dumps(predictor))
+        if restored.lstm_model is not None:
+            print("\nThe pickled predictor carried the Keras model")
+            sys.exit(1)
+        after = forecast(restored, closes)
+
+        error = float(np.max(np.abs(before - after)))
+        print(f"Forecast {np.round(before, 4).tolist()}")
+        print(f"Reloaded {np.round(after, 4).tolist()} (max abs diff {error:.2e})")
+        if not np.all(np.isfinite(before)) or error > TOLERANCE:
+            print("\nForecasts differ after the pickle round-trip")
+            sys.exit(1)
+
+        target = default_history_target()
+        metrics = StockPredictor().train_lstm_model(target)
+        print(f"\nTrained on the {len(target)}-row target of {DEFAULT_HISTORY_BARS} bars: {metrics}")
+        if 'error' in metrics:
+            print("\nLSTM does not train on the default /predict history")
+            sys.exit(1)
+
+    print("\nLSTM trains, saves and reloads, and trains on the default history")
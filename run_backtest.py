@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Run a walk-forward backtest of the prediction models over a symbol universe
+
+Usage:
+    python run_backtest.py [SYMBOLS] [--years 10] [--window expanding|rolling] [--horizon 30] [--output FILE]
+
+SYMBOLS is a comma-separated list (defaults to SCAN_UNIVERSE).
+"""
+
+import argparse
+import json
+import time
+
+from src.analysis.scanner import resolve_universe
+from src.data.marketstack import marketstack_client
+from src.prediction.backtest import WalkForwardBacktester, prepare_indicators
+from src.utils import json_value
+
+def _jsonable(value):
+    """Recursively convert numpy scalars and tuples for json.dump"""
+    if isinstance(value, dict):
+        return {key: _jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(item) for item in value]
+    return json_value(value)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("symbols", nargs="?", help="Comma-separated symbols (default: SCAN_UNIVERSE)")
+    parser.add_argument("--years", type=int, default=10, help="Years of daily history")
+    parser.add_argument("--window", choices=["expanding", "rolling"], default="expanding")
+    parser.add_argument("--train-size", type=int, default=504, help="Rows in the first training window")
+    parser.add_argument("--test-size", type=int, default=63, help="Rows scored per fold")
+    parser.add_argument("--horizon", type=int, default=30, help="Bars ahead predicted and held per signal")
+    parser.add_argument("--refit-every", type=int, default=4, help="Folds between full refits")
+    parser.add_argument("--models", help="Comma-separated model names (default: all)")
+    parser.add_argument("--workers", type=int, default=None, help="Worker processes (default: BACKTEST_WORKERS)")
+    parser.add_argument("--output", default="backtest_results.json")
+    args = parser.parse_args()
+
+    symbols = resolve_universe(args.symbols)
+    start = time.perf_counter()
+    frames = marketstack_client.get_stock_data_batch(symbols, days=args.years * 365)
+    indicators = prepare_indicators(frames)
+    print(f"Loaded {len(indicators)}/{len(symbols)} symbols in {time.perf_counter() - start:.1f}s")
+
+    backtester = WalkForwardBacktester(
+        train_size=args.train_size, test_size=args.test_size, window=args.window,
+        models=args.models.split(",") if args.models else None,
+        refit_every=args.refit_every, horizon=args.horizon, max_workers=args.workers
+    )
+    start = time.perf_counter()
+    results = backtester.run(indicators)
+    print(f"Backtested {len(results)} symbols in {time.perf_counter() - start:.1f}s")
+
+    for symbol, result in results.items():
+        if "pnl" in result:
+            pnl = result["pnl"]
+            print(f"{symbol:<8} folds={len(result['folds']):<3} return={pnl['total_return']:+.2%} "
+                  f"buy&hold={pnl['buy_and_hold_return']:+.2%} sharpe={pnl['sharpe_ratio']:.2f} "
+                  f"max_dd={pnl['max_drawdown']:.2%}")
+        else:
+            print(f"{symbol:<8} {result['error']}")
+
+    # Daily series stay in memory; the report keeps fold metrics and P&L
+    report = {symbol: {key: value for key, value in result.items() if key != "daily"}
+              for symbol, result in results.items()}
+    with open(args.output, "w") as f:
+        json.dump(_jsonable(report), f, indent=2)
+    print(f"Results written to {args.output}")
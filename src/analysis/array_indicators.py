@@ -0,0 +1,327 @@
+"""
+Pure-NumPy technical indicator backend operating on contiguous float arrays.
+"""
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from scipy.signal import lfilter
+from typing import Dict, List, Optional, Tuple, Union
+
+ArrayLike = Union[np.ndarray, pd.Series]
+
+def _as_array(data: ArrayLike) -> np.ndarray:
+    """Convert input to a contiguous float32/float64 array without copying when possible"""
+    values = data.to_numpy() if isinstance(data, (pd.Series, pd.DataFrame)) else np.asarray(data)
+    dtype = values.dtype if values.dtype in (np.float32, np.float64) else np.float64
+    return np.ascontiguousarray(values, dtype=dtype)
+
+def _nan_like(x: np.ndarray) -> np.ndarray:
+    return np.full(x.shape, np.nan, dtype=x.dtype)
+
+def _shift(x: np.ndarray, periods: int = 1) -> np.ndarray:
+    """Shift along axis 0, padding with NaN (like pd.Series.shift)"""
+    out = _nan_like(x)
+    out[periods:] = x[:-periods]
+    return out
+
+def _first_valid_row(x: np.ndarray) -> np.ndarray:
+    """Index of the first non-NaN row of each column (len(x) if none)"""
+    valid = ~np.isnan(x)
+    return np.where(valid.any(axis=0), valid.argmax(axis=0), len(x))
+
+def _mask_before(x: np.ndarray, start: np.ndarray) -> np.ndarray:
+    """Set rows before each column's start row to NaN (in place)"""
+    rows = np.arange(len(x)).reshape((-1,) + (1,) * (x.ndim - 1))
+    x[rows < start] = np.nan
+    return x
+
+def _rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    """Rolling mean via cumulative sums; NaN when the window holds any NaN"""
+    out = _nan_like(x)
+    if len(x) < window:
+        return out
+
+    valid = ~np.isnan(x)
+    pad = np.zeros((1,) + x.shape[1:])
+    sums = np.concatenate([pad, np.cumsum(np.where(valid, x, 0), axis=0, dtype=np.float64)])
+    missing = np.concatenate([pad, np.cumsum(~valid, axis=0, dtype=np.float64)])
+
+    window_sum = sums[window:] - sums[:-window]
+    window_missing = missing[window:] - missing[:-window]
+    out[window - 1:] = np.where(window_missing == 0, window_sum / window, np.nan)
+    return out
+
+def _rolling_reduce(x: np.ndarray, window: int, func, **kwargs) -> np.ndarray:
+    """Apply a reduction over strided rolling windows (NaN propagates)"""
+    out = _nan_like(x)
+    if len(x) < window:
+        return out
+    windows = sliding_window_view(x, window, axis=0)
+    out[window - 1:] = func(windows, axis=-1, **kwargs)
+    return out
+
+class ArrayIndicators:
+    """Technical indicators on NumPy arrays, vectorized along axis 0"""
+
+    @staticmethod
+    def sma(data: ArrayLike, window: int = 20) -> np.ndarray:
+        """Simple Moving Average"""
+        return _rolling_mean(_as_array(data), window)
+
+    @staticmethod
+    def ema(data: ArrayLike, window: int = 20) -> np.ndarray:
+        """Exponential Moving Average (matches pandas ewm(span=window).mean())"""
+        x = _as_array(data)
+        decay = 1 - 2 / (window + 1)
+        valid = ~np.isnan(x)
+
+        # Adjusted EWM as a ratio of two first-order recursive filters
+        numerator = lfilter([1.0], [1.0, -decay], np.where(valid, x, 0).astype(np.float64), axis=0)
+        denominator = lfilter([1.0], [1.0, -decay], valid.astype(np.float64), axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return (numerator / denominator).astype(x.dtype)
+
+    @staticmethod
+    def wma(data: ArrayLike, window: int = 20) -> np.ndarray:
+        """Weighted Moving Average"""
+        x = _as_array(data)
+        out = _nan_like(x)
+        if len(x) < window:
+            return out
+
+        weights = np.arange(1, window + 1, dtype=np.float64)
+        weights /= weights.sum()
+        if x.ndim == 1:
+            out[window - 1:] = np.convolve(x, weights[::-1], mode='valid')
+        else:
+            out[window - 1:] = sliding_window_view(x, window, axis=0) @ weights
+        return out
+
+    @staticmethod
+    def rsi(data: ArrayLike, window: int = 14) -> np.ndarray:
+        """Relative Strength Index"""
+        x = _as_array(data)
+        delta = x - _shift(x)
+        # Gains/losses are zero-filled from each column's first bar, as delta.where(...) does
+        start = _first_valid_row(x)
+        gain = _rolling_mean(_mask_before(np.where(delta > 0, delta, 0).astype(x.dtype), start), window)
+        loss = _rolling_mean(_mask_before(np.where(delta < 0, -delta, 0).astype(x.dtype), start), window)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            rs = gain / loss
+            return 100 - (100 / (1 + rs))
+
+    @staticmethod
+    def macd(data: ArrayLike, fast: int = 12, slow: int = 26, signal: int = 9) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """MACD (Moving Average Convergence Divergence)"""
+        x = _as_array(data)
+        macd_line = ArrayIndicators.ema(x, fast) - ArrayIndicators.ema(x, slow)
+        signal_line = ArrayIndicators.ema(macd_line, signal)
+        return macd_line, signal_line, macd_line - signal_line
+
+    @staticmethod
+    def bollinger_bands(data: ArrayLike, window: int = 20, num_std: float = 2) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Bollinger Bands"""
+        x = _as_array(data)
+        sma = _rolling_mean(x, window)
+        std = _rolling_reduce(x, window, np.std, ddof=1)
+        return sma + std * num_std, sma, sma - std * num_std
+
+    @staticmethod
+    def stochastic_oscillator(high: ArrayLike, low: ArrayLike, close: ArrayLike, k_window: int = 14, d_window: int = 3) -> Tuple[np.ndarray, np.ndarray]:
+        """Stochastic Oscillator"""
+        close = _as_array(close)
+        lowest_low = _rolling_reduce(_as_array(low), k_window, np.min)
+        highest_high = _rolling_reduce(_as_array(high), k_window, np.max)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            k_percent = 100 * ((close - lowest_low) / (highest_high - lowest_low))
+        return k_percent, _rolling_mean(k_percent, d_window)
+
+    @staticmethod
+    def true_range(high: ArrayLike, low: ArrayLike, close: ArrayLike) -> np.ndarray:
+        """True Range (NaN components are skipped like DataFrame.max)"""
+        high, low, close = _as_array(high), _as_array(low), _as_array(close)
+        prev_close = _shift(close)
+        return np.fmax(np.fmax(high - low, np.abs(high - prev_close)), np.abs(low - prev_close))
+
+    @staticmethod
+    def atr(high: ArrayLike, low: ArrayLike, close: ArrayLike, window: int = 14) -> np.ndarray:
+        """Average True Range"""
+        return _rolling_mean(ArrayIndicators.true_range(high, low, close), window)
+
+    @staticmethod
+    def adx(high: ArrayLike, low: ArrayLike, close: ArrayLike, window: int = 14) -> np.ndarray:
+        """Average Directional Index (Wilder smoothing)"""
+        from src.analysis.compiled_kernels import wilder_adx
+        high, low = _as_array(high), _as_array(low)
+        true_range = ArrayIndicators.true_range(high, low, close)
+        return wilder_adx(high, low, true_range, window).astype(high.dtype)
+
+    @staticmethod
+    def obv(close: ArrayLike, volume: ArrayLike) -> np.ndarray:
+        """On-Balance Volume as a cumulative sum of sign-of-change times volume"""
+        close, volume = _as_array(close), _as_array(volume)
+        if len(close) == 0:
+            return _nan_like(close)
+
+        prev_close = _shift(close)
+        direction = np.where(close > prev_close, 1, np.where(close < prev_close, -1, 0))
+        steps = np.where(direction != 0, direction * volume, 0).astype(np.float64)
+
+        # Each column starts from the volume of its first bar; summing it in
+        # place keeps the same order of additions as a running total
+        start = _first_valid_row(close)
+        first_row = np.expand_dims(np.minimum(start, len(close) - 1), 0)
+        np.put_along_axis(steps, first_row, np.take_along_axis(volume, first_row, axis=0), axis=0)
+        out = np.cumsum(steps, axis=0).astype(close.dtype)
+        return _mask_before(out, start)
+
+    @staticmethod
+    def vwap(high: ArrayLike, low: ArrayLike, close: ArrayLike, volume: ArrayLike) -> np.ndarray:
+        """Volume Weighted Average Price"""
+        high, low, close, volume = _as_array(high), _as_array(low), _as_array(close), _as_array(volume)
+        typical_price = (high + low + close) / 3
+        price_volume = typical_price * volume
+        missing = np.isnan(price_volume)
+
+        # Missing bars are skipped in the running sums, like Series.cumsum()
+        with np.errstate(invalid='ignore', divide='ignore'):
+            vwap = (np.cumsum(np.where(missing, 0, price_volume), axis=0, dtype=np.float64) /
+                    np.cumsum(np.where(missing, 0, volume), axis=0, dtype=np.float64))
+        vwap[missing] = np.nan
+        return vwap.astype(close.dtype)
+
+    @staticmethod
+    def williams_r(high: ArrayLike, low: ArrayLike, close: ArrayLike, window: int = 14) -> np.ndarray:
+        """Williams %R"""
+        close = _as_array(close)
+        highest_high = _rolling_reduce(_as_array(high), window, np.max)
+        lowest_low = _rolling_reduce(_as_array(low), window, np.min)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return -100 * ((highest_high - close) / (highest_high - lowest_low))
+
+    @staticmethod
+    def parabolic_sar(high: ArrayLike, low: ArrayLike, step: float = 0.02, max_step: float = 0.2) -> np.ndarray:
+        """Parabolic SAR"""
+        from src.analysis.compiled_kernels import parabolic_sar
+        high = _as_array(high)
+        return parabolic_sar(high, _as_array(low), step, max_step).astype(high.dtype)
+
+    @staticmethod
+    def ichimoku(high: ArrayLike, low: ArrayLike, conversion: int = 9, base: int = 26,
+                 span_b: int = 52, displacement: int = 26) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Ichimoku Cloud (conversion line, base line, leading spans A and B)"""
+        high, low = _as_array(high), _as_array(low)
+
+        def midpoint(window: int) -> np.ndarray:
+            return (_rolling_reduce(high, window, np.max) + _rolling_reduce(low, window, np.min)) / 2
+
+        tenkan, kijun = midpoint(conversion), midpoint(base)
+        senkou_a = _shift((tenkan + kijun) / 2, displacement)
+        senkou_b = _shift(midpoint(span_b), displacement)
+        return tenkan, kijun, senkou_a, senkou_b
+
+    @staticmethod
+    def money_flow_volume(high: ArrayLike, low: ArrayLike, close: ArrayLike, volume: ArrayLike) -> np.ndarray:
+        """Close location value times volume (zero for a flat bar)"""
+        high, low, close, volume = _as_array(high), _as_array(low), _as_array(close), _as_array(volume)
+        price_range = high - low
+        with np.errstate(invalid='ignore', divide='ignore'):
+            location = np.where(price_range == 0, 0, ((close - low) - (high - close)) / price_range)
+        return location * volume
+
+    @staticmethod
+    def accumulation_distribution(high: ArrayLike, low: ArrayLike, close: ArrayLike, volume: ArrayLike) -> np.ndarray:
+        """Accumulation/Distribution Line"""
+        return _nan_skipping_cumsum(ArrayIndicators.money_flow_volume(high, low, close, volume))
+
+    @staticmethod
+    def chaikin_money_flow(high: ArrayLike, low: ArrayLike, close: ArrayLike, volume: ArrayLike, window: int = 20) -> np.ndarray:
+        """Chaikin Money Flow"""
+        money_flow = ArrayIndicators.money_flow_volume(high, low, close, volume)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return _rolling_mean(money_flow, window) / _rolling_mean(_as_array(volume), window)
+
+    @staticmethod
+    def roc(data: ArrayLike, window: int = 12) -> np.ndarray:
+        """Rate of Change in percent (NaN when the base value is zero)"""
+        x = _as_array(data)
+        base = _shift(x, window)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(base == 0, np.nan, (x - base) / base * 100)
+
+    @staticmethod
+    def momentum(data: ArrayLike, window: int = 10) -> np.ndarray:
+        """Momentum (price change over the window)"""
+        x = _as_array(data)
+        return x - _shift(x, window)
+
+def _nan_skipping_cumsum(x: np.ndarray) -> np.ndarray:
+    """Cumulative sum along axis 0 that skips NaN (NaN stays at missing rows), like Series.cumsum()"""
+    missing = np.isnan(x)
+    out = np.cumsum(np.where(missing, 0, x), axis=0, dtype=np.float64).astype(x.dtype)
+    out[missing] = np.nan
+    return out
+
+def compute_indicator_arrays(high: ArrayLike, low: ArrayLike, close: ArrayLike, volume: ArrayLike,
+                             columns: Optional[List[str]] = None) -> Dict[str, np.ndarray]:
+    """
+    Compute every indicator produced by calculate_all_indicators as arrays
+
+    Args:
+        high, low, close, volume: Price/volume arrays (or Series)
+        columns: Optional subset of indicator columns (see indicator_graph)
+
+    Returns:
+        Dictionary mapping indicator column names to arrays
+    """
+    from src.analysis.indicator_graph import compute_indicators
+
+    data = {'high': high, 'low': low, 'close': close, 'volume': volume}
+    return compute_indicators(data, columns, backend='numpy')
+
+# Bars of history used for the latest-row snapshot. EMA-based columns
+# (EMA_12/26, MACD*) are truncated to this window; the neglected weight is
+# (1 - 2/27)**300 ~ 1e-10, so they match the full computation to ~1e-9
+# relative. ADX (Wilder smoothing, weight (13/14)**300 ~ 2e-10) is close to
+# that. Every other column is exact.
+SNAPSHOT_WARMUP = 300
+
+def compute_latest_indicators(high: ArrayLike, low: ArrayLike, close: ArrayLike, volume: ArrayLike,
+                              warmup: int = SNAPSHOT_WARMUP) -> Dict[str, float]:
+    """
+    Compute only the final value of every indicator
+
+    Windowed indicators run over the trailing ``warmup`` bars; cumulative
+    ones (OBV, VWAP, AD_Line) are reduced over the full history without
+    building intermediate series, and Parabolic SAR, which never forgets its
+    starting point, runs its linear kernel over the full history.
+
+    Args:
+        high, low, close, volume: Price/volume arrays (or Series)
+        warmup: Trailing bars used for windowed/EMA indicators
+
+    Returns:
+        Dictionary mapping indicator column names to their latest value
+    """
+    high, low, close, volume = _as_array(high), _as_array(low), _as_array(close), _as_array(volume)
+    if len(close) == 0:
+        return {}
+
+    tail = slice(max(0, len(close) - warmup), None)
+    arrays = compute_indicator_arrays(high[tail], low[tail], close[tail], volume[tail])
+    latest = {name: float(values[-1]) for name, values in arrays.items()}
+
+    # Cumulative indicators depend on the whole history
+    if len(close) > warmup:
+        changes = np.sign(close[1:] - close[:-1])
+        changes[np.isnan(changes)] = 0
+        latest['OBV'] = float(volume[0] + np.dot(changes, volume[1:]))
+
+        typical_price = (high + low + close) / 3
+        total_volume = volume.sum(dtype=np.float64)
+        latest['VWAP'] = float(np.dot(typical_price, volume) / total_volume) if total_volume else float('nan')
+
+        latest['AD_Line'] = float(np.nansum(ArrayIndicators.money_flow_volume(high, low, close, volume)))
+        latest['PSAR'] = float(ArrayIndicators.parabolic_sar(high, low)[-1])
+
+    return latest
@@ -0,0 +1,212 @@
+"""
+Linear-time kernels for recursive (path-dependent) indicators.
+
+The loops are compiled with numba on first use when it is installed and
+settings.analysis.indicator_jit is on. Without numba, Wilder smoothing falls
+back to a scipy recursive filter and Parabolic SAR runs the same loop in
+plain Python over lists, which is faster than indexing NumPy arrays per bar.
+"""
+import numpy as np
+from scipy.signal import lfilter
+from typing import Callable, Dict, Optional
+from src.config import get_settings
+from src import backends
+
+settings = get_settings()
+
+_compiled: Dict[str, Callable] = {}
+
+def jit_enabled(jit: Optional[bool] = None) -> bool:
+    """Whether kernels should run compiled (numba installed and enabled)"""
+    if jit is None:
+        jit = settings.analysis.indicator_jit
+    return jit and backends.is_available('numba')
+
+def _compile(func: Callable) -> Callable:
+    """Compile a loop kernel with numba once per process"""
+    if func.__name__ not in _compiled:
+        numba = backends.load('numba')
+        _compiled[func.__name__] = numba.njit(cache=True, nogil=True)(func)
+    return _compiled[func.__name__]
+
+def _as_columns(x: np.ndarray) -> np.ndarray:
+    """View a 1-D series as a single-column 2-D float64 array"""
+    x = np.ascontiguousarray(x, dtype=np.float64)
+    return x.reshape(-1, 1) if x.ndim == 1 else x
+
+def _wilder_loop(x, window, out):
+    """Wilder smoothing per column: seeded with the mean of the first window values"""
+    rows, cols = x.shape
+    for j in range(cols):
+        start = 0
+        while start < rows and x[start, j] != x[start, j]:
+            start += 1
+        seed_end = start + window
+        if seed_end > rows:
+            continue
+        total = 0.0
+        for i in range(start, seed_end):
+            total += x[i, j]
+        value = total / window
+        out[seed_end - 1, j] = value
+        for i in range(seed_end, rows):
+            value += (x[i, j] - value) / window
+            out[i, j] = value
+
+def _wilder_filter(x: np.ndarray, window: int) -> np.ndarray:
+    """NumPy/scipy fallback for _wilder_loop using a first-order recursive filter"""
+    from src.analysis.array_indicators import _first_valid_row, _rolling_mean
+
+    out = np.full(x.shape, np.nan)
+    seed = _first_valid_row(x) + window - 1
+    rows = np.arange(len(x)).reshape(-1, 1)
+    if not (seed < len(x)).any():
+        return out
+
+    # y[seed] = mean of the first window values; y[t] = (1 - 1/w) y[t-1] + x[t] / w after it
+    seed_rows = np.minimum(seed, len(x) - 1)
+    seed_means = np.take_along_axis(_rolling_mean(x, window), seed_rows.reshape(1, -1), axis=0)
+    impulses = np.where(rows > seed, x / window, 0.0)
+    np.put_along_axis(impulses, seed_rows.reshape(1, -1), seed_means, axis=0)
+
+    smoothed = lfilter([1.0], [1.0, -(1 - 1 / window)], impulses, axis=0)
+    return np.where(rows >= seed, smoothed, np.nan)
+
+def wilder_smooth(x: np.ndarray, window: int = 14, jit: Optional[bool] = None) -> np.ndarray:
+    """
+    Wilder's smoothing (RMA) along axis 0
+
+    Each column starts at its first non-NaN value; the first output is the
+    mean of the first ``window`` values and later ones follow
+    ``s[t] = s[t-1] + (x[t] - s[t-1]) / window``. A NaN after the start
+    propagates, as in a recursive filter.
+
+    Args:
+        x: 1-D series or 2-D (rows x columns) array
+        window: Smoothing period
+        jit: Force (True) or disable (False) the compiled kernel
+
+    Returns:
+        Smoothed array with the shape of x
+    """
+    values = _as_columns(x)
+    if jit_enabled(jit):
+        out = np.full(values.shape, np.nan)
+        _compile(_wilder_loop)(values, window, out)
+    else:
+        out = _wilder_filter(values, window)
+    return out.reshape(np.shape(x))
+
+def _parabolic_sar_loop(high, low, step, max_step, out):
+    """Parabolic SAR of one column (arrays or lists); bars with a missing high or low are skipped"""
+    started = False
+    uptrend = True
+    sar = 0.0
+    extreme = 0.0
+    factor = step
+    prev_high = prev_low = 0.0
+    prev2_high = prev2_low = 0.0
+    for i in range(len(high)):
+        h = high[i]
+        l = low[i]
+        if h != h or l != l:
+            continue
+        if not started:
+            # First bar: assume an uptrend starting at its low
+            started = True
+            sar = l
+            extreme = h
+            factor = step
+            prev_high = prev2_high = h
+            prev_low = prev2_low = l
+            continue
+
+        sar = sar + factor * (extreme - sar)
+        if uptrend:
+            # SAR may not rise above the prior two lows
+            sar = min(sar, prev_low, prev2_low)
+            if l < sar:
+                uptrend = False
+                sar = extreme
+                extreme = l
+                factor = step
+            elif h > extreme:
+                extreme = h
+                factor = min(factor + step, max_step)
+        else:
+            # SAR may not fall below the prior two highs
+            sar = max(sar, prev_high, prev2_high)
+            if h > sar:
+                uptrend = True
+                sar = extreme
+                extreme = h
+                factor = step
+            elif l < extreme:
+                extreme = l
+                factor = min(factor + step, max_step)
+
+        out[i] = sar
+        prev2_high, prev2_low = prev_high, prev_low
+        prev_high, prev_low = h, l
+
+def parabolic_sar(high: np.ndarray, low: np.ndarray, step: float = 0.02, max_step: float = 0.2,
+                  jit: Optional[bool] = None) -> np.ndarray:
+    """
+    Parabolic SAR (stop and reverse) along axis 0
+
+    Args:
+        high, low: 1-D series or 2-D (rows x columns) arrays
+        step: Acceleration factor increment
+        max_step: Maximum acceleration factor
+        jit: Force (True) or disable (False) the compiled kernel
+
+    Returns:
+        SAR array with the shape of high (NaN on each column's first bar)
+    """
+    highs, lows = _as_columns(high), _as_columns(low)
+    out = np.full(highs.shape, np.nan)
+    compiled = jit_enabled(jit)
+    kernel = _compile(_parabolic_sar_loop) if compiled else _parabolic_sar_loop
+    for j in range(highs.shape[1]):
+        if compiled:
+            kernel(highs[:, j], lows[:, j], float(step), float(max_step), out[:, j])
+        else:
+            # Python floats in lists avoid a NumPy scalar per element access
+            column = out[:, j].tolist()
+            kernel(highs[:, j].tolist(), lows[:, j].tolist(), float(step), float(max_step), column)
+            out[:, j] = column
+    return out.reshape(np.shape(high))
+
+def wilder_adx(high: np.ndarray, low: np.ndarray, true_range: np.ndarray, window: int = 14,
+               jit: Optional[bool] = None) -> np.ndarray:
+    """
+    Average Directional Index with Wilder smoothing
+
+    Args:
+        high, low: Price arrays
+        true_range: True range for the same bars
+        window: Smoothing period
+        jit: Force (True) or disable (False) the compiled kernel
+
+    Returns:
+        ADX array
+    """
+    from src.analysis.array_indicators import _shift
+
+    high, low = np.asarray(high, dtype=np.float64), np.asarray(low, dtype=np.float64)
+    up_move = high - _shift(high)
+    down_move = _shift(low) - low
+    missing = np.isnan(up_move) | np.isnan(down_move)
+
+    plus_dm = np.where(missing, np.nan, np.where((up_move > down_move) & (up_move > 0), up_move, 0.0))
+    minus_dm = np.where(missing, np.nan, np.where((down_move > up_move) & (down_move > 0), down_move, 0.0))
+    # True range is only used from the first bar that has a directional move
+    tr = np.where(missing, np.nan, true_range)
+
+    smoothed_tr = wilder_smooth(tr, window, jit)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        plus_di = np.where(smoothed_tr == 0, 0.0, 100 * wilder_smooth(plus_dm, window, jit) / smoothed_tr)
+        minus_di = np.where(smoothed_tr == 0, 0.0, 100 * wilder_smooth(minus_dm, window, jit) / smoothed_tr)
+        di_sum = plus_di + minus_di
+        dx = np.where(di_sum == 0, 0.0, 100 * np.abs(plus_di - minus_di) / di_sum)
+    return wilder_smooth(dx, window, jit)
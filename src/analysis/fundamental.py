@@ -3,20 +3,30 @@ Fundamental analysis module for calculating financial ratios and metrics.
 """
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 import yfinance as yf
 from datetime import datetime, timedelta
+from src.analysis.statements import StatementSnapshot
 
 class FundamentalAnalysis:
     """Class for fundamental analysis calculations"""
     
-    def __init__(self, symbol: str):
+    def __init__(self, symbol: str, snapshot: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            symbol: Stock symbol
+            snapshot: Cached info and statements (see FundamentalsStore); when
+                given, nothing is fetched from yfinance
+        """
         self.symbol = symbol
         self.stock = yf.Ticker(symbol)
-        self._info = None
-        self._financials = None
-        self._balance_sheet = None
-        self._cash_flow = None
+        snapshot = snapshot or {}
+        self._info = snapshot.get('info')
+        self._financials = snapshot.get('financials')
+        self._balance_sheet = snapshot.get('balance_sheet')
+        self._cash_flow = snapshot.get('cash_flow')
+        self._statements = snapshot.get('statements')
+        self._ratios = None
     
     @property
     def info(self) -> Dict[str, Any]:
@@ -58,212 +68,86 @@ class FundamentalAnalysis:
                 self._cash_flow = pd.DataFrame()
         return self._cash_flow
     
+    @property
+    def statements(self) -> StatementSnapshot:
+        """Line items and info values used by the ratio methods, extracted once"""
+        if self._statements is None:
+            self._statements = StatementSnapshot.from_raw({
+                'symbol': self.symbol,
+                'info': self.info,
+                'financials': self.financials,
+                'balance_sheet': self.balance_sheet,
+                'cash_flow': self.cash_flow
+            })
+        return self._statements
+    
+    @property
+    def ratios(self) -> Dict[str, float]:
+        """Liquidity, leverage and health ratios computed in one pass"""
+        if self._ratios is None:
+            self._ratios = self.statements.ratios()
+        return self._ratios
+    
+    def _info_values(self, names: List[str]) -> Dict[str, float]:
+        """Snapshot info values (missing ones as 0)"""
+        statements = self.statements
+        values = {}
+        for name in names:
+            value = getattr(statements, name)
+            values[name] = 0 if np.isnan(value) else value
+        return values
+    
     def get_valuation_ratios(self) -> Dict[str, float]:
         """Calculate valuation ratios"""
-        info = self.info
-        ratios = {}
-        
-        # Price ratios
-        ratios['PE_ratio'] = info.get('trailingPE', 0)
-        ratios['Forward_PE'] = info.get('forwardPE', 0)
-        ratios['PB_ratio'] = info.get('priceToBook', 0)
-        ratios['PS_ratio'] = info.get('priceToSalesTrailing12Months', 0)
-        ratios['PEG_ratio'] = info.get('pegRatio', 0)
-        
-        # Market metrics
-        ratios['Market_Cap'] = info.get('marketCap', 0)
-        ratios['Enterprise_Value'] = info.get('enterpriseValue', 0)
-        ratios['EV_Revenue'] = info.get('enterpriseToRevenue', 0)
-        ratios['EV_EBITDA'] = info.get('enterpriseToEbitda', 0)
-        
-        return ratios
+        return self._info_values([
+            # Price ratios
+            'PE_ratio', 'Forward_PE', 'PB_ratio', 'PS_ratio', 'PEG_ratio',
+            # Market metrics
+            'Market_Cap', 'Enterprise_Value', 'EV_Revenue', 'EV_EBITDA'
+        ])
     
     def get_profitability_ratios(self) -> Dict[str, float]:
         """Calculate profitability ratios"""
-        info = self.info
-        ratios = {}
-        
-        # Margins
-        ratios['Gross_Margin'] = info.get('grossMargins', 0)
-        ratios['Operating_Margin'] = info.get('operatingMargins', 0)
-        ratios['Net_Margin'] = info.get('profitMargins', 0)
-        
-        # Returns
-        ratios['ROE'] = info.get('returnOnEquity', 0)
-        ratios['ROA'] = info.get('returnOnAssets', 0)
-        ratios['ROIC'] = info.get('returnOnCapital', 0)
-        
-        return ratios
+        return self._info_values([
+            # Margins
+            'Gross_Margin', 'Operating_Margin', 'Net_Margin',
+            # Returns
+            'ROE', 'ROA', 'ROIC'
+        ])
     
     def get_liquidity_ratios(self) -> Dict[str, float]:
         """Calculate liquidity ratios"""
-        balance_sheet = self.balance_sheet
-        ratios = {}
-        
-        if not balance_sheet.empty and len(balance_sheet.columns) > 0:
-            latest_bs = balance_sheet.iloc[:, 0]
-            
-            current_assets = latest_bs.get('Total Current Assets', 0)
-            current_liabilities = latest_bs.get('Total Current Liabilities', 0)
-            cash = latest_bs.get('Cash And Cash Equivalents', 0)
-            inventory = latest_bs.get('Inventory', 0)
-            
-            # Current ratio
-            if current_liabilities != 0:
-                ratios['Current_Ratio'] = current_assets / current_liabilities
-            else:
-                ratios['Current_Ratio'] = 0
-            
-            # Quick ratio
-            if current_liabilities != 0:
-                ratios['Quick_Ratio'] = (current_assets - inventory) / current_liabilities
-            else:
-                ratios['Quick_Ratio'] = 0
-            
-            # Cash ratio
-            if current_liabilities != 0:
-                ratios['Cash_Ratio'] = cash / current_liabilities
-            else:
-                ratios['Cash_Ratio'] = 0
-        else:
-            ratios = {'Current_Ratio': 0, 'Quick_Ratio': 0, 'Cash_Ratio': 0}
-        
-        return ratios
+        return {name: self.ratios[name] for name in ('Current_Ratio', 'Quick_Ratio', 'Cash_Ratio')}
     
     def get_leverage_ratios(self) -> Dict[str, float]:
         """Calculate leverage ratios"""
-        balance_sheet = self.balance_sheet
-        ratios = {}
-        
-        if not balance_sheet.empty and len(balance_sheet.columns) > 0:
-            latest_bs = balance_sheet.iloc[:, 0]
-            
-            total_debt = latest_bs.get('Total Debt', 0)
-            total_equity = latest_bs.get('Total Stockholder Equity', 0)
-            total_assets = latest_bs.get('Total Assets', 0)
-            
-            # Debt-to-equity ratio
-            if total_equity != 0:
-                ratios['Debt_to_Equity'] = total_debt / total_equity
-            else:
-                ratios['Debt_to_Equity'] = 0
-            
-            # Debt-to-assets ratio
-            if total_assets != 0:
-                ratios['Debt_to_Assets'] = total_debt / total_assets
-            else:
-                ratios['Debt_to_Assets'] = 0
-            
-            # Equity multiplier
-            if total_equity != 0:
-                ratios['Equity_Multiplier'] = total_assets / total_equity
-            else:
-                ratios['Equity_Multiplier'] = 0
-        else:
-            ratios = {'Debt_to_Equity': 0, 'Debt_to_Assets': 0, 'Equity_Multiplier': 0}
-        
-        return ratios
+        return {name: self.ratios[name] for name in ('Debt_to_Equity', 'Debt_to_Assets', 'Equity_Multiplier')}
     
     def get_growth_metrics(self) -> Dict[str, float]:
         """Calculate growth metrics"""
-        info = self.info
-        metrics = {}
-        
-        # Growth rates
-        metrics['Revenue_Growth'] = info.get('revenueGrowth', 0)
-        metrics['Earnings_Growth'] = info.get('earningsGrowth', 0)
-        metrics['EPS_Growth'] = info.get('earningsQuarterlyGrowth', 0)
-        
-        return metrics
+        return self._info_values(['Revenue_Growth', 'Earnings_Growth', 'EPS_Growth'])
     
     def calculate_altman_z_score(self) -> float:
         """Calculate Altman Z-Score for bankruptcy prediction"""
-        balance_sheet = self.balance_sheet
-        financials = self.financials
-        
-        if balance_sheet.empty or financials.empty:
-            return 0.0
-        
-        try:
-            latest_bs = balance_sheet.iloc[:, 0]
-            latest_fin = financials.iloc[:, 0]
-            
-            # Get required values
-            working_capital = latest_bs.get('Total Current Assets', 0) - latest_bs.get('Total Current Liabilities', 0)
-            total_assets = latest_bs.get('Total Assets', 1)  # Avoid division by zero
-            retained_earnings = latest_bs.get('Retained Earnings', 0)
-            ebit = latest_fin.get('Operating Income', 0)
-            market_cap = self.info.get('marketCap', 0)
-            total_liabilities = latest_bs.get('Total Liab', 0)
-            sales = latest_fin.get('Total Revenue', 0)
-            
-            # Calculate Z-Score components
-            a = working_capital / total_assets
-            b = retained_earnings / total_assets
-            c = ebit / total_assets
-            d = market_cap / total_liabilities if total_liabilities != 0 else 0
-            e = sales / total_assets
-            
-            # Altman Z-Score formula
-            z_score = 1.2 * a + 1.4 * b + 3.3 * c + 0.6 * d + 1.0 * e
-            
-            return z_score
-        except Exception:
-            return 0.0
+        return self.ratios['altman_z_score']
     
     def calculate_piotroski_score(self) -> int:
         """Calculate Piotroski F-Score (0-9)"""
-        info = self.info
-        balance_sheet = self.balance_sheet
-        financials = self.financials
-        cash_flow = self.cash_flow
-        
-        score = 0
-        
-        try:
-            # Profitability (4 points)
-            if info.get('returnOnAssets', 0) > 0:
-                score += 1
-            if not cash_flow.empty and cash_flow.iloc[0, 0] > 0:  # Operating cash flow > 0
-                score += 1
-            if info.get('returnOnAssets', 0) > 0:  # ROA improvement (simplified)
-                score += 1
-            if not cash_flow.empty and cash_flow.iloc[0, 0] > financials.iloc[0, 0]:  # Cash flow > net income
-                score += 1
-            
-            # Leverage/Liquidity (3 points)
-            if not balance_sheet.empty and len(balance_sheet.columns) > 1:
-                current_debt = balance_sheet.iloc[:, 0].get('Total Debt', 0)
-                previous_debt = balance_sheet.iloc[:, 1].get('Total Debt', 0)
-                if current_debt < previous_debt:  # Debt decreased
-                    score += 1
-            
-            current_ratio = self.get_liquidity_ratios().get('Current_Ratio', 0)
-            if current_ratio > 1.5:  # Good liquidity
-                score += 1
-            
-            # Efficiency (2 points)
-            if info.get('grossMargins', 0) > 0.3:  # Good gross margin
-                score += 1
-            if info.get('operatingMargins', 0) > 0.1:  # Good operating margin
-                score += 1
-            
-        except Exception:
-            pass
-        
-        return min(score, 9)  # Cap at 9
+        return self.ratios['piotroski_score']
     
     def get_comprehensive_analysis(self) -> Dict[str, Any]:
         """Get comprehensive fundamental analysis"""
+        statements = self.statements
+        market_values = self._info_values(['Market_Cap', 'current_price', 'dividend_yield'])
         return {
             'basic_info': {
                 'symbol': self.symbol,
-                'company_name': self.info.get('longName', ''),
-                'sector': self.info.get('sector', ''),
-                'industry': self.info.get('industry', ''),
-                'market_cap': self.info.get('marketCap', 0),
-                'current_price': self.info.get('currentPrice', 0),
-                'dividend_yield': self.info.get('dividendYield', 0)
+                'company_name': statements.company_name,
+                'sector': statements.sector,
+                'industry': statements.industry,
+                'market_cap': market_values['Market_Cap'],
+                'current_price': market_values['current_price'],
+                'dividend_yield': market_values['dividend_yield']
             },
             'valuation_ratios': self.get_valuation_ratios(),
             'profitability_ratios': self.get_profitability_ratios(),
@@ -280,6 +164,9 @@ def get_fundamental_summary(symbol: str) -> Dict[str, Any]:
     """
     Get a comprehensive fundamental analysis summary for a stock
     
+    Statements and info come from the local fundamentals cache; yfinance is
+    only called for symbols that have never been cached.
+    
     Args:
         symbol: Stock symbol
         
@@ -287,8 +174,19 @@ def get_fundamental_summary(symbol: str) -> Dict[str, Any]:
         Dictionary with fundamental analysis summary
     """
     try:
-        analyzer = FundamentalAnalysis(symbol)
-        return analyzer.get_comprehensive_analysis()
+        from src.data.fundamentals_store import fundamentals_store
+        
+        snapshot = fundamentals_store.get(symbol)
+        analyzer = FundamentalAnalysis(symbol, snapshot)
+        analysis = analyzer.get_comprehensive_analysis()
+        analysis['data_as_of'] = datetime.fromtimestamp(snapshot['fetched_at']).isoformat()
+        
+        try:
+            from src.analysis.sector_index import sector_index
+            analysis['peer_percentiles'] = sector_index.ranks(symbol, snapshot)
+        except Exception as e:
+            print(f"Warning: Could not rank {symbol} against its sector: {e}")
+        return analysis
     except Exception as e:
         print(f"Error in fundamental analysis for {symbol}: {e}")
         return {
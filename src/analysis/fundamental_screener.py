@@ -0,0 +1,125 @@
+"""
+Cross-sectional fundamental ratios and screening over every cached symbol.
+"""
+import threading
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, Optional
+from src.analysis.scanner import ScanQuery, ScanQueryError
+from src.utils import json_value
+from src.analysis.statements import (
+    INFO_FIELDS, INFO_TEXT_FIELDS, ITEM_COLUMNS, StatementSnapshot, compute_ratios, item_matrix
+)
+
+class FundamentalScreener:
+    """
+    Universe-wide fundamentals table built from the fundamentals cache.
+
+    Each snapshot file version is reduced to a StatementSnapshot once; the
+    table of ratios and scores is recomputed column-wise only when a
+    snapshot was added or refreshed, so screening is a filter and a sort.
+    """
+
+    def __init__(self, store: Any = None):
+        if store is None:
+            from src.data.fundamentals_store import fundamentals_store
+            store = fundamentals_store
+        self.store = store
+        self._rows: Dict[str, tuple] = {}
+        self._table: Optional[pd.DataFrame] = None
+        self._lock = threading.Lock()
+
+    def table(self) -> pd.DataFrame:
+        """
+        Current fundamentals table
+
+        Returns:
+            DataFrame indexed by symbol with company_name, sector, industry,
+            INFO_FIELDS, RATIO_COLUMNS and fetched_at
+        """
+        versions = self.store.cached_symbols()
+        with self._lock:
+            changed = [key for key, mtime in versions.items() if self._rows.get(key, (None,))[0] != mtime]
+            removed = [key for key in self._rows if key not in versions]
+            if self._table is not None and not changed and not removed:
+                return self._table
+
+            for key in removed:
+                del self._rows[key]
+            for key in changed:
+                snapshot = self.store.peek(key)
+                if snapshot is None:
+                    self._rows.pop(key, None)
+                    continue
+                self._rows[key] = (versions[key], snapshot.get('statements') or StatementSnapshot.from_raw(snapshot))
+
+            statements = sorted((row[1] for row in self._rows.values()), key=lambda statement: statement.symbol)
+            index = pd.Index([statement.symbol for statement in statements], name='symbol')
+            items = pd.DataFrame(item_matrix(statements), index=index, columns=ITEM_COLUMNS)
+            text = pd.DataFrame([[getattr(statement, name) for name in INFO_TEXT_FIELDS] for statement in statements],
+                                index=index, columns=list(INFO_TEXT_FIELDS))
+
+            ratios = pd.DataFrame(compute_ratios(items), index=index)
+            table = pd.concat([text, items[list(INFO_FIELDS)], ratios], axis=1)
+            table['fetched_at'] = [statement.fetched_at for statement in statements]
+            self._table = table
+            return table
+
+    def screen(self, query: Optional[str] = None, sector: Optional[str] = None, industry: Optional[str] = None,
+               sort_by: str = 'altman_z_score', ascending: bool = False, limit: int = 50) -> Dict[str, Any]:
+        """
+        Filter and rank the cached universe
+
+        Args:
+            query: Optional filter over table columns, e.g. "PE_ratio < 15 and piotroski_score >= 7"
+                (missing values never match)
+            sector: Only this sector (case-insensitive)
+            industry: Only this industry (case-insensitive)
+            sort_by: Column to rank by (case-insensitive)
+            ascending: Rank in ascending order
+            limit: Maximum number of results
+
+        Returns:
+            Dictionary with the universe size, match count and ranked rows
+
+        Raises:
+            ScanQueryError: If the query or sort column is invalid
+        """
+        parsed = ScanQuery(query) if query else None
+        table = self.table()
+        numeric = table.drop(columns=list(INFO_TEXT_FIELDS))
+
+        mask = np.ones(len(table), dtype=bool)
+        if sector:
+            mask &= (table['sector'].str.lower() == sector.lower()).to_numpy()
+        if industry:
+            mask &= (table['industry'].str.lower() == industry.lower()).to_numpy()
+        if parsed is not None and len(table):
+            mask &= parsed.evaluate(numeric)
+
+        lookup = {name.lower(): name for name in numeric.columns}
+        sort_column = lookup.get(sort_by.lower())
+        if sort_column is None:
+            raise ScanQueryError(f"Unknown sort column {sort_by!r}")
+
+        matched = table[mask]
+        ranked = matched.sort_values(sort_column, ascending=ascending, kind='stable', na_position='last').head(limit)
+
+        results = []
+        for symbol, row in zip(ranked.index, ranked.itertuples(index=False)):
+            result = {'symbol': symbol}
+            result.update({name: json_value(value) for name, value in zip(ranked.columns, row)})
+            results.append(result)
+
+        return {
+            'query': query,
+            'sector': sector,
+            'industry': industry,
+            'sort_by': sort_column,
+            'universe_size': len(table),
+            'matched': int(mask.sum()),
+            'results': results
+        }
+
+# Global screener instance
+fundamental_screener = FundamentalScreener()
@@ -0,0 +1,299 @@
+"""
+Indicator dependency graph: each indicator declares its inputs so shared
+intermediates (rolling windows, true range, EMAs, money flow) are computed once.
+"""
+import numpy as np
+import pandas as pd
+from collections import namedtuple
+from typing import Dict, List, Any, Iterable, Optional
+from src.analysis.array_indicators import (
+    ArrayIndicators, _as_array, _shift, _rolling_mean, _rolling_reduce, _first_valid_row, _mask_before,
+    _nan_skipping_cumsum
+)
+from src.analysis.compiled_kernels import wilder_adx
+from src.analysis.technical_indicators import TechnicalIndicators
+
+BASE_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+# inputs: names of base columns or other nodes; compute(kernels, *input_values)
+IndicatorNode = namedtuple('IndicatorNode', ['inputs', 'compute'])
+
+class PandasKernels:
+    """Graph primitives on pandas Series (same arithmetic as TechnicalIndicators)"""
+
+    sma = staticmethod(TechnicalIndicators.sma)
+    ema = staticmethod(TechnicalIndicators.ema)
+    wma = staticmethod(TechnicalIndicators.wma)
+    obv = staticmethod(TechnicalIndicators.obv)
+    vwap = staticmethod(TechnicalIndicators.vwap)
+    parabolic_sar = staticmethod(TechnicalIndicators.parabolic_sar)
+    money_flow_volume = staticmethod(TechnicalIndicators.money_flow_volume)
+    roc = staticmethod(TechnicalIndicators.roc)
+    momentum = staticmethod(TechnicalIndicators.momentum)
+
+    @staticmethod
+    def rolling_std(x: pd.Series, window: int) -> pd.Series:
+        return x.rolling(window=window).std()
+
+    @staticmethod
+    def rolling_max(x: pd.Series, window: int) -> pd.Series:
+        return x.rolling(window=window).max()
+
+    @staticmethod
+    def rolling_min(x: pd.Series, window: int) -> pd.Series:
+        return x.rolling(window=window).min()
+
+    @staticmethod
+    def diff(x: pd.Series) -> pd.Series:
+        return x.diff()
+
+    @staticmethod
+    def gains(delta: pd.Series, source: pd.Series) -> pd.Series:
+        """Positive changes, zero otherwise (including the first bar)"""
+        return delta.where(delta > 0, 0)
+
+    @staticmethod
+    def losses(delta: pd.Series, source: pd.Series) -> pd.Series:
+        """Magnitude of negative changes, zero otherwise"""
+        return -delta.where(delta < 0, 0)
+
+    @staticmethod
+    def shift(x: pd.Series, periods: int) -> pd.Series:
+        return x.shift(periods)
+
+    @staticmethod
+    def cumulative_sum(x: pd.Series) -> pd.Series:
+        return x.cumsum()
+
+    @staticmethod
+    def true_range(high: pd.Series, low: pd.Series, close: pd.Series) -> pd.Series:
+        prev_close = close.shift()
+        return pd.concat([high - low, abs(high - prev_close), abs(low - prev_close)], axis=1).max(axis=1)
+
+    @staticmethod
+    def adx(high: pd.Series, low: pd.Series, true_range: pd.Series, window: int) -> pd.Series:
+        return pd.Series(wilder_adx(high.to_numpy(dtype=float), low.to_numpy(dtype=float),
+                                    true_range.to_numpy(dtype=float), window), index=high.index)
+
+class ArrayKernels:
+    """Graph primitives on NumPy arrays, vectorized along axis 0"""
+
+    sma = staticmethod(_rolling_mean)
+    ema = staticmethod(ArrayIndicators.ema)
+    wma = staticmethod(ArrayIndicators.wma)
+    true_range = staticmethod(ArrayIndicators.true_range)
+    obv = staticmethod(ArrayIndicators.obv)
+    vwap = staticmethod(ArrayIndicators.vwap)
+    parabolic_sar = staticmethod(ArrayIndicators.parabolic_sar)
+    money_flow_volume = staticmethod(ArrayIndicators.money_flow_volume)
+    roc = staticmethod(ArrayIndicators.roc)
+    momentum = staticmethod(ArrayIndicators.momentum)
+    shift = staticmethod(_shift)
+    cumulative_sum = staticmethod(_nan_skipping_cumsum)
+
+    @staticmethod
+    def adx(high: np.ndarray, low: np.ndarray, true_range: np.ndarray, window: int) -> np.ndarray:
+        return wilder_adx(high, low, true_range, window).astype(high.dtype)
+
+    @staticmethod
+    def rolling_std(x: np.ndarray, window: int) -> np.ndarray:
+        return _rolling_reduce(x, window, np.std, ddof=1)
+
+    @staticmethod
+    def rolling_max(x: np.ndarray, window: int) -> np.ndarray:
+        return _rolling_reduce(x, window, np.max)
+
+    @staticmethod
+    def rolling_min(x: np.ndarray, window: int) -> np.ndarray:
+        return _rolling_reduce(x, window, np.min)
+
+    @staticmethod
+    def diff(x: np.ndarray) -> np.ndarray:
+        return x - _shift(x)
+
+    @staticmethod
+    def gains(delta: np.ndarray, source: np.ndarray) -> np.ndarray:
+        """Positive changes, zero-filled from each column's first bar"""
+        return _mask_before(np.where(delta > 0, delta, 0).astype(delta.dtype), _first_valid_row(source))
+
+    @staticmethod
+    def losses(delta: np.ndarray, source: np.ndarray) -> np.ndarray:
+        """Magnitude of negative changes, zero-filled from each column's first bar"""
+        return _mask_before(np.where(delta < 0, -delta, 0).astype(delta.dtype), _first_valid_row(source))
+
+KERNELS = {'pandas': PandasKernels, 'numpy': ArrayKernels}
+
+INDICATOR_GRAPH: Dict[str, IndicatorNode] = {
+    # Shared intermediates
+    'close_change': IndicatorNode(('close',), lambda k, close: k.diff(close)),
+    'gain_avg_14': IndicatorNode(('close_change', 'close'), lambda k, delta, close: k.sma(k.gains(delta, close), 14)),
+    'loss_avg_14': IndicatorNode(('close_change', 'close'), lambda k, delta, close: k.sma(k.losses(delta, close), 14)),
+    'close_std_20': IndicatorNode(('close',), lambda k, close: k.rolling_std(close, 20)),
+    'high_max_14': IndicatorNode(('high',), lambda k, high: k.rolling_max(high, 14)),
+    'low_min_14': IndicatorNode(('low',), lambda k, low: k.rolling_min(low, 14)),
+    'true_range': IndicatorNode(('high', 'low', 'close'), lambda k, high, low, close: k.true_range(high, low, close)),
+    'high_max_9': IndicatorNode(('high',), lambda k, high: k.rolling_max(high, 9)),
+    'low_min_9': IndicatorNode(('low',), lambda k, low: k.rolling_min(low, 9)),
+    'high_max_26': IndicatorNode(('high',), lambda k, high: k.rolling_max(high, 26)),
+    'low_min_26': IndicatorNode(('low',), lambda k, low: k.rolling_min(low, 26)),
+    'high_max_52': IndicatorNode(('high',), lambda k, high: k.rolling_max(high, 52)),
+    'low_min_52': IndicatorNode(('low',), lambda k, low: k.rolling_min(low, 52)),
+    'money_flow_volume': IndicatorNode(('high', 'low', 'close', 'volume'),
+                                       lambda k, high, low, close, volume: k.money_flow_volume(high, low, close, volume)),
+
+    # Moving averages
+    'SMA_20': IndicatorNode(('close',), lambda k, close: k.sma(close, 20)),
+    'SMA_50': IndicatorNode(('close',), lambda k, close: k.sma(close, 50)),
+    'EMA_12': IndicatorNode(('close',), lambda k, close: k.ema(close, 12)),
+    'EMA_26': IndicatorNode(('close',), lambda k, close: k.ema(close, 26)),
+    'WMA_20': IndicatorNode(('close',), lambda k, close: k.wma(close, 20)),
+
+    # RSI
+    'RSI': IndicatorNode(('gain_avg_14', 'loss_avg_14'), lambda k, gain, loss: 100 - (100 / (1 + gain / loss))),
+
+    # MACD
+    'MACD': IndicatorNode(('EMA_12', 'EMA_26'), lambda k, fast, slow: fast - slow),
+    'MACD_Signal': IndicatorNode(('MACD',), lambda k, macd: k.ema(macd, 9)),
+    'MACD_Histogram': IndicatorNode(('MACD', 'MACD_Signal'), lambda k, macd, signal: macd - signal),
+
+    # Bollinger Bands
+    'BB_Upper': IndicatorNode(('SMA_20', 'close_std_20'), lambda k, sma, std: sma + (std * 2)),
+    'BB_Middle': IndicatorNode(('SMA_20',), lambda k, sma: sma),
+    'BB_Lower': IndicatorNode(('SMA_20', 'close_std_20'), lambda k, sma, std: sma - (std * 2)),
+
+    # Stochastic Oscillator
+    'Stoch_K': IndicatorNode(('close', 'low_min_14', 'high_max_14'),
+                             lambda k, close, lowest, highest: 100 * ((close - lowest) / (highest - lowest))),
+    'Stoch_D': IndicatorNode(('Stoch_K',), lambda k, stoch_k: k.sma(stoch_k, 3)),
+
+    # Volatility and trend strength
+    'ATR': IndicatorNode(('true_range',), lambda k, tr: k.sma(tr, 14)),
+    'ADX': IndicatorNode(('high', 'low', 'true_range'), lambda k, high, low, tr: k.adx(high, low, tr, 14)),
+    'PSAR': IndicatorNode(('high', 'low'), lambda k, high, low: k.parabolic_sar(high, low)),
+
+    # Ichimoku Cloud
+    'Ichimoku_Tenkan': IndicatorNode(('high_max_9', 'low_min_9'), lambda k, highest, lowest: (highest + lowest) / 2),
+    'Ichimoku_Kijun': IndicatorNode(('high_max_26', 'low_min_26'), lambda k, highest, lowest: (highest + lowest) / 2),
+    'Ichimoku_Senkou_A': IndicatorNode(('Ichimoku_Tenkan', 'Ichimoku_Kijun'),
+                                       lambda k, tenkan, kijun: k.shift((tenkan + kijun) / 2, 26)),
+    'Ichimoku_Senkou_B': IndicatorNode(('high_max_52', 'low_min_52'),
+                                       lambda k, highest, lowest: k.shift((highest + lowest) / 2, 26)),
+
+    # Momentum
+    'ROC': IndicatorNode(('close',), lambda k, close: k.roc(close, 12)),
+    'Momentum': IndicatorNode(('close',), lambda k, close: k.momentum(close, 10)),
+
+    # Volume
+    'OBV': IndicatorNode(('close', 'volume'), lambda k, close, volume: k.obv(close, volume)),
+    'VWAP': IndicatorNode(('high', 'low', 'close', 'volume'), lambda k, high, low, close, volume: k.vwap(high, low, close, volume)),
+    'Williams_R': IndicatorNode(('close', 'low_min_14', 'high_max_14'),
+                                lambda k, close, lowest, highest: -100 * ((highest - close) / (highest - lowest))),
+    'AD_Line': IndicatorNode(('money_flow_volume',), lambda k, money_flow: k.cumulative_sum(money_flow)),
+    'CMF': IndicatorNode(('money_flow_volume', 'Volume_SMA'), lambda k, money_flow, volume_sma: k.sma(money_flow, 20) / volume_sma),
+    'Volume_ROC': IndicatorNode(('volume',), lambda k, volume: k.roc(volume, 14)),
+
+    # Rolling statistics used as model features
+    'Price_Volatility': IndicatorNode(('close_std_20',), lambda k, std: std),
+    'Volume_SMA': IndicatorNode(('volume',), lambda k, volume: k.sma(volume, 20)),
+}
+
+# Columns produced by calculate_all_indicators, in output order
+INDICATOR_COLUMNS = [
+    'SMA_20', 'SMA_50', 'EMA_12', 'EMA_26', 'WMA_20', 'RSI',
+    'MACD', 'MACD_Signal', 'MACD_Histogram', 'BB_Upper', 'BB_Middle', 'BB_Lower',
+    'Stoch_K', 'Stoch_D', 'ATR', 'ADX', 'OBV', 'VWAP', 'Williams_R',
+    'PSAR', 'Ichimoku_Tenkan', 'Ichimoku_Kijun', 'Ichimoku_Senkou_A', 'Ichimoku_Senkou_B',
+    'AD_Line', 'CMF', 'ROC', 'Momentum', 'Volume_ROC'
+]
+
+class IndicatorGraph:
+    """Plans and evaluates the subset of the graph needed for requested outputs"""
+
+    def __init__(self, nodes: Dict[str, IndicatorNode] = None):
+        self.nodes = nodes if nodes is not None else INDICATOR_GRAPH
+
+    def plan(self, outputs: Iterable[str]) -> List[str]:
+        """
+        Topologically ordered nodes needed for the requested outputs
+
+        Raises:
+            ValueError: If an output is not a known node
+        """
+        order, visited = [], set()
+
+        def visit(name: str) -> None:
+            if name in visited or name in BASE_COLUMNS:
+                return
+            if name not in self.nodes:
+                raise ValueError(f"Unknown indicator: {name}")
+            visited.add(name)
+            for dependency in self.nodes[name].inputs:
+                visit(dependency)
+            order.append(name)
+
+        for name in outputs:
+            visit(name)
+        return order
+
+    def evaluate(self, inputs: Dict[str, Any], outputs: List[str], backend: str = 'pandas') -> Dict[str, Any]:
+        """
+        Compute the requested outputs, each shared node once
+
+        Intermediates are released as soon as their last consumer has run.
+
+        Args:
+            inputs: Base OHLCV columns (Series for 'pandas', arrays for 'numpy')
+            outputs: Node names to return
+            backend: 'pandas' or 'numpy'
+
+        Returns:
+            Dictionary mapping each requested output to its values
+        """
+        if backend not in KERNELS:
+            raise ValueError(f"Unknown indicator backend: {backend}")
+        kernels = KERNELS[backend]
+        order = self.plan(outputs)
+
+        remaining_uses = {}
+        for name in order:
+            for dependency in self.nodes[name].inputs:
+                remaining_uses[dependency] = remaining_uses.get(dependency, 0) + 1
+
+        keep = set(outputs)
+        values = dict(inputs)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            for name in order:
+                node = self.nodes[name]
+                values[name] = node.compute(kernels, *(values[dependency] for dependency in node.inputs))
+                for dependency in node.inputs:
+                    remaining_uses[dependency] -= 1
+                    if remaining_uses[dependency] == 0 and dependency not in keep and dependency not in inputs:
+                        del values[dependency]
+
+        return {name: values[name] for name in outputs}
+
+# Global indicator graph instance
+indicator_graph = IndicatorGraph()
+
+def compute_indicators(data: Any, columns: Optional[List[str]] = None, backend: str = 'pandas') -> Dict[str, Any]:
+    """
+    Compute indicator columns through the dependency graph
+
+    Args:
+        data: DataFrame (or mapping) with the OHLCV columns the outputs need
+        columns: Output names (default: INDICATOR_COLUMNS); any graph node may be requested
+        backend: 'pandas' for Series results or 'numpy' for arrays
+
+    Returns:
+        Dictionary mapping each requested column to its values
+    """
+    columns = list(columns) if columns is not None else INDICATOR_COLUMNS
+    needed = indicator_graph.plan(columns)
+    base = [name for name in BASE_COLUMNS
+            if any(name in indicator_graph.nodes[node].inputs for node in needed)]
+
+    if backend == 'numpy':
+        inputs = {name: _as_array(data[name]) for name in base}
+    else:
+        inputs = {name: data[name] for name in base}
+    return indicator_graph.evaluate(inputs, columns, backend=backend)
@@ -0,0 +1,147 @@
+"""
+Cross-sectional indicator engine for a whole symbol universe.
+
+Each OHLCV field is a 2-D (time x symbol) array; every indicator is computed
+column-wise in one vectorized pass with the ArrayIndicators kernels.
+"""
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Optional
+from src.analysis.array_indicators import ArrayLike, _as_array, _nan_like, compute_indicator_arrays
+
+PANEL_FIELDS = ['open', 'high', 'low', 'close', 'volume']
+
+# Symbols processed per block; bounds the (rows x symbols x window)
+# temporaries built by the rolling-window kernels
+PANEL_CHUNK_SIZE = 512
+
+def _pack_order(present: np.ndarray) -> Optional[np.ndarray]:
+    """
+    Row order that moves each column's missing bars to the top
+
+    Stable, so a symbol's bars stay in date order and form one contiguous
+    history ending at the last row. Returns None when nothing is missing.
+    """
+    if present.all():
+        return None
+    return np.argsort(present, axis=0, kind='stable')
+
+def compute_panel_indicators(high: ArrayLike, low: ArrayLike, close: ArrayLike, volume: ArrayLike,
+                             chunk_size: int = PANEL_CHUNK_SIZE) -> Dict[str, np.ndarray]:
+    """
+    Compute every indicator for a (time x symbol) panel
+
+    Rows where a symbol has no bar (NaN close) are masked out: each symbol's
+    bars are packed into a contiguous history before the kernels run and the
+    results are scattered back to their dates, so ragged histories (late
+    listings, delistings, exchange holidays) give the same values as
+    computing that symbol on its own.
+
+    Args:
+        high, low, close, volume: 2-D arrays of shape (dates, symbols)
+        chunk_size: Symbols per vectorized block
+
+    Returns:
+        Dictionary mapping indicator column names to (dates, symbols) arrays
+    """
+    high, low, close, volume = _as_array(high), _as_array(low), _as_array(close), _as_array(volume)
+    if close.ndim != 2:
+        raise ValueError("Panel inputs must be 2-D (dates x symbols) arrays")
+
+    present = ~np.isnan(close)
+    indicators = {}
+
+    for start in range(0, close.shape[1], chunk_size):
+        block = slice(start, start + chunk_size)
+        fields = [high[:, block], low[:, block], close[:, block], volume[:, block]]
+
+        order = _pack_order(present[:, block])
+        if order is not None:
+            fields = [np.take_along_axis(field, order, axis=0) for field in fields]
+
+        for name, values in compute_indicator_arrays(*fields).items():
+            if name not in indicators:
+                indicators[name] = _nan_like(close)
+            if order is not None:
+                np.put_along_axis(indicators[name][:, block], order, values, axis=0)
+            else:
+                indicators[name][:, block] = values
+
+    for values in indicators.values():
+        values[~present] = np.nan
+
+    return indicators
+
+class IndicatorPanel:
+    """Aligned OHLCV and indicator arrays for a universe of symbols"""
+
+    def __init__(self, dates: pd.DatetimeIndex, symbols: List[str], fields: Dict[str, np.ndarray]):
+        self.dates = pd.DatetimeIndex(dates)
+        self.symbols = list(symbols)
+        self.fields = {name: _as_array(fields[name]) for name in PANEL_FIELDS}
+        self.indicators: Dict[str, np.ndarray] = {}
+
+    @classmethod
+    def from_frames(cls, frames: Dict[str, pd.DataFrame]) -> 'IndicatorPanel':
+        """
+        Build a panel from per-symbol OHLCV DataFrames
+
+        Args:
+            frames: Mapping of symbol to DataFrame with OHLCV columns and a date index
+
+        Returns:
+            IndicatorPanel on the union of all dates (missing bars are NaN)
+        """
+        frames = {symbol: df for symbol, df in frames.items() if not df.empty}
+        if not frames:
+            return cls(pd.DatetimeIndex([]), [], {name: np.empty((0, 0)) for name in PANEL_FIELDS})
+
+        fields = {}
+        for name in PANEL_FIELDS:
+            field = pd.concat({symbol: df[name] for symbol, df in frames.items()}, axis=1).sort_index()
+            fields[name] = field.to_numpy(dtype=np.float64)
+
+        return cls(field.index, list(field.columns), fields)
+
+    def compute(self, chunk_size: int = PANEL_CHUNK_SIZE) -> Dict[str, np.ndarray]:
+        """Compute (and keep) all indicators for the panel"""
+        if not self.indicators and self.symbols:
+            self.indicators = compute_panel_indicators(
+                self.fields['high'], self.fields['low'], self.fields['close'], self.fields['volume'],
+                chunk_size=chunk_size
+            )
+        return self.indicators
+
+    def last_rows(self) -> np.ndarray:
+        """Row index of each symbol's latest bar (-1 if it has none)"""
+        present = ~np.isnan(self.fields['close'])
+        if present.size == 0:
+            return np.full(len(self.symbols), -1)
+        last = len(self.dates) - 1 - present[::-1].argmax(axis=0)
+        return np.where(present.any(axis=0), last, -1)
+
+    def latest(self) -> pd.DataFrame:
+        """
+        Cross-section of each symbol's latest bar and indicator values
+
+        Returns:
+            DataFrame indexed by symbol with 'date', OHLCV and indicator columns
+        """
+        indicators = self.compute()
+        rows = self.last_rows()
+        has_data = rows >= 0
+        rows, columns = rows[has_data], np.flatnonzero(has_data)
+
+        snapshot = {'date': self.dates[rows]}
+        for name, values in {**self.fields, **indicators}.items():
+            snapshot[name] = values[rows, columns]
+
+        return pd.DataFrame(snapshot, index=pd.Index(np.array(self.symbols)[columns], name='symbol'))
+
+    def to_frame(self, symbol: str) -> pd.DataFrame:
+        """Per-symbol DataFrame in the same layout as calculate_all_indicators"""
+        column = self.symbols.index(symbol)
+        indicators = self.compute()
+        data = {name: values[:, column] for name, values in {**self.fields, **indicators}.items()}
+        frame = pd.DataFrame(data, index=self.dates)
+        return frame[~np.isnan(frame['close'].to_numpy())]
@@ -0,0 +1,313 @@
+"""
+Vectorized universe scanner applying the technical summary rules to many symbols at once.
+"""
+import re
+import numpy as np
+import pandas as pd
+from typing import Dict, List, Any, Optional, Callable, Tuple
+from src.config import get_settings
+from src.utils import json_value
+from src.analysis.technical_indicators import (
+    SIGNAL_LABELS, calculate_trend_score, calculate_momentum_score, calculate_signal_flags
+)
+
+settings = get_settings()
+
+class ScanQueryError(ValueError):
+    """Raised when a scan filter query cannot be parsed"""
+
+_TOKEN_PATTERN = re.compile(r"\s*(?:(\d+\.?\d*(?:[eE][-+]?\d+)?|\.\d+(?:[eE][-+]?\d+)?)|([A-Za-z_][A-Za-z0-9_]*)|(<=|>=|==|!=|<|>|\(|\)|\+|-|\*|/))")
+
+_COMPARISONS = {
+    '<': np.less, '<=': np.less_equal, '>': np.greater,
+    '>=': np.greater_equal, '==': np.equal, '!=': np.not_equal
+}
+_ARITHMETIC = {'+': np.add, '-': np.subtract, '*': np.multiply, '/': np.divide}
+
+def _tokenize(query: str) -> List[Tuple[str, str]]:
+    """Split a query into (kind, text) tokens"""
+    tokens, position = [], 0
+    query = query.rstrip()
+    while position < len(query):
+        match = _TOKEN_PATTERN.match(query, position)
+        if match is None or match.end() == position:
+            raise ScanQueryError(f"Unexpected character at position {position}: {query[position:position + 10]!r}")
+        number, name, operator = match.groups()
+        if number is not None:
+            tokens.append(('number', number))
+        elif name is not None:
+            keyword = name.lower()
+            tokens.append(('keyword', keyword) if keyword in ('and', 'or', 'not') else ('name', name))
+        else:
+            tokens.append(('op', operator))
+        position = match.end()
+    return tokens
+
+class ScanQuery:
+    """
+    Filter expression evaluated as boolean array operations over a cross-section.
+
+    Supports column names (case-insensitive), numbers, arithmetic (+ - * /),
+    comparisons (< <= > >= == !=, chainable), and/or/not and parentheses,
+    e.g. ``"RSI < 30 and close < BB_Lower"``. Boolean columns such as the
+    signal flags can be used as conditions on their own. Comparisons against
+    missing (NaN) values are false, as in get_technical_summary.
+    """
+
+    def __init__(self, query: str):
+        self.query = query
+        self._tokens = _tokenize(query)
+        self._position = 0
+        if not self._tokens:
+            raise ScanQueryError("Empty scan query")
+        self._evaluate, kind = self._parse_or()
+        if self._position != len(self._tokens):
+            raise ScanQueryError(f"Unexpected token {self._tokens[self._position][1]!r}")
+        if kind != 'bool':
+            raise ScanQueryError("Scan query must be a condition (e.g. 'RSI < 30')")
+
+    def evaluate(self, columns: pd.DataFrame) -> np.ndarray:
+        """
+        Evaluate the query over every row at once
+
+        Args:
+            columns: Cross-section DataFrame (one row per symbol)
+
+        Returns:
+            Boolean mask of matching rows
+        """
+        lookup = {name.lower(): name for name in columns.columns}
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.broadcast_to(self._evaluate(columns, lookup), (len(columns),)).copy()
+
+    # Recursive-descent parser; each rule returns (evaluator, 'bool' | 'num')
+
+    def _peek(self) -> Optional[Tuple[str, str]]:
+        return self._tokens[self._position] if self._position < len(self._tokens) else None
+
+    def _accept(self, kind: str, *texts: str) -> Optional[str]:
+        token = self._peek()
+        if token is not None and token[0] == kind and (not texts or token[1] in texts):
+            self._position += 1
+            return token[1]
+        return None
+
+    @staticmethod
+    def _require(kind: str, expected: str, operator: str) -> None:
+        if kind != expected:
+            noun = 'a condition' if expected == 'bool' else 'a number or column'
+            raise ScanQueryError(f"Operator {operator!r} expects {noun}")
+
+    def _parse_or(self) -> Tuple[Callable, str]:
+        left, kind = self._parse_and()
+        while self._accept('keyword', 'or'):
+            right, right_kind = self._parse_and()
+            self._require(kind, 'bool', 'or')
+            self._require(right_kind, 'bool', 'or')
+            left = (lambda a, b: lambda df, lookup: a(df, lookup) | b(df, lookup))(left, right)
+        return left, kind
+
+    def _parse_and(self) -> Tuple[Callable, str]:
+        left, kind = self._parse_not()
+        while self._accept('keyword', 'and'):
+            right, right_kind = self._parse_not()
+            self._require(kind, 'bool', 'and')
+            self._require(right_kind, 'bool', 'and')
+            left = (lambda a, b: lambda df, lookup: a(df, lookup) & b(df, lookup))(left, right)
+        return left, kind
+
+    def _parse_not(self) -> Tuple[Callable, str]:
+        if self._accept('keyword', 'not'):
+            operand, kind = self._parse_not()
+            self._require(kind, 'bool', 'not')
+            return (lambda a: lambda df, lookup: ~a(df, lookup))(operand), 'bool'
+        return self._parse_comparison()
+
+    def _parse_comparison(self) -> Tuple[Callable, str]:
+        left, kind = self._parse_sum()
+        condition = None
+        while True:
+            operator = self._accept('op', *_COMPARISONS)
+            if operator is None:
+                break
+            right, right_kind = self._parse_sum()
+            self._require(kind, 'num', operator)
+            self._require(right_kind, 'num', operator)
+            compare = (lambda op, a, b: lambda df, lookup: op(a(df, lookup), b(df, lookup)))(_COMPARISONS[operator], left, right)
+            # Chained comparisons: a < b < c means (a < b) and (b < c)
+            condition = compare if condition is None else \
+                (lambda a, b: lambda df, lookup: a(df, lookup) & b(df, lookup))(condition, compare)
+            left = right
+        return (condition, 'bool') if condition is not None else (left, kind)
+
+    def _parse_sum(self) -> Tuple[Callable, str]:
+        left, kind = self._parse_product()
+        while True:
+            operator = self._accept('op', '+', '-')
+            if operator is None:
+                return left, kind
+            right, right_kind = self._parse_product()
+            self._require(kind, 'num', operator)
+            self._require(right_kind, 'num', operator)
+            left = (lambda op, a, b: lambda df, lookup: op(a(df, lookup), b(df, lookup)))(_ARITHMETIC[operator], left, right)
+
+    def _parse_product(self) -> Tuple[Callable, str]:
+        left, kind = self._parse_unary()
+        while True:
+            operator = self._accept('op', '*', '/')
+            if operator is None:
+                return left, kind
+            right, right_kind = self._parse_unary()
+            self._require(kind, 'num', operator)
+            self._require(right_kind, 'num', operator)
+            left = (lambda op, a, b: lambda df, lookup: op(a(df, lookup), b(df, lookup)))(_ARITHMETIC[operator], left, right)
+
+    def _parse_unary(self) -> Tuple[Callable, str]:
+        if self._accept('op', '-'):
+            operand, kind = self._parse_unary()
+            self._require(kind, 'num', '-')
+            return (lambda a: lambda df, lookup: -a(df, lookup))(operand), 'num'
+        return self._parse_atom()
+
+    def _parse_atom(self) -> Tuple[Callable, str]:
+        if self._accept('op', '('):
+            inner = self._parse_or()
+            if not self._accept('op', ')'):
+                raise ScanQueryError("Missing closing parenthesis")
+            return inner
+
+        number = self._accept('number')
+        if number is not None:
+            value = float(number)
+            return (lambda df, lookup: value), 'num'
+
+        name = self._accept('name')
+        if name is not None:
+            kind = 'bool' if name.lower() in SIGNAL_LABELS else 'num'
+            return (lambda key: lambda df, lookup: _column(df, lookup, key))(name), kind
+
+        token = self._peek()
+        raise ScanQueryError(f"Unexpected {'end of query' if token is None else repr(token[1])}")
+
+def _column(df: pd.DataFrame, lookup: Dict[str, str], name: str) -> np.ndarray:
+    """Resolve a column case-insensitively"""
+    column = lookup.get(name.lower())
+    if column is None:
+        raise ScanQueryError(f"Unknown column {name!r}. Available: {', '.join(sorted(df.columns))}")
+    values = df[column].to_numpy()
+    return values if values.dtype == bool else values.astype(np.float64)
+
+def score_cross_section(latest: pd.DataFrame) -> pd.DataFrame:
+    """
+    Add trend/momentum scores and signal flags to a cross-section
+
+    Applies the get_technical_summary rules to whole columns at once.
+
+    Args:
+        latest: DataFrame with one row of indicators per symbol
+            (e.g. IndicatorPanel.latest())
+
+    Returns:
+        Copy with 'trend_score', 'momentum_score', 'score' and one boolean
+        column per signal in SIGNAL_LABELS
+    """
+    columns = {name: latest[name].to_numpy(dtype=np.float64) for name in
+               ('close', 'SMA_20', 'SMA_50', 'EMA_12', 'EMA_26', 'RSI', 'MACD', 'MACD_Signal',
+                'Stoch_K', 'Stoch_D', 'BB_Upper', 'BB_Lower')}
+
+    scored = latest.copy()
+    scored['trend_score'] = calculate_trend_score(columns)
+    scored['momentum_score'] = calculate_momentum_score(columns)
+    scored['score'] = scored['trend_score'] + scored['momentum_score']
+    for name, flags in calculate_signal_flags(columns).items():
+        scored[name] = flags
+    return scored
+
+def scan(latest: pd.DataFrame, query: Optional[str] = None, sort_by: str = 'score',
+         ascending: bool = False, limit: int = 50) -> Dict[str, Any]:
+    """
+    Filter and rank a cross-section of symbols
+
+    Args:
+        latest: DataFrame with one row of indicators per symbol, indexed by symbol
+        query: Optional filter such as "RSI < 30 and close < BB_Lower"
+        sort_by: Column to rank by (case-insensitive; default: trend + momentum score)
+        ascending: Rank in ascending order
+        limit: Maximum number of results
+
+    Returns:
+        Dictionary with the universe size, match count and ranked results
+        in the shape of get_technical_summary
+    """
+    if latest.empty:
+        if query:
+            ScanQuery(query)
+        return {'query': query, 'sort_by': sort_by, 'universe_size': 0, 'matched': 0, 'results': []}
+
+    scored = score_cross_section(latest)
+    if query:
+        scored = scored[ScanQuery(query).evaluate(scored)]
+
+    lookup = {name.lower(): name for name in scored.columns}
+    sort_column = lookup.get(sort_by.lower())
+    if sort_column is None:
+        raise ScanQueryError(f"Unknown sort column {sort_by!r}")
+    ranked = scored.sort_values(sort_column, ascending=ascending, kind='stable', na_position='last').head(limit)
+
+    signal_names = list(SIGNAL_LABELS)
+    signal_labels = np.array(list(SIGNAL_LABELS.values()))
+    signal_flags = ranked[signal_names].to_numpy(dtype=bool)
+
+    results = []
+    for position, (symbol, row) in enumerate(ranked.iterrows()):
+        results.append({
+            'symbol': symbol,
+            'date': row['date'].isoformat() if 'date' in row and pd.notna(row['date']) else None,
+            'score': json_value(row['score']),
+            'trend_score': json_value(row['trend_score']),
+            'momentum_score': json_value(row['momentum_score']),
+            'signals': signal_labels[signal_flags[position]].tolist(),
+            'rsi': json_value(row['RSI']),
+            'macd': json_value(row['MACD']),
+            'sma_20': json_value(row['SMA_20']),
+            'sma_50': json_value(row['SMA_50']),
+            'current_price': json_value(row['close'])
+        })
+
+    return {
+        'query': query,
+        'sort_by': sort_column,
+        'universe_size': len(latest),
+        'matched': int(len(scored)),
+        'results': results
+    }
+
+def resolve_universe(symbols: Optional[str] = None) -> List[str]:
+    """
+    Parse a comma-separated symbol list (defaults to settings.analysis.scan_universe)
+
+    Raises:
+        ScanQueryError: If the list is empty or exceeds settings.analysis.scan_max_symbols
+    """
+    universe = symbols if symbols else settings.analysis.scan_universe
+    symbol_list = list(dict.fromkeys(symbol.strip().upper() for symbol in universe.split(',') if symbol.strip()))
+    if not symbol_list:
+        raise ScanQueryError("No symbols to scan")
+    if len(symbol_list) > settings.analysis.scan_max_symbols:
+        raise ScanQueryError(f"Too many symbols ({len(symbol_list)}); the limit is {settings.analysis.scan_max_symbols}")
+    return symbol_list
+
+def scan_frames(frames: Dict[str, pd.DataFrame], query: Optional[str] = None, sort_by: str = 'score',
+                ascending: bool = False, limit: int = 50) -> Dict[str, Any]:
+    """
+    Scan per-symbol OHLCV DataFrames (see scan for arguments)
+
+    Indicators for the whole universe are computed in one panel pass.
+    """
+    from src.analysis.panel_indicators import IndicatorPanel
+
+    # Validate the query before computing indicators
+    if query:
+        ScanQuery(query)
+    latest = IndicatorPanel.from_frames(frames).latest()
+    return scan(latest, query=query, sort_by=sort_by, ascending=ascending, limit=limit)
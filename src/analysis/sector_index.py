@@ -0,0 +1,185 @@
+"""
+Sector and industry percentile index over the cached fundamentals.
+"""
+import time
+import bisect
+import threading
+import numpy as np
+from typing import Dict, Any, List, Optional, Tuple
+from src.analysis.statements import StatementSnapshot
+
+# Metrics ranked within each sector and industry
+PERCENTILE_METRICS = [
+    'PE_ratio', 'Forward_PE', 'PB_ratio', 'PS_ratio', 'EV_EBITDA',
+    'Gross_Margin', 'Operating_Margin', 'Net_Margin', 'ROE', 'ROA',
+    'Revenue_Growth', 'Earnings_Growth',
+    'Current_Ratio', 'Debt_to_Equity', 'altman_z_score', 'piotroski_score'
+]
+
+GROUP_FIELDS = ('sector', 'industry')
+
+# Minimum seconds between checks of the fundamentals cache for changed symbols
+SECTOR_INDEX_SYNC_INTERVAL = 60
+
+def snapshot_metrics(snapshot: Dict[str, Any]) -> Dict[str, float]:
+    """
+    PERCENTILE_METRICS for one fundamentals snapshot (missing values are NaN)
+
+    Args:
+        snapshot: Snapshot from FundamentalsStore
+
+    Returns:
+        Dictionary mapping metric name to value
+    """
+    statements = snapshot.get('statements') or StatementSnapshot.from_raw(snapshot)
+    ratios = statements.ratios()
+    return {metric: float(ratios[metric] if metric in ratios else getattr(statements, metric))
+            for metric in PERCENTILE_METRICS}
+
+class SectorPercentileIndex:
+    """
+    Sorted value lists per (group field, group, metric).
+
+    A symbol's values are removed and re-inserted with bisect when its
+    fundamentals change, so updates never rebuild a group. A percentile is
+    two binary searches: the share of peers below the value, counting ties
+    as half.
+    """
+
+    def __init__(self, screener: Any = None, sync_interval: int = SECTOR_INDEX_SYNC_INTERVAL):
+        if screener is None:
+            from src.analysis.fundamental_screener import fundamental_screener
+            screener = fundamental_screener
+        self.screener = screener
+        self.sync_interval = sync_interval
+        self._sorted: Dict[Tuple[str, str, str], List[float]] = {}
+        self._entries: Dict[str, Tuple[float, Dict[str, str], Dict[str, float]]] = {}
+        self._group_sizes: Dict[Tuple[str, str], int] = {}
+        self._last_sync = 0.0
+        self._lock = threading.RLock()
+
+    def _remove(self, symbol: str) -> None:
+        entry = self._entries.pop(symbol, None)
+        if entry is None:
+            return
+        _, groups, values = entry
+        for field, group in groups.items():
+            self._group_sizes[(field, group)] -= 1
+            for metric, value in values.items():
+                values_list = self._sorted.get((field, group, metric))
+                if values_list is None or np.isnan(value):
+                    continue
+                position = bisect.bisect_left(values_list, value)
+                if position < len(values_list) and values_list[position] == value:
+                    del values_list[position]
+
+    def update(self, symbol: str, version: float, groups: Dict[str, str], values: Dict[str, float]) -> None:
+        """
+        Insert or replace a symbol's values
+
+        Args:
+            symbol: Stock symbol
+            version: Snapshot fetched_at; an unchanged version is a no-op
+            groups: Group field ('sector', 'industry') -> group name
+            values: Metric -> value (NaN values are not indexed)
+        """
+        with self._lock:
+            entry = self._entries.get(symbol)
+            if entry is not None and entry[0] == version:
+                return
+            self._remove(symbol)
+            groups = {field: group for field, group in groups.items() if group}
+            for field, group in groups.items():
+                self._group_sizes[(field, group)] = self._group_sizes.get((field, group), 0) + 1
+                for metric, value in values.items():
+                    if not np.isnan(value):
+                        bisect.insort(self._sorted.setdefault((field, group, metric), []), value)
+            self._entries[symbol] = (version, groups, values)
+
+    def sync(self, force: bool = False) -> int:
+        """
+        Apply symbols whose cached fundamentals changed since the last sync
+
+        Args:
+            force: Ignore sync_interval
+
+        Returns:
+            Number of symbols updated or removed
+        """
+        with self._lock:
+            if not force and time.time() - self._last_sync < self.sync_interval:
+                return 0
+            self._last_sync = time.time()
+            table = self.screener.table()
+
+            changes = 0
+            for symbol in [symbol for symbol in self._entries if symbol not in table.index]:
+                self._remove(symbol)
+                changes += 1
+
+            versions = table['fetched_at'].to_numpy()
+            known = np.array([self._entries.get(symbol, (None,))[0] for symbol in table.index], dtype=object)
+            for position in np.flatnonzero(known != versions):
+                row = table.iloc[position]
+                self.update(table.index[position], row['fetched_at'],
+                            {field: row[field] for field in GROUP_FIELDS},
+                            {metric: float(row[metric]) for metric in PERCENTILE_METRICS})
+                changes += 1
+            return changes
+
+    def percentile(self, field: str, group: str, metric: str, value: float) -> Optional[float]:
+        """
+        Percentile rank (0-100) of a value among a group's values for a metric
+
+        Args:
+            field: 'sector' or 'industry'
+            group: Group name
+            metric: Metric name
+            value: Value to rank
+
+        Returns:
+            Percentile, or None if the value is missing or the group has no values
+        """
+        values_list = self._sorted.get((field, group, metric))
+        if not values_list or value is None or np.isnan(value):
+            return None
+        below = bisect.bisect_left(values_list, value)
+        ties = bisect.bisect_right(values_list, value) - below
+        return 100.0 * (below + 0.5 * ties) / len(values_list)
+
+    def ranks(self, symbol: str, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Sector and industry percentile ranks for a symbol
+
+        The symbol's own entry is brought up to date with the snapshot
+        first, so a just-fetched symbol ranks against its current values.
+
+        Args:
+            symbol: Stock symbol
+            snapshot: The symbol's fundamentals snapshot
+
+        Returns:
+            Dictionary with one entry per group field: group name, peer
+            count and metric -> percentile (None when missing)
+        """
+        self.sync()
+        info = snapshot.get('info') or {}
+        groups = {field: str(info.get(field) or '') for field in GROUP_FIELDS}
+        values = snapshot_metrics(snapshot)
+
+        with self._lock:
+            self.update(symbol.upper(), snapshot['fetched_at'], groups, values)
+            ranks = {}
+            for field, group in groups.items():
+                if not group:
+                    continue
+                ranks[field] = {
+                    'name': group,
+                    'peers': self._group_sizes.get((field, group), 0),
+                    'percentiles': {metric: self.percentile(field, group, metric, value)
+                                    for metric, value in values.items()}
+                }
+        return ranks
+
+# Global sector percentile index instance
+sector_index = SectorPercentileIndex()
@@ -0,0 +1,224 @@
+"""
+Normalized statement snapshots and the fundamental ratio rules shared by
+FundamentalAnalysis, the screener and the sector index.
+"""
+import numpy as np
+import pandas as pd
+from typing import Dict, Any, Iterable, List, Mapping
+
+# Snapshot field -> yfinance info key
+INFO_FIELDS = {
+    'PE_ratio': 'trailingPE',
+    'Forward_PE': 'forwardPE',
+    'PB_ratio': 'priceToBook',
+    'PS_ratio': 'priceToSalesTrailing12Months',
+    'PEG_ratio': 'pegRatio',
+    'Market_Cap': 'marketCap',
+    'Enterprise_Value': 'enterpriseValue',
+    'EV_Revenue': 'enterpriseToRevenue',
+    'EV_EBITDA': 'enterpriseToEbitda',
+    'Gross_Margin': 'grossMargins',
+    'Operating_Margin': 'operatingMargins',
+    'Net_Margin': 'profitMargins',
+    'ROE': 'returnOnEquity',
+    'ROA': 'returnOnAssets',
+    'ROIC': 'returnOnCapital',
+    'Revenue_Growth': 'revenueGrowth',
+    'Earnings_Growth': 'earningsGrowth',
+    'EPS_Growth': 'earningsQuarterlyGrowth',
+    'current_price': 'currentPrice',
+    'dividend_yield': 'dividendYield'
+}
+
+INFO_TEXT_FIELDS = {'company_name': 'longName', 'sector': 'sector', 'industry': 'industry'}
+
+# Snapshot field -> balance sheet row
+BALANCE_ITEMS = {
+    'current_assets': 'Total Current Assets',
+    'current_liabilities': 'Total Current Liabilities',
+    'cash': 'Cash And Cash Equivalents',
+    'inventory': 'Inventory',
+    'total_debt': 'Total Debt',
+    'total_equity': 'Total Stockholder Equity',
+    'total_assets': 'Total Assets',
+    'retained_earnings': 'Retained Earnings',
+    'total_liabilities': 'Total Liab'
+}
+
+# Snapshot field -> income statement row
+FINANCIAL_ITEMS = {'ebit': 'Operating Income', 'revenue': 'Total Revenue'}
+
+# Numeric snapshot fields, in array order. Statement items come for the
+# latest period and, prefixed 'prior_', the one before. operating_cash_flow
+# and net_income are the first cells of the cash flow and income statements.
+ITEM_COLUMNS = (
+    list(INFO_FIELDS) + list(BALANCE_ITEMS) + [f'prior_{name}' for name in BALANCE_ITEMS]
+    + list(FINANCIAL_ITEMS) + [f'prior_{name}' for name in FINANCIAL_ITEMS]
+    + ['operating_cash_flow', 'net_income', 'balance_sheet_periods', 'has_financials', 'has_cash_flow']
+)
+
+RATIO_COLUMNS = [
+    'Current_Ratio', 'Quick_Ratio', 'Cash_Ratio',
+    'Debt_to_Equity', 'Debt_to_Assets', 'Equity_Multiplier',
+    'altman_z_score', 'piotroski_score'
+]
+
+def _number(value: Any) -> float:
+    """Value as float (missing, None or non-numeric become NaN)"""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+def _period(frame: pd.DataFrame, position: int, items: Dict[str, str]) -> List[float]:
+    """One statement column's values for the given rows (NaN where missing)"""
+    if frame is None or frame.empty or len(frame.columns) <= position:
+        return [np.nan] * len(items)
+    rows = frame.index.get_indexer(list(items.values()))
+    values = frame.iloc[:, position].to_numpy()
+    return [_number(values[row]) if row >= 0 else np.nan for row in rows]
+
+def _first_cell(frame: pd.DataFrame) -> float:
+    return _number(frame.iat[0, 0]) if frame is not None and not frame.empty else np.nan
+
+def _restore(symbol: str, fetched_at: float, text: tuple, values: tuple) -> 'StatementSnapshot':
+    return StatementSnapshot(symbol, fetched_at, text, values)
+
+class StatementSnapshot:
+    """
+    The line items and info values used by the ratio rules, for one symbol.
+
+    Built once from the raw yfinance info dict and statement DataFrames;
+    missing items are NaN. Pickles as a flat tuple and converts to a row of
+    the cross-sectional item matrix with to_array.
+    """
+
+    __slots__ = ('symbol', 'fetched_at') + tuple(INFO_TEXT_FIELDS) + tuple(ITEM_COLUMNS)
+
+    def __init__(self, symbol: str, fetched_at: float, text: Iterable[str], values: Iterable[float]):
+        self.symbol = symbol
+        self.fetched_at = fetched_at
+        for name, value in zip(INFO_TEXT_FIELDS, text):
+            setattr(self, name, value)
+        for name, value in zip(ITEM_COLUMNS, values):
+            setattr(self, name, value)
+
+    @classmethod
+    def from_raw(cls, raw: Dict[str, Any]) -> 'StatementSnapshot':
+        """
+        Extract a snapshot from raw fundamentals
+
+        Args:
+            raw: Dictionary with 'symbol', 'info', 'financials', 'balance_sheet',
+                'cash_flow' and optionally 'fetched_at' (see FundamentalsStore)
+
+        Returns:
+            StatementSnapshot
+        """
+        info = raw.get('info') or {}
+        balance_sheet, financials, cash_flow = raw.get('balance_sheet'), raw.get('financials'), raw.get('cash_flow')
+        periods = len(balance_sheet.columns) if balance_sheet is not None and not balance_sheet.empty else 0
+        has_financials = financials is not None and not financials.empty
+        has_cash_flow = cash_flow is not None and not cash_flow.empty
+
+        values = [_number(info.get(key)) for key in INFO_FIELDS.values()]
+        values += _period(balance_sheet, 0, BALANCE_ITEMS) + _period(balance_sheet, 1, BALANCE_ITEMS)
+        values += _period(financials, 0, FINANCIAL_ITEMS) + _period(financials, 1, FINANCIAL_ITEMS)
+        values += [_first_cell(cash_flow), _first_cell(financials),
+                   float(periods), float(has_financials), float(has_cash_flow)]
+        text = [str(info.get(key) or '') for key in INFO_TEXT_FIELDS.values()]
+        return cls(raw.get('symbol', '').upper(), raw.get('fetched_at', 0.0), text, values)
+
+    def __reduce__(self):
+        return _restore, (self.symbol, self.fetched_at,
+                          tuple(getattr(self, name) for name in INFO_TEXT_FIELDS),
+                          tuple(getattr(self, name) for name in ITEM_COLUMNS))
+
+    def to_array(self) -> np.ndarray:
+        """Numeric fields as a float64 array in ITEM_COLUMNS order"""
+        return np.array([getattr(self, name) for name in ITEM_COLUMNS], dtype=np.float64)
+
+    def ratios(self) -> Dict[str, float]:
+        """RATIO_COLUMNS for this symbol"""
+        ratios = compute_ratios({name: np.array([getattr(self, name)]) for name in ITEM_COLUMNS})
+        return {name: values[0].item() for name, values in ratios.items()}
+
+def item_matrix(snapshots: List[StatementSnapshot]) -> np.ndarray:
+    """
+    Stack snapshots into one (symbols, ITEM_COLUMNS) float64 array
+
+    Args:
+        snapshots: Statement snapshots
+
+    Returns:
+        Item matrix, one row per snapshot
+    """
+    matrix = np.empty((len(snapshots), len(ITEM_COLUMNS)), dtype=np.float64)
+    for row, snapshot in enumerate(snapshots):
+        matrix[row] = [getattr(snapshot, name) for name in ITEM_COLUMNS]
+    return matrix
+
+def compute_ratios(items: Mapping[str, Any]) -> Dict[str, np.ndarray]:
+    """
+    Liquidity, leverage, Altman Z and Piotroski F for every row at once
+
+    Missing statement items count as 0 (total assets as 1 for the Z-score),
+    a ratio with a zero denominator is 0, and comparisons against missing
+    info values fail.
+
+    Args:
+        items: ITEM_COLUMNS -> equal-length arrays (e.g. a DataFrame of item_matrix)
+
+    Returns:
+        Dictionary of RATIO_COLUMNS arrays
+    """
+    col = {name: np.asarray(items[name], dtype=np.float64) for name in ITEM_COLUMNS}
+    zero = {name: np.nan_to_num(col[name], nan=0.0) for name in
+            list(BALANCE_ITEMS) + ['prior_total_debt'] + list(FINANCIAL_ITEMS) + ['Market_Cap']}
+    has_bs = col['balance_sheet_periods'] > 0
+    has_fin = col['has_financials'] > 0
+    has_cf = col['has_cash_flow'] > 0
+
+    current_liabilities = zero['current_liabilities']
+    total_equity = zero['total_equity']
+    total_assets = zero['total_assets']
+    total_debt = zero['total_debt']
+
+    def ratio(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+        return np.where(has_bs & (denominator != 0), numerator / denominator, 0.0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        ratios = {
+            'Current_Ratio': ratio(zero['current_assets'], current_liabilities),
+            'Quick_Ratio': ratio(zero['current_assets'] - zero['inventory'], current_liabilities),
+            'Cash_Ratio': ratio(zero['cash'], current_liabilities),
+            'Debt_to_Equity': ratio(total_debt, total_equity),
+            'Debt_to_Assets': ratio(total_debt, total_assets),
+            'Equity_Multiplier': ratio(total_assets, total_equity)
+        }
+
+        # Altman Z-Score
+        z_assets = np.where(np.isnan(col['total_assets']), 1.0, col['total_assets'])
+        total_liabilities = zero['total_liabilities']
+        z_score = (
+            1.2 * (zero['current_assets'] - current_liabilities) / z_assets
+            + 1.4 * zero['retained_earnings'] / z_assets
+            + 3.3 * zero['ebit'] / z_assets
+            + 0.6 * np.where(total_liabilities != 0, zero['Market_Cap'] / total_liabilities, 0.0)
+            + 1.0 * zero['revenue'] / z_assets
+        )
+        ratios['altman_z_score'] = np.where(has_bs & has_fin & (z_assets != 0), z_score, 0.0)
+
+        # Piotroski F-Score (ROA counts for both profitability and its simplified improvement test)
+        roa_positive = col['ROA'] > 0
+        ratios['piotroski_score'] = (
+            2 * roa_positive.astype(np.int64)
+            + (has_cf & (col['operating_cash_flow'] > 0))
+            + (has_cf & has_fin & (col['operating_cash_flow'] > col['net_income']))
+            + ((col['balance_sheet_periods'] > 1) & (total_debt < zero['prior_total_debt']))
+            + (ratios['Current_Ratio'] > 1.5)
+            + (col['Gross_Margin'] > 0.3)
+            + (col['Operating_Margin'] > 0.1)
+        ).astype(np.int64)
+
+    return ratios
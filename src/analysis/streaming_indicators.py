@@ -0,0 +1,574 @@
+"""
+Streaming (append-one-bar) counterparts of the TechnicalIndicators calculations.
+"""
+import math
+import pandas as pd
+from collections import deque
+from typing import Dict, Any, Optional, Union
+
+NAN = float('nan')
+
+def _isnan(value: float) -> bool:
+    return value is None or value != value
+
+class RollingStats:
+    """Running sum / sum of squares over a fixed window, O(1) per update"""
+
+    # Recompute sums from the window periodically to bound float drift
+    RESYNC_INTERVAL = 1000
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.nan_count = 0
+        self._updates = 0
+
+    def update(self, value: float) -> None:
+        if len(self.values) == self.window:
+            old = self.values[0]
+            if _isnan(old):
+                self.nan_count -= 1
+            else:
+                self.total -= old
+                self.total_sq -= old * old
+        self.values.append(value)
+        if _isnan(value):
+            self.nan_count += 1
+        else:
+            self.total += value
+            self.total_sq += value * value
+
+        self._updates += 1
+        if self._updates % self.RESYNC_INTERVAL == 0:
+            valid = [v for v in self.values if not _isnan(v)]
+            self.total = math.fsum(valid)
+            self.total_sq = math.fsum(v * v for v in valid)
+
+    @property
+    def ready(self) -> bool:
+        return len(self.values) == self.window and self.nan_count == 0
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.window if self.ready else NAN
+
+    @property
+    def std(self) -> float:
+        """Sample standard deviation (ddof=1), as pandas rolling().std()"""
+        if not self.ready or self.window < 2:
+            return NAN
+        variance = (self.total_sq - self.total * self.total / self.window) / (self.window - 1)
+        return math.sqrt(max(variance, 0.0))
+
+class RollingExtreme:
+    """Rolling max (or min) using a monotonic deque, amortized O(1) per update"""
+
+    def __init__(self, window: int, mode: str = 'max'):
+        self.window = window
+        self.is_max = mode == 'max'
+        self.candidates = deque()  # (position, value), values monotonic
+        self.recent_nans = deque()
+        self.position = -1
+
+    def update(self, value: float) -> None:
+        self.position += 1
+        expired = self.position - self.window
+        while self.candidates and self.candidates[0][0] <= expired:
+            self.candidates.popleft()
+        while self.recent_nans and self.recent_nans[0] <= expired:
+            self.recent_nans.popleft()
+
+        if _isnan(value):
+            self.recent_nans.append(self.position)
+            return
+        if self.is_max:
+            while self.candidates and self.candidates[-1][1] <= value:
+                self.candidates.pop()
+        else:
+            while self.candidates and self.candidates[-1][1] >= value:
+                self.candidates.pop()
+        self.candidates.append((self.position, value))
+
+    @property
+    def value(self) -> float:
+        if self.position + 1 < self.window or self.recent_nans or not self.candidates:
+            return NAN
+        return self.candidates[0][1]
+
+class EMAState:
+    """Exponential moving average matching pandas ewm(span=window).mean()"""
+
+    def __init__(self, window: int):
+        self.decay = 1 - 2 / (window + 1)
+        self.numerator = 0.0
+        self.denominator = 0.0
+
+    def update(self, value: float) -> float:
+        self.numerator *= self.decay
+        self.denominator *= self.decay
+        if not _isnan(value):
+            self.numerator += value
+            self.denominator += 1.0
+        return self.value
+
+    @property
+    def value(self) -> float:
+        return self.numerator / self.denominator if self.denominator > 0 else NAN
+
+class SMAState:
+    """Simple Moving Average"""
+
+    def __init__(self, window: int = 20):
+        self.stats = RollingStats(window)
+
+    def update(self, value: float) -> float:
+        self.stats.update(value)
+        return self.stats.mean
+
+class WMAState:
+    """Weighted Moving Average with running plain and weighted sums"""
+
+    def __init__(self, window: int = 20):
+        self.window = window
+        self.values = deque(maxlen=window)
+        self.total = 0.0
+        self.weighted = 0.0
+        self.nan_count = 0
+        self.divisor = window * (window + 1) / 2
+
+    def update(self, value: float) -> float:
+        # NaNs count as zero in the sums and blank out the result
+        current = 0.0 if _isnan(value) else value
+        if len(self.values) == self.window:
+            oldest = self.values[0]
+            if _isnan(oldest):
+                self.nan_count -= 1
+                oldest = 0.0
+            # Every weight drops by one and the oldest value leaves the window
+            self.weighted += self.window * current - self.total
+            self.total += current - oldest
+        else:
+            self.weighted += (len(self.values) + 1) * current
+            self.total += current
+        self.values.append(value)
+        if _isnan(value):
+            self.nan_count += 1
+
+        if len(self.values) < self.window or self.nan_count:
+            return NAN
+        return self.weighted / self.divisor
+
+class RSIState:
+    """Relative Strength Index"""
+
+    def __init__(self, window: int = 14):
+        self.gains = RollingStats(window)
+        self.losses = RollingStats(window)
+        self.prev_close = NAN
+
+    def update(self, close: float) -> float:
+        delta = close - self.prev_close
+        self.prev_close = close
+        self.gains.update(delta if delta > 0 else 0.0)
+        self.losses.update(-delta if delta < 0 else 0.0)
+
+        gain, loss = self.gains.mean, self.losses.mean
+        if _isnan(gain) or _isnan(loss):
+            return NAN
+        if loss == 0:
+            return 100.0 if gain > 0 else NAN
+        return 100 - (100 / (1 + gain / loss))
+
+class MACDState:
+    """MACD line, signal line and histogram"""
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast = EMAState(fast)
+        self.slow = EMAState(slow)
+        self.signal = EMAState(signal)
+
+    def update(self, close: float) -> Dict[str, float]:
+        macd_line = self.fast.update(close) - self.slow.update(close)
+        signal_line = self.signal.update(macd_line)
+        return {'MACD': macd_line, 'MACD_Signal': signal_line, 'MACD_Histogram': macd_line - signal_line}
+
+class BollingerState:
+    """Bollinger Bands"""
+
+    def __init__(self, window: int = 20, num_std: float = 2):
+        self.stats = RollingStats(window)
+        self.num_std = num_std
+
+    def update(self, close: float) -> Dict[str, float]:
+        self.stats.update(close)
+        middle, std = self.stats.mean, self.stats.std
+        return {'BB_Upper': middle + std * self.num_std, 'BB_Middle': middle, 'BB_Lower': middle - std * self.num_std}
+
+class StochasticState:
+    """Stochastic Oscillator"""
+
+    def __init__(self, k_window: int = 14, d_window: int = 3):
+        self.highest = RollingExtreme(k_window, 'max')
+        self.lowest = RollingExtreme(k_window, 'min')
+        self.d_stats = RollingStats(d_window)
+
+    def update(self, high: float, low: float, close: float) -> Dict[str, float]:
+        self.highest.update(high)
+        self.lowest.update(low)
+        k_percent = _percent_of_range(close, self.lowest.value, self.highest.value)
+        self.d_stats.update(k_percent)
+        return {'Stoch_K': k_percent, 'Stoch_D': self.d_stats.mean}
+
+class ATRState:
+    """Average True Range"""
+
+    def __init__(self, window: int = 14):
+        self.stats = RollingStats(window)
+        self.prev_close = NAN
+
+    def update(self, high: float, low: float, close: float) -> float:
+        ranges = [high - low, abs(high - self.prev_close), abs(low - self.prev_close)]
+        valid = [r for r in ranges if not _isnan(r)]
+        self.prev_close = close
+        self.stats.update(max(valid) if valid else NAN)
+        return self.stats.mean
+
+class WilderState:
+    """Wilder's smoothing, matching compiled_kernels.wilder_smooth"""
+
+    def __init__(self, window: int = 14):
+        self.window = window
+        self.seed = []
+        self.value = NAN
+
+    def update(self, value: float) -> float:
+        if len(self.seed) < self.window:
+            # Leading NaNs come before the series starts
+            if not self.seed and _isnan(value):
+                return NAN
+            self.seed.append(value)
+            if len(self.seed) == self.window:
+                total = 0.0
+                for seed_value in self.seed:
+                    total += seed_value
+                self.value = total / self.window
+            return self.value
+        self.value += (value - self.value) / self.window
+        return self.value
+
+class ADXState:
+    """Average Directional Index with Wilder smoothing"""
+
+    def __init__(self, window: int = 14):
+        self.tr = WilderState(window)
+        self.plus_dm = WilderState(window)
+        self.minus_dm = WilderState(window)
+        self.dx = WilderState(window)
+        self.prev_high = NAN
+        self.prev_low = NAN
+        self.prev_close = NAN
+
+    def update(self, high: float, low: float, close: float) -> float:
+        up_move = high - self.prev_high
+        down_move = self.prev_low - low
+        ranges = [high - low, abs(high - self.prev_close), abs(low - self.prev_close)]
+        valid = [r for r in ranges if not _isnan(r)]
+        self.prev_high, self.prev_low, self.prev_close = high, low, close
+
+        if _isnan(up_move) or _isnan(down_move):
+            plus_dm = minus_dm = tr = NAN
+        else:
+            plus_dm = up_move if up_move > down_move and up_move > 0 else 0.0
+            minus_dm = down_move if down_move > up_move and down_move > 0 else 0.0
+            tr = max(valid) if valid else NAN
+
+        smoothed_tr = self.tr.update(tr)
+        smoothed_plus, smoothed_minus = self.plus_dm.update(plus_dm), self.minus_dm.update(minus_dm)
+        if smoothed_tr == 0:
+            plus_di = minus_di = 0.0
+        else:
+            plus_di = 100 * smoothed_plus / smoothed_tr
+            minus_di = 100 * smoothed_minus / smoothed_tr
+        di_sum = plus_di + minus_di
+        dx = 0.0 if di_sum == 0 else 100 * abs(plus_di - minus_di) / di_sum
+        return self.dx.update(dx)
+
+class PSARState:
+    """Parabolic SAR, matching compiled_kernels.parabolic_sar"""
+
+    def __init__(self, step: float = 0.02, max_step: float = 0.2):
+        self.step = step
+        self.max_step = max_step
+        self.started = False
+        self.uptrend = True
+        self.sar = NAN
+        self.extreme = NAN
+        self.factor = step
+        self.prev_high = self.prev_low = NAN
+        self.prev2_high = self.prev2_low = NAN
+
+    def update(self, high: float, low: float) -> float:
+        if _isnan(high) or _isnan(low):
+            return NAN
+        if not self.started:
+            self.started = True
+            self.sar, self.extreme = low, high
+            self.prev_high = self.prev2_high = high
+            self.prev_low = self.prev2_low = low
+            return NAN
+
+        sar = self.sar + self.factor * (self.extreme - self.sar)
+        if self.uptrend:
+            sar = min(sar, self.prev_low, self.prev2_low)
+            if low < sar:
+                self.uptrend, sar, self.extreme, self.factor = False, self.extreme, low, self.step
+            elif high > self.extreme:
+                self.extreme = high
+                self.factor = min(self.factor + self.step, self.max_step)
+        else:
+            sar = max(sar, self.prev_high, self.prev2_high)
+            if high > sar:
+                self.uptrend, sar, self.extreme, self.factor = True, self.extreme, high, self.step
+            elif low < self.extreme:
+                self.extreme = low
+                self.factor = min(self.factor + self.step, self.max_step)
+
+        self.sar = sar
+        self.prev2_high, self.prev2_low = self.prev_high, self.prev_low
+        self.prev_high, self.prev_low = high, low
+        return sar
+
+class IchimokuState:
+    """Ichimoku Cloud; leading spans are held back by the displacement"""
+
+    def __init__(self, conversion: int = 9, base: int = 26, span_b: int = 52, displacement: int = 26):
+        self.windows = {window: (RollingExtreme(window, 'max'), RollingExtreme(window, 'min'))
+                        for window in (conversion, base, span_b)}
+        self.conversion, self.base, self.span_b = conversion, base, span_b
+        self.pending_a = deque(maxlen=displacement + 1)
+        self.pending_b = deque(maxlen=displacement + 1)
+
+    def _midpoint(self, window: int) -> float:
+        highest, lowest = self.windows[window]
+        return (highest.value + lowest.value) / 2
+
+    def update(self, high: float, low: float) -> Dict[str, float]:
+        for highest, lowest in self.windows.values():
+            highest.update(high)
+            lowest.update(low)
+
+        tenkan, kijun = self._midpoint(self.conversion), self._midpoint(self.base)
+        self.pending_a.append((tenkan + kijun) / 2)
+        self.pending_b.append(self._midpoint(self.span_b))
+        full = len(self.pending_a) == self.pending_a.maxlen
+        return {
+            'Ichimoku_Tenkan': tenkan,
+            'Ichimoku_Kijun': kijun,
+            'Ichimoku_Senkou_A': self.pending_a[0] if full else NAN,
+            'Ichimoku_Senkou_B': self.pending_b[0] if full else NAN
+        }
+
+def _money_flow_volume(high: float, low: float, close: float, volume: float) -> float:
+    """Close location value times volume (zero for a flat bar)"""
+    price_range = high - low
+    location = 0.0 if price_range == 0 else ((close - low) - (high - close)) / price_range
+    return location * volume
+
+class MoneyFlowState:
+    """Accumulation/Distribution Line and Chaikin Money Flow"""
+
+    def __init__(self, window: int = 20):
+        self.ad_line = 0.0
+        self.money_flow = RollingStats(window)
+        self.volume = RollingStats(window)
+
+    def update(self, high: float, low: float, close: float, volume: float) -> Dict[str, float]:
+        money_flow = _money_flow_volume(high, low, close, volume)
+        self.money_flow.update(money_flow)
+        self.volume.update(volume)
+        if not _isnan(money_flow):
+            self.ad_line += money_flow
+
+        volume_mean = self.volume.mean
+        return {
+            'AD_Line': NAN if _isnan(money_flow) else self.ad_line,
+            'CMF': self.money_flow.mean / volume_mean if volume_mean else NAN
+        }
+
+class ChangeState:
+    """Rate of Change (percent) or Momentum over a fixed lag"""
+
+    def __init__(self, window: int, percent: bool = True):
+        self.values = deque(maxlen=window + 1)
+        self.percent = percent
+
+    def update(self, value: float) -> float:
+        self.values.append(value)
+        if len(self.values) < self.values.maxlen:
+            return NAN
+        base = self.values[0]
+        if not self.percent:
+            return value - base
+        return NAN if base == 0 else (value - base) / base * 100
+
+class OBVState:
+    """On-Balance Volume"""
+
+    def __init__(self):
+        self.value = NAN
+        self.prev_close = NAN
+
+    def update(self, close: float, volume: float) -> float:
+        if _isnan(self.value):
+            self.value = volume
+        elif close > self.prev_close:
+            self.value += volume
+        elif close < self.prev_close:
+            self.value -= volume
+        self.prev_close = close
+        return self.value
+
+class VWAPState:
+    """Volume Weighted Average Price (cumulative)"""
+
+    def __init__(self):
+        self.price_volume = 0.0
+        self.volume = 0.0
+
+    def update(self, high: float, low: float, close: float, volume: float) -> float:
+        self.price_volume += (high + low + close) / 3 * volume
+        self.volume += volume
+        return self.price_volume / self.volume if self.volume != 0 else NAN
+
+class WilliamsRState:
+    """Williams %R"""
+
+    def __init__(self, window: int = 14):
+        self.highest = RollingExtreme(window, 'max')
+        self.lowest = RollingExtreme(window, 'min')
+
+    def update(self, high: float, low: float, close: float) -> float:
+        self.highest.update(high)
+        self.lowest.update(low)
+        return _percent_of_range(close, self.lowest.value, self.highest.value) - 100
+
+def _percent_of_range(value: float, lowest: float, highest: float) -> float:
+    """100 * (value - lowest) / (highest - lowest), NaN for a flat range"""
+    if _isnan(lowest) or _isnan(highest) or highest == lowest:
+        return NAN
+    return 100 * ((value - lowest) / (highest - lowest))
+
+class IndicatorState:
+    """
+    Incremental state for every indicator in calculate_all_indicators.
+
+    Each update consumes one OHLCV bar in O(1) and returns the row that
+    calculate_all_indicators would have produced for it.
+    """
+
+    def __init__(self):
+        self.sma_20 = SMAState(20)
+        self.sma_50 = SMAState(50)
+        self.ema_12 = EMAState(12)
+        self.ema_26 = EMAState(26)
+        self.wma_20 = WMAState(20)
+        self.rsi = RSIState()
+        self.macd = MACDState()
+        self.bollinger = BollingerState()
+        self.stochastic = StochasticState()
+        self.atr = ATRState()
+        self.adx = ADXState()
+        self.obv = OBVState()
+        self.vwap = VWAPState()
+        self.williams_r = WilliamsRState()
+        self.psar = PSARState()
+        self.ichimoku = IchimokuState()
+        self.money_flow = MoneyFlowState()
+        self.roc = ChangeState(12)
+        self.momentum = ChangeState(10, percent=False)
+        self.volume_roc = ChangeState(14)
+        self.last_timestamp = None
+        self.latest = {}
+
+    @classmethod
+    def from_history(cls, df: pd.DataFrame) -> 'IndicatorState':
+        """
+        Build a state by replaying historical bars
+
+        Args:
+            df: DataFrame with columns ['open', 'high', 'low', 'close', 'volume']
+
+        Returns:
+            IndicatorState positioned after the last bar
+        """
+        state = cls()
+        state.update_many(df)
+        return state
+
+    def update(self, bar: Union[Dict[str, Any], pd.Series], timestamp: Optional[Any] = None) -> Dict[str, float]:
+        """
+        Append one bar and return its indicator row
+
+        Args:
+            bar: Mapping with 'open', 'high', 'low', 'close' and 'volume'
+            timestamp: Optional bar timestamp; a bar not newer than the last
+                timestamped bar was already applied and is skipped
+
+        Returns:
+            Dictionary with OHLCV values and all indicator columns (the
+            latest row, unchanged, for a skipped bar)
+        """
+        if timestamp is not None and self.last_timestamp is not None and timestamp <= self.last_timestamp:
+            return self.latest
+
+        open_, high, low = float(bar['open']), float(bar['high']), float(bar['low'])
+        close, volume = float(bar['close']), float(bar['volume'])
+
+        row = {'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume}
+        row['SMA_20'] = self.sma_20.update(close)
+        row['SMA_50'] = self.sma_50.update(close)
+        row['EMA_12'] = self.ema_12.update(close)
+        row['EMA_26'] = self.ema_26.update(close)
+        row['WMA_20'] = self.wma_20.update(close)
+        row['RSI'] = self.rsi.update(close)
+        row.update(self.macd.update(close))
+        row.update(self.bollinger.update(close))
+        row.update(self.stochastic.update(high, low, close))
+        row['ATR'] = self.atr.update(high, low, close)
+        row['ADX'] = self.adx.update(high, low, close)
+        row['OBV'] = self.obv.update(close, volume)
+        row['VWAP'] = self.vwap.update(high, low, close, volume)
+        row['Williams_R'] = self.williams_r.update(high, low, close)
+        row['PSAR'] = self.psar.update(high, low)
+        row.update(self.ichimoku.update(high, low))
+        row.update(self.money_flow.update(high, low, close, volume))
+        row['ROC'] = self.roc.update(close)
+        row['Momentum'] = self.momentum.update(close)
+        row['Volume_ROC'] = self.volume_roc.update(volume)
+
+        if timestamp is not None:
+            self.last_timestamp = timestamp
+        self.latest = row
+        return row
+
+    def update_many(self, df: pd.DataFrame) -> Dict[str, float]:
+        """
+        Append every bar of a DataFrame newer than the last seen timestamp
+
+        Useful for polling MarketStackClient.get_intraday_data: bars already
+        consumed are skipped, so each poll only costs the new bars.
+
+        Args:
+            df: DataFrame with OHLCV columns and a date index
+
+        Returns:
+            Indicator row for the latest bar
+        """
+        if self.last_timestamp is not None:
+            df = df[df.index > self.last_timestamp]
+
+        for timestamp, bar in zip(df.index, df[['open', 'high', 'low', 'close', 'volume']].itertuples(index=False)):
+            self.update(bar._asdict(), timestamp=timestamp)
+        return self.latest
@@ -3,7 +3,8 @@ Comprehensive technical analysis module with pandas-based calculations.
 """
 import pandas as pd
 import numpy as np
-from typing import Dict, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
+from src.utils import json_value
 
 class TechnicalIndicators:
     """Class for calculating technical indicators using pandas"""
@@ -72,34 +73,15 @@ class TechnicalIndicators:
     
     @staticmethod
     def adx(high: pd.Series, low: pd.Series, close: pd.Series, window: int = 14) -> pd.Series:
-        """Average Directional Index (simplified version)"""
-        plus_dm = high.diff()
-        minus_dm = -low.diff()
-        plus_dm[plus_dm < 0] = 0
-        minus_dm[minus_dm < 0] = 0
-        
-        tr = TechnicalIndicators.atr(high, low, close, window)
-        plus_di = 100 * (plus_dm.rolling(window=window).mean() / tr)
-        minus_di = 100 * (minus_dm.rolling(window=window).mean() / tr)
-        
-        dx = (abs(plus_di - minus_di) / (plus_di + minus_di)) * 100
-        return dx.rolling(window=window).mean()
+        """Average Directional Index (Wilder smoothing)"""
+        from src.analysis.array_indicators import ArrayIndicators
+        return pd.Series(ArrayIndicators.adx(high, low, close, window), index=close.index)
     
     @staticmethod
     def obv(close: pd.Series, volume: pd.Series) -> pd.Series:
         """On-Balance Volume"""
-        obv = pd.Series(index=close.index, dtype=float)
-        obv.iloc[0] = volume.iloc[0]
-        
-        for i in range(1, len(close)):
-            if close.iloc[i] > close.iloc[i-1]:
-                obv.iloc[i] = obv.iloc[i-1] + volume.iloc[i]
-            elif close.iloc[i] < close.iloc[i-1]:
-                obv.iloc[i] = obv.iloc[i-1] - volume.iloc[i]
-            else:
-                obv.iloc[i] = obv.iloc[i-1]
-        
-        return obv
+        from src.analysis.array_indicators import ArrayIndicators
+        return pd.Series(ArrayIndicators.obv(close, volume), index=close.index, dtype=float)
     
     @staticmethod
     def vwap(high: pd.Series, low: pd.Series, close: pd.Series, volume: pd.Series) -> pd.Series:
@@ -113,121 +95,219 @@ class TechnicalIndicators:
         highest_high = high.rolling(window=window).max()
         lowest_low = low.rolling(window=window).min()
         return -100 * ((highest_high - close) / (highest_high - lowest_low))
+    
+    @staticmethod
+    def parabolic_sar(high: pd.Series, low: pd.Series, step: float = 0.02, max_step: float = 0.2) -> pd.Series:
+        """Parabolic SAR"""
+        from src.analysis.compiled_kernels import parabolic_sar
+        return pd.Series(parabolic_sar(high.to_numpy(dtype=float), low.to_numpy(dtype=float), step, max_step), index=high.index)
+    
+    @staticmethod
+    def ichimoku(high: pd.Series, low: pd.Series, conversion: int = 9, base: int = 26,
+                 span_b: int = 52, displacement: int = 26) -> Tuple[pd.Series, pd.Series, pd.Series, pd.Series]:
+        """Ichimoku Cloud (conversion line, base line, leading spans A and B)"""
+        tenkan = (high.rolling(window=conversion).max() + low.rolling(window=conversion).min()) / 2
+        kijun = (high.rolling(window=base).max() + low.rolling(window=base).min()) / 2
+        senkou_a = ((tenkan + kijun) / 2).shift(displacement)
+        senkou_b = ((high.rolling(window=span_b).max() + low.rolling(window=span_b).min()) / 2).shift(displacement)
+        return tenkan, kijun, senkou_a, senkou_b
+    
+    @staticmethod
+    def money_flow_volume(high: pd.Series, low: pd.Series, close: pd.Series, volume: pd.Series) -> pd.Series:
+        """Close location value times volume (zero for a flat bar)"""
+        location = ((close - low) - (high - close)) / (high - low)
+        return location.where(high != low, 0) * volume
+    
+    @staticmethod
+    def accumulation_distribution(high: pd.Series, low: pd.Series, close: pd.Series, volume: pd.Series) -> pd.Series:
+        """Accumulation/Distribution Line"""
+        return TechnicalIndicators.money_flow_volume(high, low, close, volume).cumsum()
+    
+    @staticmethod
+    def chaikin_money_flow(high: pd.Series, low: pd.Series, close: pd.Series, volume: pd.Series, window: int = 20) -> pd.Series:
+        """Chaikin Money Flow"""
+        money_flow = TechnicalIndicators.money_flow_volume(high, low, close, volume)
+        return money_flow.rolling(window=window).mean() / volume.rolling(window=window).mean()
+    
+    @staticmethod
+    def roc(data: pd.Series, window: int = 12) -> pd.Series:
+        """Rate of Change in percent"""
+        base = data.shift(window).where(lambda x: x != 0)
+        return (data - base) / base * 100
+    
+    @staticmethod
+    def momentum(data: pd.Series, window: int = 10) -> pd.Series:
+        """Momentum (price change over the window)"""
+        return data - data.shift(window)
 
-def calculate_all_indicators(df: pd.DataFrame) -> pd.DataFrame:
+
+def calculate_all_indicators(df: pd.DataFrame, backend: str = 'pandas', latest_only: bool = False,
+                             columns: Optional[List[str]] = None) -> pd.DataFrame:
     """
     Calculate all technical indicators for a given DataFrame
     
+    Indicators are evaluated through the dependency graph in indicator_graph,
+    so shared intermediates (rolling windows, true range, EMAs) are computed
+    once and only the nodes behind the requested columns run.
+    
     Args:
         df: DataFrame with columns ['open', 'high', 'low', 'close', 'volume']
+        backend: 'pandas' (default) or 'numpy' for the vectorized array kernels
+        latest_only: Only compute the last row (see calculate_latest_indicators)
+        columns: Indicator columns to add (default: all of INDICATOR_COLUMNS);
+            any graph node, e.g. 'Price_Volatility', may be requested
         
     Returns:
         DataFrame with all technical indicators added
     """
+    from src.analysis.indicator_graph import compute_indicators
+    
     # Ensure we have the required columns
     required_columns = ['open', 'high', 'low', 'close', 'volume']
     if not all(col in df.columns for col in required_columns):
         raise ValueError(f"DataFrame must contain columns: {required_columns}")
+    if backend not in ('pandas', 'numpy'):
+        raise ValueError(f"Unknown indicator backend: {backend}")
+    
+    if latest_only:
+        if df.empty:
+            return df.copy()
+        latest = calculate_latest_indicators(df)
+        if columns is not None:
+            latest = {name: value for name, value in latest.items() if name in required_columns or name in columns}
+        return pd.DataFrame([latest], index=df.index[-1:], dtype=float)
     
     # Create a copy to avoid modifying original
     result = df.copy()
     
-    # Moving averages
-    result['SMA_20'] = TechnicalIndicators.sma(df['close'], 20)
-    result['SMA_50'] = TechnicalIndicators.sma(df['close'], 50)
-    result['EMA_12'] = TechnicalIndicators.ema(df['close'], 12)
-    result['EMA_26'] = TechnicalIndicators.ema(df['close'], 26)
-    result['WMA_20'] = TechnicalIndicators.wma(df['close'], 20)
-    
-    # RSI
-    result['RSI'] = TechnicalIndicators.rsi(df['close'])
-    
-    # MACD
-    macd_line, signal_line, histogram = TechnicalIndicators.macd(df['close'])
-    result['MACD'] = macd_line
-    result['MACD_Signal'] = signal_line
-    result['MACD_Histogram'] = histogram
+    for name, values in compute_indicators(df, columns, backend=backend).items():
+        result[name] = values
     
-    # Bollinger Bands
-    bb_upper, bb_middle, bb_lower = TechnicalIndicators.bollinger_bands(df['close'])
-    result['BB_Upper'] = bb_upper
-    result['BB_Middle'] = bb_middle
-    result['BB_Lower'] = bb_lower
+    return result
+
+def calculate_latest_indicators(df: pd.DataFrame) -> Dict[str, Any]:
+    """
+    Calculate only the latest row of calculate_all_indicators
     
-    # Stochastic Oscillator
-    stoch_k, stoch_d = TechnicalIndicators.stochastic_oscillator(df['high'], df['low'], df['close'])
-    result['Stoch_K'] = stoch_k
-    result['Stoch_D'] = stoch_d
+    Each indicator runs over the trailing window it needs instead of the full
+    history; EMA-based columns match the full computation to ~1e-9 relative
+    (see array_indicators.SNAPSHOT_WARMUP), all others exactly.
     
-    # ATR
-    result['ATR'] = TechnicalIndicators.atr(df['high'], df['low'], df['close'])
+    Args:
+        df: DataFrame with columns ['open', 'high', 'low', 'close', 'volume']
+        
+    Returns:
+        Dictionary with the latest values of the numeric columns and the
+        indicators, JSON-safe (undefined values are None)
+    """
+    from src.analysis.array_indicators import compute_latest_indicators
     
-    # ADX
-    result['ADX'] = TechnicalIndicators.adx(df['high'], df['low'], df['close'])
+    if df.empty:
+        return {}
     
-    # OBV
-    result['OBV'] = TechnicalIndicators.obv(df['close'], df['volume'])
+    numeric = df.select_dtypes(include='number')
+    latest = {col: json_value(value) for col, value in numeric.iloc[-1].items()}
+    indicators = compute_latest_indicators(df['high'], df['low'], df['close'], df['volume'])
+    latest.update({name: json_value(value) for name, value in indicators.items()})
+    return latest
+
+def calculate_panel_indicators(frames: Dict[str, pd.DataFrame]):
+    """
+    Calculate all technical indicators for many symbols in one vectorized pass
+
+    Args:
+        frames: Mapping of symbol to DataFrame with columns ['open', 'high', 'low', 'close', 'volume']
+
+    Returns:
+        IndicatorPanel with (date x symbol) arrays for every indicator
+    """
+    from src.analysis.panel_indicators import IndicatorPanel
+
+    panel = IndicatorPanel.from_frames(frames)
+    panel.compute()
+    return panel
+
+# Signal flag name -> label used in technical summaries
+SIGNAL_LABELS = {
+    'rsi_overbought': 'RSI Overbought',
+    'rsi_oversold': 'RSI Oversold',
+    'above_bb_upper': 'Above Bollinger Upper Band',
+    'below_bb_lower': 'Below Bollinger Lower Band'
+}
+
+def calculate_trend_score(latest) -> Union[int, np.ndarray]:
+    """
+    Trend score (0-3): close above SMA_20, close above SMA_50, EMA_12 above EMA_26
     
-    # VWAP
-    result['VWAP'] = TechnicalIndicators.vwap(df['high'], df['low'], df['close'], df['volume'])
+    Args:
+        latest: A single indicator row, or a mapping of columns to arrays
+            to score many symbols at once
+    """
+    return ((latest['close'] > latest['SMA_20']) * 1 +
+            (latest['close'] > latest['SMA_50']) * 1 +
+            (latest['EMA_12'] > latest['EMA_26']) * 1)
+
+def calculate_momentum_score(latest) -> Union[int, np.ndarray]:
+    """
+    Momentum score (0-3): RSI above 50, MACD above signal, Stoch_K above Stoch_D
     
-    # Williams %R
-    result['Williams_R'] = TechnicalIndicators.williams_r(df['high'], df['low'], df['close'])
+    Args:
+        latest: A single indicator row, or a mapping of columns to arrays
+    """
+    return ((latest['RSI'] > 50) * 1 +
+            (latest['MACD'] > latest['MACD_Signal']) * 1 +
+            (latest['Stoch_K'] > latest['Stoch_D']) * 1)
+
+def calculate_signal_flags(latest) -> Dict:
+    """
+    RSI and Bollinger Band signal flags (keys of SIGNAL_LABELS)
     
-    return result
+    Args:
+        latest: A single indicator row, or a mapping of columns to arrays
+    """
+    return {
+        'rsi_overbought': latest['RSI'] > 70,
+        'rsi_oversold': latest['RSI'] < 30,
+        'above_bb_upper': latest['close'] > latest['BB_Upper'],
+        'below_bb_lower': latest['close'] < latest['BB_Lower']
+    }
 
-def get_technical_summary(df: pd.DataFrame) -> Dict:
+def get_technical_summary(df: Union[pd.DataFrame, pd.Series, Dict]) -> Dict:
     """
     Get a technical analysis summary for the latest data point
     
     Args:
-        df: DataFrame with technical indicators
+        df: DataFrame with technical indicators, or a single indicator row
+            (e.g. from IndicatorState.update)
         
     Returns:
         Dictionary with technical analysis summary
     """
-    if df.empty:
+    if len(df) == 0:
         return {}
     
-    latest = df.iloc[-1]
-    
-    # Trend indicators
-    trend_score = 0
-    if latest['close'] > latest['SMA_20']:
-        trend_score += 1
-    if latest['close'] > latest['SMA_50']:
-        trend_score += 1
-    if latest['EMA_12'] > latest['EMA_26']:
-        trend_score += 1
-    
-    # Momentum indicators
-    momentum_score = 0
-    if latest['RSI'] > 50:
-        momentum_score += 1
-    if latest['MACD'] > latest['MACD_Signal']:
-        momentum_score += 1
-    if latest['Stoch_K'] > latest['Stoch_D']:
-        momentum_score += 1
+    if isinstance(df, pd.DataFrame):
+        latest = df.iloc[-1]
+    elif isinstance(df, dict):
+        # None (e.g. from calculate_latest_indicators) back to NaN so comparisons are False
+        latest = pd.Series(df, dtype=float)
+    else:
+        latest = df
     
-    # Generate signals
-    signals = []
-    if latest['RSI'] > 70:
-        signals.append("RSI Overbought")
-    elif latest['RSI'] < 30:
-        signals.append("RSI Oversold")
+    trend_score = int(calculate_trend_score(latest))
+    momentum_score = int(calculate_momentum_score(latest))
     
-    if latest['close'] > latest['BB_Upper']:
-        signals.append("Above Bollinger Upper Band")
-    elif latest['close'] < latest['BB_Lower']:
-        signals.append("Below Bollinger Lower Band")
+    # Generate signals
+    flags = calculate_signal_flags(latest)
+    signals = [label for name, label in SIGNAL_LABELS.items() if flags[name]]
     
     return {
         'trend_score': trend_score,
         'momentum_score': momentum_score,
         'signals': signals,
-        'rsi': latest['RSI'],
-        'macd': latest['MACD'],
-        'sma_20': latest['SMA_20'],
-        'sma_50': latest['SMA_50'],
-        'current_price': latest['close']
+        'rsi': json_value(latest['RSI']),
+        'macd': json_value(latest['MACD']),
+        'sma_20': json_value(latest['SMA_20']),
+        'sma_50': json_value(latest['SMA_50']),
+        'current_price': json_value(latest['close'])
     }
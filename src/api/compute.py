@@ -0,0 +1,178 @@
+"""
+Process pool for the API's CPU-bound work, with admission control.
+"""
+import os
+import math
+import time
+import asyncio
+import threading
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+from fastapi import HTTPException
+from src.config import get_settings
+
+settings = get_settings()
+
+# Retry-After bounds in seconds, and the job duration assumed until one has finished
+RETRY_AFTER_MIN = 1
+RETRY_AFTER_MAX = 60
+DEFAULT_JOB_SECONDS = 5.0
+
+# Weight of the latest job in the moving average of job durations
+DURATION_SMOOTHING = 0.2
+
+# Bars in the synthetic frame used to warm up new workers
+WARMUP_BARS = 300
+
+def _warm_worker() -> None:
+    """
+    Worker initializer: import the pipeline and run the indicator graph once
+
+    Pays for the pandas/sklearn imports and the compiled kernels' JIT when
+    the worker starts rather than on its first request.
+    """
+    import numpy as np
+    import pandas as pd
+    from src.prediction.pipeline import INDICATOR_COLUMNS, MODEL_GRAPH_FEATURES, calculate_all_indicators
+
+    rng = np.random.default_rng(0)
+    close = 100 + rng.standard_normal(WARMUP_BARS).cumsum()
+    frame = pd.DataFrame({
+        'open': close,
+        'high': close + 1,
+        'low': close - 1,
+        'close': close,
+        'volume': rng.integers(1_000, 10_000, WARMUP_BARS).astype(float)
+    }, index=pd.bdate_range('2020-01-01', periods=WARMUP_BARS))
+    try:
+        calculate_all_indicators(frame, columns=INDICATOR_COLUMNS + MODEL_GRAPH_FEATURES)
+    except Exception as e:
+        print(f"Warning: Compute worker warm-up failed: {e}")
+
+def _worker_pid() -> int:
+    return os.getpid()
+
+class ComputePool:
+    """
+    Spawned worker processes for indicator and model work.
+
+    Handlers await ``run`` instead of computing in the event loop or the
+    server threadpool. At most ``max_inflight`` jobs are admitted at once;
+    beyond that a request fails fast with 429 and a Retry-After estimated
+    from recent job durations, and a pool that is shut down or whose
+    worker died answers 503, so overload turns into rejected requests
+    instead of every request slowing down.
+    """
+
+    def __init__(self, workers: Optional[int] = None, max_inflight: Optional[int] = None):
+        self.workers = workers or settings.api.compute_workers or os.cpu_count() or 1
+        self.max_inflight = max_inflight or settings.api.max_inflight or 2 * self.workers
+        self._executor = None
+        self._closed = False
+        self._inflight = 0
+        self._mean_duration = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """Create the pool and start every worker so each is warm before the first request"""
+        with self._lock:
+            self._closed = False
+            if self._executor is not None:
+                return
+            # Spawned workers import a clean interpreter instead of forking the server
+            self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context('spawn'),
+                                                 initializer=_warm_worker)
+            # Workers are spawned on demand, so one concurrent no-op each starts them all
+            for _ in range(self.workers):
+                self._executor.submit(_worker_pid)
+
+    @property
+    def inflight(self) -> int:
+        """Jobs admitted and not yet finished"""
+        return self._inflight
+
+    def retry_after(self) -> int:
+        """Seconds until a slot is likely to free up"""
+        duration = self._mean_duration or DEFAULT_JOB_SECONDS
+        estimate = math.ceil(duration * max(self._inflight, 1) / self.workers)
+        return min(RETRY_AFTER_MAX, max(RETRY_AFTER_MIN, estimate))
+
+    def _reject(self, status_code: int, detail: str) -> HTTPException:
+        return HTTPException(status_code=status_code, detail=detail,
+                             headers={'Retry-After': str(self.retry_after())})
+
+    def _finish(self, future: Future, start: float) -> None:
+        """Release a job's slot once its worker is done with it, and record its duration"""
+        duration = time.perf_counter() - start
+        with self._lock:
+            self._inflight -= 1
+            if future.cancelled():
+                return
+            if self._mean_duration is None:
+                self._mean_duration = duration
+            else:
+                self._mean_duration += DURATION_SMOOTHING * (duration - self._mean_duration)
+
+    def _discard(self, executor: ProcessPoolExecutor) -> None:
+        """Drop a broken pool; the next job starts a new one"""
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run a picklable function in a worker process
+
+        Args:
+            fn: Module-level function
+            *args: Picklable arguments
+
+        Returns:
+            The function's return value
+
+        Raises:
+            HTTPException: 429 when max_inflight jobs are running, 503 when
+                the pool is shut down or a worker died (both with Retry-After)
+        """
+        if self._executor is None and not self._closed:
+            self.start()
+        with self._lock:
+            executor = self._executor
+            if executor is None:
+                raise self._reject(503, "Compute pool is not running")
+            if self._inflight >= self.max_inflight:
+                raise self._reject(429, "Too many requests in progress")
+            self._inflight += 1
+
+        start = time.perf_counter()
+        try:
+            future = executor.submit(fn, *args)
+        except (BrokenProcessPool, RuntimeError):
+            # Broken, or shut down since it was picked up
+            with self._lock:
+                self._inflight -= 1
+            self._discard(executor)
+            raise self._reject(503, "Compute pool is not running")
+        # A cancelled request does not stop a job that already started, so the
+        # slot is held until the worker finishes rather than until the request ends
+        future.add_done_callback(lambda done: self._finish(done, start))
+        try:
+            return await asyncio.wrap_future(future)
+        except BrokenProcessPool:
+            self._discard(executor)
+            raise self._reject(503, "Compute worker crashed")
+
+    def shutdown(self) -> None:
+        """Stop the workers; jobs submitted afterwards get 503"""
+        with self._lock:
+            self._closed = True
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+# Global compute pool instance
+compute_pool = ComputePool()
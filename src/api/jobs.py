@@ -0,0 +1,251 @@
+"""
+Background prediction jobs backed by SQLite and a worker process pool.
+"""
+import os
+import json
+import time
+import uuid
+import socket
+import sqlite3
+import threading
+import numpy as np
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, Optional
+from src.config import get_settings
+
+settings = get_settings()
+
+ACTIVE_STATUSES = ('queued', 'running')
+
+# A running job whose heartbeat is this many intervals old is presumed dead
+STALE_HEARTBEATS = 3
+
+def _json_default(value: Any) -> Any:
+    """Serialize numpy scalars/arrays found in prediction results"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+def _connect(db_path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path, timeout=30, isolation_level=None)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+def _set_status(db_path: str, job_id: str, **fields: Any) -> None:
+    assignments = ', '.join(f"{name} = ?" for name in fields)
+    with _connect(db_path) as conn:
+        conn.execute(f"UPDATE jobs SET {assignments} WHERE id = ?", (*fields.values(), job_id))
+
+def _claim(db_path: str, job_id: str, owner: str) -> bool:
+    """Move a queued job to running for this owner; False if another process got it first"""
+    now = time.time()
+    with _connect(db_path) as conn:
+        cursor = conn.execute(
+            "UPDATE jobs SET status = 'running', owner = ?, started_at = ?, heartbeat = ? "
+            "WHERE id = ? AND status = 'queued'",
+            (owner, now, now, job_id)
+        )
+    return cursor.rowcount == 1
+
+def _heartbeat(db_path: str, job_id: str, owner: str, interval: int, done: threading.Event) -> None:
+    while not done.wait(interval):
+        with _connect(db_path) as conn:
+            conn.execute("UPDATE jobs SET heartbeat = ? WHERE id = ? AND owner = ?", (time.time(), job_id, owner))
+
+def _run_job(db_path: str, job_id: str, symbol: str, days: int, dispatcher: str,
+             heartbeat_interval: int) -> None:
+    """Worker-process entry point: claim one prediction, run it and store the outcome"""
+    from src.prediction.pipeline import run_prediction
+
+    owner = f"{dispatcher}/{os.getpid()}"
+    if not _claim(db_path, job_id, owner):
+        return
+
+    done = threading.Event()
+    threading.Thread(target=_heartbeat, args=(db_path, job_id, owner, heartbeat_interval, done),
+                     daemon=True).start()
+    try:
+        result = run_prediction(symbol, days)
+        _set_status(db_path, job_id, status='completed', finished_at=time.time(),
+                    result=json.dumps(result, default=_json_default))
+    except Exception as e:
+        _set_status(db_path, job_id, status='failed', finished_at=time.time(), error=str(e))
+    finally:
+        done.set()
+
+class PredictionJobQueue:
+    """
+    Queue of /predict jobs consumed by a pool of worker processes.
+
+    Job state lives in SQLite so any API worker can poll it and queued jobs
+    survive restarts. Submitting a symbol/days pair that already has a
+    queued or running job returns that job instead of creating a new one.
+
+    Several processes may dispatch the same queued job (each one resumes
+    the queue when it starts); a worker runs it only after claiming the
+    row with a conditional UPDATE, so exactly one does. Running jobs send
+    heartbeats, and only those whose heartbeat went stale (their process
+    died) are put back in the queue.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, workers: Optional[int] = None,
+                 heartbeat_interval: Optional[int] = None):
+        self.db_path = db_path or settings.jobs.db_path
+        self.workers = workers or settings.jobs.workers
+        self.heartbeat_interval = heartbeat_interval or settings.jobs.heartbeat_interval
+        self.dispatcher = f"{socket.gethostname()}:{os.getpid()}"
+        self._executor = None
+        self._lock = threading.Lock()
+        self._initialized = False
+
+    def _ensure_ready(self) -> None:
+        """Create the schema and worker pool on first use, requeueing unfinished jobs"""
+        if self._initialized:
+            return
+        with self._lock:
+            if self._initialized:
+                return
+            os.makedirs(os.path.dirname(self.db_path) or '.', exist_ok=True)
+            with _connect(self.db_path) as conn:
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS jobs (
+                        id TEXT PRIMARY KEY,
+                        dedupe_key TEXT NOT NULL,
+                        symbol TEXT NOT NULL,
+                        days INTEGER NOT NULL,
+                        status TEXT NOT NULL,
+                        result TEXT,
+                        error TEXT,
+                        created_at REAL NOT NULL,
+                        started_at REAL,
+                        finished_at REAL,
+                        owner TEXT,
+                        heartbeat REAL
+                    )
+                """)
+                columns = {row['name'] for row in conn.execute("PRAGMA table_info(jobs)")}
+                for column, kind in (('owner', 'TEXT'), ('heartbeat', 'REAL')):
+                    if column not in columns:
+                        conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+                conn.execute("CREATE INDEX IF NOT EXISTS jobs_dedupe ON jobs (dedupe_key, status)")
+
+                # Running jobs of live processes keep their heartbeat fresh; the rest are requeued
+                stale = time.time() - STALE_HEARTBEATS * self.heartbeat_interval
+                conn.execute(
+                    "UPDATE jobs SET status = 'queued', owner = NULL "
+                    "WHERE status = 'running' AND COALESCE(heartbeat, started_at, 0) < ?",
+                    (stale,)
+                )
+                unfinished = conn.execute(
+                    "SELECT id, symbol, days FROM jobs WHERE status = 'queued'"
+                ).fetchall()
+
+            # Spawned workers import a clean interpreter instead of forking the server
+            self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                 mp_context=multiprocessing.get_context('spawn'))
+            self._initialized = True
+
+        # Queued jobs another live process dispatched too are claimed by only one worker
+        for row in unfinished:
+            self._dispatch(row['id'], row['symbol'], row['days'])
+
+    def _dispatch(self, job_id: str, symbol: str, days: int) -> None:
+        future = self._executor.submit(_run_job, self.db_path, job_id, symbol, days,
+                                       self.dispatcher, self.heartbeat_interval)
+
+        def _on_done(done_future):
+            # Cancelled at shutdown: the job stays queued and is resumed on next start
+            if done_future.cancelled():
+                return
+            # Only reached if the worker itself died (e.g. killed or unpicklable);
+            # a job another process claimed is left to that process
+            error = done_future.exception()
+            if error is not None:
+                with _connect(self.db_path) as conn:
+                    conn.execute(
+                        "UPDATE jobs SET status = 'failed', finished_at = ?, error = ? "
+                        "WHERE id = ? AND (status = 'queued' OR (status = 'running' AND owner LIKE ?))",
+                        (time.time(), str(error), job_id, f"{self.dispatcher}/%")
+                    )
+
+        future.add_done_callback(_on_done)
+
+    def submit(self, symbol: str, days: int = 30) -> Dict[str, Any]:
+        """
+        Enqueue a prediction, deduplicating against identical in-flight jobs
+
+        Args:
+            symbol: Stock symbol
+            days: Number of days to predict
+
+        Returns:
+            Job status dictionary (see get)
+        """
+        self._ensure_ready()
+        symbol = symbol.upper()
+        dedupe_key = f"{symbol}:{days}"
+
+        with _connect(self.db_path) as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            existing = conn.execute(
+                "SELECT id FROM jobs WHERE dedupe_key = ? AND status IN (?, ?) ORDER BY created_at LIMIT 1",
+                (dedupe_key, *ACTIVE_STATUSES)
+            ).fetchone()
+            if existing is not None:
+                conn.execute("COMMIT")
+                return self.get(existing['id'])
+
+            job_id = uuid.uuid4().hex
+            conn.execute(
+                "INSERT INTO jobs (id, dedupe_key, symbol, days, status, created_at) VALUES (?, ?, ?, ?, 'queued', ?)",
+                (job_id, dedupe_key, symbol, days, time.time())
+            )
+            conn.execute("COMMIT")
+
+        self._dispatch(job_id, symbol, days)
+        return self.get(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a job's status, and its result once completed
+
+        Args:
+            job_id: Job identifier returned by submit
+
+        Returns:
+            Job dictionary or None if the job is unknown
+        """
+        self._ensure_ready()
+        with _connect(self.db_path) as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+
+        job = {
+            'job_id': row['id'],
+            'symbol': row['symbol'],
+            'days': row['days'],
+            'status': row['status'],
+            'created_at': row['created_at'],
+            'started_at': row['started_at'],
+            'finished_at': row['finished_at']
+        }
+        if row['status'] == 'completed':
+            job['result'] = json.loads(row['result'])
+        elif row['status'] == 'failed':
+            job['error'] = row['error']
+        return job
+
+    def shutdown(self) -> None:
+        """Stop the worker pool (queued jobs are resumed on next start)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+            self._initialized = False
+
+# Global job queue instance
+prediction_jobs = PredictionJobQueue()
@@ -3,12 +3,11 @@ Main FastAPI application to run the stock prediction service.
 """
 
 from fastapi import FastAPI, HTTPException
-from src.data.marketstack import marketstack_client
-from src.analysis.technical_indicators import calculate_all_indicators, get_technical_summary
-from src.analysis.fundamental import get_fundamental_summary
-from src.prediction.ml_models import StockPredictor, create_ensemble_prediction, generate_recommendation
+from typing import Optional
 import pandas as pd
 
+# Data, analysis and model modules are imported inside handlers so workers start quickly
+
 # Initialize FastAPI
 app = FastAPI(title="Stock Prediction Prototype")
 
@@ -17,28 +16,52 @@ def get_stock_analysis(symbol: str):
     """
     Endpoint to get stock analysis for a given symbol
     """
+    from src.data.marketstack import marketstack_client
+    from src.analysis.technical_indicators import calculate_latest_indicators, get_technical_summary
+
     # Fetch stock data
     stock_data = marketstack_client.get_stock_data(symbol)
     if stock_data.empty:
         raise HTTPException(status_code=404, detail="Stock data not found")
     
-    # Calculate technical indicators
-    indicators = calculate_all_indicators(stock_data)
+    # Calculate technical indicators for the latest bar only
+    latest_indicators = calculate_latest_indicators(stock_data)
 
     # Get technical summary
-    tech_summary = get_technical_summary(indicators)
+    tech_summary = get_technical_summary(latest_indicators)
 
     return {
         "symbol": symbol,
         "technical_summary": tech_summary,
-        "indicators": indicators.to_dict(orient='records')[-1] # latest indicators
+        "indicators": latest_indicators
     }
 
+@app.get("/scan", summary="Scan a symbol universe with a filter query", tags=["Stocks"])
+def scan_stocks(query: Optional[str] = None, symbols: Optional[str] = None, sort_by: str = "score",
+                ascending: bool = False, limit: int = 50):
+    """
+    Endpoint to filter and rank many symbols at once, e.g. query="RSI < 30 and close < BB_Lower"
+    """
+    from src.config import settings
+    from src.data.marketstack import marketstack_client
+    from src.analysis.scanner import ScanQuery, ScanQueryError, resolve_universe, scan_frames
+
+    try:
+        symbol_list = resolve_universe(symbols)
+        if query:
+            ScanQuery(query)
+        frames = marketstack_client.get_stock_data_batch(symbol_list, days=settings.analysis.scan_history_days)
+        return scan_frames(frames, query=query, sort_by=sort_by, ascending=ascending, limit=limit)
+    except ScanQueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @app.get("/company/{symbol}", summary="Get company info and fundamental analysis", tags=["Company"])
 def get_company_analysis(symbol: str):
     """
     Endpoint to get company info and fundamental analysis for a given symbol
     """
+    from src.analysis.fundamental import get_fundamental_summary
+
     # Get company info and fundamental metrics
     fundamental_summary = get_fundamental_summary(symbol)
     
@@ -49,41 +72,10 @@ def predict_stock_price(symbol: str, days: int = 30):
     """
     Endpoint to predict future stock prices for a given symbol
     """
-    try:
-        # Fetch stock data and calculate indicators
-        stock_data = marketstack_client.get_stock_data(symbol)
-        if stock_data.empty:
-            raise HTTPException(status_code=404, detail="Stock data not found")
-        
-        indicators = calculate_all_indicators(stock_data)
-
-        # Prepare features and train models
-        predictor = StockPredictor()
-        X, y = predictor.prepare_features(indicators)
-        training_results = predictor.train_models(X, y)
-        
-        # Predict future prices
-        future_predictions = predictor.predict_future(indicators, days=days)
-        
-        # Create ensemble prediction
-        ensemble_result = create_ensemble_prediction(future_predictions)
+    from src.prediction.pipeline import run_prediction
 
-        # Current price
-        current_price = indicators.iloc[-1]['close']
-
-        # Generate recommendation
-        recommendation = generate_recommendation(current_price, 
-                                                 ensemble_result.get('ensemble_prediction', current_price), 
-                                                 ensemble_result.get('confidence', 0.5))
-
-        return {
-            "symbol": symbol,
-            "training_results": training_results,
-            "future_predictions": future_predictions,
-            "ensemble_prediction": ensemble_result,
-            "recommendation": recommendation,
-            "current_price": current_price
-        }
+    try:
+        return run_prediction(symbol, days)
     except Exception as e:
         return {"error": str(e), "symbol": symbol}
 
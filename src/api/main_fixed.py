@@ -2,7 +2,9 @@
 Main FastAPI application to run the stock prediction service.
 """
 
+import asyncio
 from fastapi import FastAPI, HTTPException
+from typing import Optional
 from fastapi.middleware.cors import CORSMiddleware
 import pandas as pd
 
@@ -19,102 +21,172 @@ app.add_middleware(
 )
 
 @app.get("/")
-def read_root():
+async def read_root():
     return {"message": "Stock Prediction API is running!", "status": "healthy"}
 
 @app.get("/health", summary="Get service health status", tags=["Health"])
-def get_health_status():
+async def get_health_status():
     """
     Endpoint to check the health status of the API
     """
-    return {"status": "healthy"}
+    from src.api.compute import compute_pool
+    
+    return {"status": "healthy", "inflight": compute_pool.inflight, "max_inflight": compute_pool.max_inflight}
 
 @app.get("/stocks/{symbol}", summary="Get stock analysis", tags=["Stocks"])
-def get_stock_analysis(symbol: str):
+async def get_stock_analysis(symbol: str):
     """
     Endpoint to get stock analysis for a given symbol
     """
     try:
-        from src.data.marketstack import marketstack_client
-        from src.analysis.technical_indicators import calculate_all_indicators, get_technical_summary
+        from src.api.compute import compute_pool
+        from src.data.marketstack import async_marketstack_client
+        from src.analysis.technical_indicators import calculate_latest_indicators, get_technical_summary
         
         # Fetch stock data
-        stock_data = marketstack_client.get_stock_data(symbol)
+        stock_data = await async_marketstack_client.get_stock_data(symbol)
         if stock_data.empty:
             raise HTTPException(status_code=404, detail="Stock data not found")
         
-        # Calculate technical indicators
-        indicators = calculate_all_indicators(stock_data)
+        # Calculate technical indicators for the latest bar only
+        latest_indicators = await compute_pool.run(calculate_latest_indicators, stock_data)
 
         # Get technical summary
-        tech_summary = get_technical_summary(indicators)
+        tech_summary = get_technical_summary(latest_indicators)
 
         return {
             "symbol": symbol,
             "technical_summary": tech_summary,
-            "indicators": indicators.to_dict(orient='records')[-1] # latest indicators
+            "indicators": latest_indicators
         }
+    except HTTPException:
+        raise
     except Exception as e:
         return {"error": str(e), "symbol": symbol}
 
+@app.get("/scan", summary="Scan a symbol universe with a filter query", tags=["Stocks"])
+async def scan_stocks(query: Optional[str] = None, symbols: Optional[str] = None, sort_by: str = "score",
+                ascending: bool = False, limit: int = 50):
+    """
+    Endpoint to filter and rank many symbols at once, e.g. query="RSI < 30 and close < BB_Lower"
+    """
+    from src.analysis.scanner import ScanQuery, ScanQueryError, resolve_universe, scan_frames
+    
+    try:
+        symbol_list = resolve_universe(symbols)
+        if query:
+            ScanQuery(query)
+    except ScanQueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    try:
+        from src.config import settings
+        from src.api.compute import compute_pool
+        from src.data.marketstack import async_marketstack_client
+        
+        frames = await async_marketstack_client.get_stock_data_batch(symbol_list, days=settings.analysis.scan_history_days)
+        return await compute_pool.run(scan_frames, frames, query, sort_by, ascending, limit)
+    except ScanQueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        return {"error": str(e), "query": query}
+
+@app.get("/screen", summary="Screen cached fundamentals across the universe", tags=["Company"])
+async def screen_fundamentals(query: Optional[str] = None, sector: Optional[str] = None, industry: Optional[str] = None,
+                        sort_by: str = "altman_z_score", ascending: bool = False, limit: int = 50):
+    """
+    Endpoint to filter and rank every symbol in the fundamentals cache, e.g. query="PE_ratio < 15 and piotroski_score >= 7"
+    """
+    from src.analysis.scanner import ScanQueryError
+    from src.analysis.fundamental_screener import fundamental_screener
+    
+    try:
+        return await asyncio.to_thread(fundamental_screener.screen, query=query, sector=sector, industry=industry,
+                                       sort_by=sort_by, ascending=ascending, limit=limit)
+    except ScanQueryError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        return {"error": str(e), "query": query}
+
 @app.get("/company/{symbol}", summary="Get company info and fundamental analysis", tags=["Company"])
-def get_company_analysis(symbol: str):
+async def get_company_analysis(symbol: str):
     """
     Endpoint to get company info and fundamental analysis for a given symbol
     """
     try:
         from src.analysis.fundamental import get_fundamental_summary
         
-        # Get company info and fundamental metrics
-        fundamental_summary = get_fundamental_summary(symbol)
+        # Get company info and fundamental metrics (yfinance has no async client)
+        fundamental_summary = await asyncio.to_thread(get_fundamental_summary, symbol)
         
         return fundamental_summary
     except Exception as e:
         return {"error": str(e), "symbol": symbol}
 
 @app.get("/predict/{symbol}", summary="Predict stock price", tags=["Prediction"])
-def predict_stock_price(symbol: str, days: int = 30):
+async def predict_stock_price(symbol: str, days: int = 30):
     """
     Endpoint to predict future stock prices for a given symbol
     """
     try:
-        from src.data.marketstack import marketstack_client
-        from src.analysis.technical_indicators import calculate_all_indicators
-        from src.prediction.ml_models import StockPredictor, create_ensemble_prediction, generate_recommendation
+        from src.api.compute import compute_pool
+        from src.data.marketstack import async_marketstack_client
+        from src.prediction.pipeline import predict_from_data
         
-        # Fetch stock data and calculate indicators
-        stock_data = marketstack_client.get_stock_data(symbol)
+        # Fetch in the event loop; indicators and training run in a worker process
+        stock_data = await async_marketstack_client.get_stock_data(symbol)
         if stock_data.empty:
             raise HTTPException(status_code=404, detail="Stock data not found")
-        
-        indicators = calculate_all_indicators(stock_data)
+        return await compute_pool.run(predict_from_data, symbol, stock_data, days)
+    except HTTPException:
+        raise
+    except LookupError:
+        raise HTTPException(status_code=404, detail="Stock data not found")
+    except Exception as e:
+        return {"error": str(e), "symbol": symbol}
 
-        # Prepare features and train models
-        predictor = StockPredictor()
-        X, y = predictor.prepare_features(indicators)
-        training_results = predictor.train_models(X, y)
-        
-        # Predict future prices
-        future_predictions = predictor.predict_future(indicators, days=days)
-        
-        # Create ensemble prediction
-        ensemble_result = create_ensemble_prediction(future_predictions)
+@app.post("/predict/{symbol}", status_code=202, summary="Queue a stock price prediction", tags=["Prediction"])
+async def queue_stock_prediction(symbol: str, days: int = 30):
+    """
+    Endpoint to enqueue a background prediction job; poll /jobs/{job_id} for the result
+    """
+    from src.api.jobs import prediction_jobs
+    
+    return await asyncio.to_thread(prediction_jobs.submit, symbol, days)
 
-        # Current price
-        current_price = indicators.iloc[-1]['close']
+@app.get("/jobs/{job_id}", summary="Get prediction job status", tags=["Prediction"])
+async def get_prediction_job(job_id: str):
+    """
+    Endpoint to get the status of a prediction job, including its result once completed
+    """
+    from src.api.jobs import prediction_jobs
+    
+    job = await asyncio.to_thread(prediction_jobs.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
 
-        # Generate recommendation
-        recommendation = generate_recommendation(current_price, 
-                                                 ensemble_result.get('ensemble_prediction', current_price), 
-                                                 ensemble_result.get('confidence', 0.5))
+@app.on_event("startup")
+async def start_background_services():
+    from src.config import settings
+    from src.api.compute import compute_pool
+    from src.data.fundamentals_store import fundamentals_store
+    
+    compute_pool.start()
+    # Opt-in: every API worker would otherwise refetch the whole universe on boot
+    if settings.data_store.fundamentals_refresh_on_startup:
+        fundamentals_store.start_refresh_job()
 
-        return {
-            "symbol": symbol,
-            "training_results": training_results,
-            "future_predictions": future_predictions,
-            "ensemble_prediction": ensemble_result,
-            "recommendation": recommendation,
-            "current_price": current_price
-        }
-    except Exception as e:
-        return {"error": str(e), "symbol": symbol}
+@app.on_event("shutdown")
+async def shutdown_background_services():
+    from src.api.jobs import prediction_jobs
+    from src.api.compute import compute_pool
+    from src.data.async_http import async_http_client
+    from src.data.fundamentals_store import fundamentals_store
+    
+    prediction_jobs.shutdown()
+    compute_pool.shutdown()
+    fundamentals_store.shutdown()
+    await async_http_client.aclose()
@@ -0,0 +1,76 @@
+"""
+Registry of optional model and compute backends, imported lazily on first use.
+
+Shared by the analysis and prediction packages.
+"""
+import importlib
+import importlib.util
+import threading
+from types import ModuleType
+from typing import Dict
+
+# Backend name -> top-level package probed for availability
+BACKENDS = {
+    'sklearn': 'sklearn',
+    'xgboost': 'xgboost',
+    'tensorflow': 'tensorflow',
+    'statsmodels': 'statsmodels',
+    'numba': 'numba'
+}
+
+INSTALL_HINTS = {
+    'sklearn': 'pip install scikit-learn',
+    'xgboost': 'pip install xgboost',
+    'tensorflow': 'pip install tensorflow',
+    'statsmodels': 'pip install statsmodels',
+    'numba': 'pip install numba'
+}
+
+_availability: Dict[str, bool] = {}
+_modules: Dict[str, ModuleType] = {}
+_lock = threading.Lock()
+
+def is_available(name: str) -> bool:
+    """
+    Check whether a backend is installed without importing it
+
+    Args:
+        name: Backend name from BACKENDS
+
+    Returns:
+        True if the backend's package can be found
+    """
+    if name not in _availability:
+        _availability[name] = importlib.util.find_spec(BACKENDS[name]) is not None
+    return _availability[name]
+
+def load(name: str, module: str = None) -> ModuleType:
+    """
+    Import a backend module on first use
+
+    Args:
+        name: Backend name from BACKENDS
+        module: Optional submodule to import (e.g. 'statsmodels.tsa.arima.model')
+
+    Returns:
+        The imported module
+
+    Raises:
+        ImportError: If the backend is not installed
+    """
+    module = module or BACKENDS[name]
+    if module in _modules:
+        return _modules[module]
+
+    if not is_available(name):
+        raise ImportError(f"{name} not available. Install with: {INSTALL_HINTS[name]}")
+
+    with _lock:
+        if module not in _modules:
+            _modules[module] = importlib.import_module(module)
+    return _modules[module]
+
+def loaded() -> Dict[str, bool]:
+    """Report which backends have actually been imported so far"""
+    return {name: any(module == package or module.startswith(package + '.') for module in _modules)
+            for name, package in BACKENDS.items()}
@@ -3,7 +3,7 @@ Configuration management for the stock prediction prototype.
 """
 import os
 import json
-from typing import Dict, Any
+from typing import Dict, Any, List
 from dotenv import load_dotenv
 from pydantic import BaseModel, Field
 from pathlib import Path
@@ -21,21 +21,63 @@ class APIConfig(BaseModel):
     host: str = Field(default_factory=lambda: os.getenv("API_HOST", "0.0.0.0"))
     port: int = Field(default_factory=lambda: int(os.getenv("API_PORT", "8000")))
     reload: bool = Field(default_factory=lambda: os.getenv("API_RELOAD", "true").lower() == "true")
+    compute_workers: int = Field(default_factory=lambda: int(os.getenv("API_COMPUTE_WORKERS", "0")))
+    max_inflight: int = Field(default_factory=lambda: int(os.getenv("API_MAX_INFLIGHT", "0")))
 
 class MarketStackConfig(BaseModel):
     api_key: str = Field(default_factory=lambda: os.getenv("MARKETSTACK_API_KEY", "102b76768338d536bf46fb894114cf29"))
     base_url: str = Field(default_factory=lambda: os.getenv("MARKETSTACK_BASE_URL", "http://api.marketstack.com/v1"))
+    max_symbols_per_request: int = Field(default_factory=lambda: int(os.getenv("MARKETSTACK_MAX_SYMBOLS", "100")))
+    page_limit: int = Field(default_factory=lambda: int(os.getenv("MARKETSTACK_PAGE_LIMIT", "1000")))
+
+class TwelveDataConfig(BaseModel):
+    api_key: str = Field(default_factory=lambda: os.getenv("TWELVE_DATA_API_KEY", ""))
+    base_url: str = Field(default_factory=lambda: os.getenv("TWELVE_DATA_BASE_URL", "https://api.twelvedata.com"))
+
+class HTTPConfig(BaseModel):
+    max_connections: int = Field(default_factory=lambda: int(os.getenv("HTTP_MAX_CONNECTIONS", "20")))
+    timeout: float = Field(default_factory=lambda: float(os.getenv("HTTP_TIMEOUT", "10")))
+    marketstack_concurrency: int = Field(default_factory=lambda: int(os.getenv("MARKETSTACK_CONCURRENCY", "5")))
+    twelve_data_concurrency: int = Field(default_factory=lambda: int(os.getenv("TWELVE_DATA_CONCURRENCY", "4")))
+
+class DataStoreConfig(BaseModel):
+    bar_store_enabled: bool = Field(default_factory=lambda: os.getenv("BAR_STORE_ENABLED", "true").lower() == "true")
+    bar_store_dir: str = Field(default_factory=lambda: os.getenv("BAR_STORE_DIR", "cache/bars"))
+    bar_refresh_interval: int = Field(default_factory=lambda: int(os.getenv("BAR_REFRESH_INTERVAL", "3600")))
+    fundamentals_dir: str = Field(default_factory=lambda: os.getenv("FUNDAMENTALS_DIR", "cache/fundamentals"))
+    fundamentals_ttl: int = Field(default_factory=lambda: int(os.getenv("FUNDAMENTALS_TTL", "86400")))
+    fundamentals_refresh_on_startup: bool = Field(default_factory=lambda: os.getenv("FUNDAMENTALS_REFRESH_ON_STARTUP", "false").lower() == "true")
+    fundamentals_refresh_interval: int = Field(default_factory=lambda: int(os.getenv("FUNDAMENTALS_REFRESH_INTERVAL", "86400")))
+    fundamentals_refresh_workers: int = Field(default_factory=lambda: int(os.getenv("FUNDAMENTALS_REFRESH_WORKERS", "8")))
 
 class ModelConfig(BaseModel):
     cache_duration: int = Field(default_factory=lambda: int(os.getenv("MODEL_CACHE_DURATION", "86400")))
     retrain_interval: int = Field(default_factory=lambda: int(os.getenv("RETRAIN_INTERVAL", "604800")))
     confidence_threshold: float = Field(default_factory=lambda: float(os.getenv("PREDICTION_CONFIDENCE_THRESHOLD", "0.6")))
+    cache_dir: str = Field(default_factory=lambda: os.getenv("MODEL_CACHE_DIR", "cache/models"))
+    max_cached_models: int = Field(default_factory=lambda: int(os.getenv("MODEL_CACHE_SIZE", "32")))
+    training_mode: str = Field(default_factory=lambda: os.getenv("MODEL_TRAINING_MODE", "thread"))
+    training_workers: int = Field(default_factory=lambda: int(os.getenv("MODEL_TRAINING_WORKERS", "0")))
+    backtest_workers: int = Field(default_factory=lambda: int(os.getenv("BACKTEST_WORKERS", "0")))
+    incremental_window: int = Field(default_factory=lambda: int(os.getenv("MODEL_INCREMENTAL_WINDOW", "504")))
+    incremental_estimators: int = Field(default_factory=lambda: int(os.getenv("MODEL_INCREMENTAL_ESTIMATORS", "10")))
+    arima_criterion: str = Field(default_factory=lambda: os.getenv("ARIMA_CRITERION", "aic"))
+    forecast_horizons: List[int] = Field(default_factory=lambda: [int(h) for h in os.getenv("FORECAST_HORIZONS", "1,5,10,30").split(",")])
+
+class JobConfig(BaseModel):
+    db_path: str = Field(default_factory=lambda: os.getenv("JOB_DB_PATH", "cache/jobs.sqlite3"))
+    workers: int = Field(default_factory=lambda: int(os.getenv("JOB_WORKERS", "2")))
+    heartbeat_interval: int = Field(default_factory=lambda: int(os.getenv("JOB_HEARTBEAT_INTERVAL", "30")))
 
 class AnalysisConfig(BaseModel):
     technical_indicators_enabled: bool = Field(default_factory=lambda: os.getenv("TECHNICAL_INDICATORS_ENABLED", "true").lower() == "true")
     fundamental_analysis_enabled: bool = Field(default_factory=lambda: os.getenv("FUNDAMENTAL_ANALYSIS_ENABLED", "true").lower() == "true")
     sentiment_analysis_enabled: bool = Field(default_factory=lambda: os.getenv("SENTIMENT_ANALYSIS_ENABLED", "true").lower() == "true")
     news_lookback_days: int = Field(default_factory=lambda: int(os.getenv("NEWS_LOOKBACK_DAYS", "30")))
+    scan_universe: str = Field(default_factory=lambda: os.getenv("SCAN_UNIVERSE", "AAPL,MSFT,GOOGL,AMZN,META,NVDA,TSLA,JPM,V,JNJ"))
+    scan_max_symbols: int = Field(default_factory=lambda: int(os.getenv("SCAN_MAX_SYMBOLS", "3000")))
+    indicator_jit: bool = Field(default_factory=lambda: os.getenv("INDICATOR_JIT", "true").lower() == "true")
+    scan_history_days: int = Field(default_factory=lambda: int(os.getenv("SCAN_HISTORY_DAYS", "180")))
 
 class ReportConfig(BaseModel):
     cache_duration: int = Field(default_factory=lambda: int(os.getenv("REPORT_CACHE_DURATION", "3600")))
@@ -61,7 +103,11 @@ class Settings(BaseModel):
     redis: RedisConfig = Field(default_factory=RedisConfig)
     api: APIConfig = Field(default_factory=APIConfig)
     marketstack: MarketStackConfig = Field(default_factory=MarketStackConfig)
+    twelve_data: TwelveDataConfig = Field(default_factory=TwelveDataConfig)
+    http: HTTPConfig = Field(default_factory=HTTPConfig)
+    data_store: DataStoreConfig = Field(default_factory=DataStoreConfig)
     model: ModelConfig = Field(default_factory=ModelConfig)
+    jobs: JobConfig = Field(default_factory=JobConfig)
     analysis: AnalysisConfig = Field(default_factory=AnalysisConfig)
     report: ReportConfig = Field(default_factory=ReportConfig)
     risk_management: RiskManagementConfig = Field(default_factory=RiskManagementConfig)
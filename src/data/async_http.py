@@ -0,0 +1,77 @@
+"""
+Shared asyncio HTTP client with connection pooling and per-provider limits.
+"""
+import asyncio
+import httpx
+from typing import Dict, Any, Optional
+from src.config import get_settings
+
+settings = get_settings()
+
+class AsyncHTTPClient:
+    """
+    Pooled httpx.AsyncClient shared by every data provider.
+
+    Connections (and their TLS sessions) are reused across requests, the
+    pool is bounded by settings.http.max_connections, and each provider
+    gets its own semaphore so one slow upstream cannot starve the others.
+    """
+
+    def __init__(self, max_connections: Optional[int] = None, timeout: Optional[float] = None,
+                 provider_limits: Optional[Dict[str, int]] = None):
+        self.max_connections = max_connections or settings.http.max_connections
+        self.timeout = timeout or settings.http.timeout
+        self.provider_limits = provider_limits or {
+            'marketstack': settings.http.marketstack_concurrency,
+            'twelve_data': settings.http.twelve_data_concurrency
+        }
+        self._client = None
+        self._semaphores = {}
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections),
+                timeout=httpx.Timeout(self.timeout)
+            )
+        return self._client
+
+    def _semaphore(self, provider: str) -> asyncio.Semaphore:
+        if provider not in self._semaphores:
+            self._semaphores[provider] = asyncio.Semaphore(self.provider_limits.get(provider, self.max_connections))
+        return self._semaphores[provider]
+
+    async def get_json(self, provider: str, url: str, params: Dict[str, Any],
+                       timeout: Optional[float] = None) -> Dict[str, Any]:
+        """
+        GET a JSON document within the provider's concurrency limit
+
+        Args:
+            provider: Provider name used for the concurrency limit
+            url: Request URL
+            params: Query parameters
+            timeout: Optional per-request timeout override in seconds
+
+        Returns:
+            Decoded JSON response
+
+        Raises:
+            httpx.HTTPError: On connection errors, timeouts or error statuses
+        """
+        async with self._semaphore(provider):
+            response = await self.client.get(url, params=params,
+                                             timeout=timeout if timeout is not None else httpx.USE_CLIENT_DEFAULT)
+        response.raise_for_status()
+        return response.json()
+
+    async def aclose(self) -> None:
+        """Close pooled connections (e.g. on application shutdown)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        self._semaphores = {}
+
+# Global async HTTP client instance
+async_http_client = AsyncHTTPClient()
@@ -0,0 +1,165 @@
+"""
+Local per-symbol OHLCV store backed by memory-mapped NumPy arrays.
+"""
+import os
+import re
+import json
+import threading
+import numpy as np
+import pandas as pd
+from contextlib import contextmanager
+from typing import Dict, Any, Iterator, Optional
+from src.config import get_settings
+
+try:
+    import fcntl
+except ImportError:
+    # No advisory file locks (Windows); merges are only serialized within a process
+    fcntl = None
+
+settings = get_settings()
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+# One record per bar, so dates and prices are replaced together by a single rename
+BAR_DTYPE = np.dtype([('date', '<i8'), ('ohlcv', '<f8', (len(OHLCV_COLUMNS),))])
+
+class BarStore:
+    """
+    On-disk daily bar store, one directory per symbol.
+
+    Each symbol directory holds ``bars.npy`` (BAR_DTYPE records sorted by
+    date, int64 nanoseconds) and ``meta.json`` recording the stored date
+    range and when the upstream API was last checked. Both are replaced
+    atomically, so readers need no lock; reads memory-map the bars and
+    return read-only DataFrame views. Writers hold a per-symbol file lock,
+    so merges from several processes don't lose each other's bars.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root or settings.data_store.bar_store_dir
+        self._lock = threading.Lock()
+
+    def _symbol_dir(self, symbol: str) -> str:
+        safe_symbol = re.sub(r'[^A-Za-z0-9._-]', '_', symbol.upper())
+        return os.path.join(self.root, safe_symbol)
+
+    @contextmanager
+    def _locked(self, symbol: str) -> Iterator[str]:
+        """Hold the symbol's write lock across threads and processes, yielding its directory"""
+        symbol_dir = self._symbol_dir(symbol)
+        os.makedirs(symbol_dir, exist_ok=True)
+        with self._lock, open(os.path.join(symbol_dir, '.lock'), 'a') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield symbol_dir
+
+    def get_meta(self, symbol: str) -> Dict[str, Any]:
+        """
+        Get stored range metadata for a symbol
+
+        Returns:
+            Dictionary with 'first_date', 'last_date', 'covered_from',
+            'last_checked' and 'rows' (empty dict if nothing is stored)
+        """
+        symbol_dir = self._symbol_dir(symbol)
+        if not os.path.exists(os.path.join(symbol_dir, 'bars.npy')):
+            return {}
+        try:
+            with open(os.path.join(symbol_dir, 'meta.json'), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def update_meta(self, symbol: str, **fields: Any) -> Dict[str, Any]:
+        """Merge fields into a symbol's metadata"""
+        with self._locked(symbol) as symbol_dir:
+            return self._write_meta(symbol, symbol_dir, fields)
+
+    def _write_meta(self, symbol: str, symbol_dir: str, fields: Dict[str, Any]) -> Dict[str, Any]:
+        """update_meta for a caller already holding the symbol's lock"""
+        meta = self.get_meta(symbol)
+        meta.update(fields)
+        self._atomic_write(os.path.join(symbol_dir, 'meta.json'),
+                           lambda f: f.write(json.dumps(meta).encode()))
+        return meta
+
+    @staticmethod
+    def _atomic_write(path: str, writer) -> None:
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            writer(f)
+        os.replace(tmp_path, path)
+
+    def read(self, symbol: str, date_from: Optional[Any] = None, date_to: Optional[Any] = None) -> pd.DataFrame:
+        """
+        Read stored bars for a symbol as a zero-copy, read-only view
+
+        Args:
+            symbol: Stock symbol
+            date_from: Optional inclusive start date
+            date_to: Optional inclusive end date
+
+        Returns:
+            DataFrame with OHLCV columns and a date index (empty if nothing stored)
+        """
+        try:
+            bars = np.load(os.path.join(self._symbol_dir(symbol), 'bars.npy'), mmap_mode='r')
+        except (OSError, ValueError):
+            return pd.DataFrame(columns=OHLCV_COLUMNS)
+        dates, values = bars['date'], bars['ohlcv']
+
+        start, end = 0, len(dates)
+        if date_from is not None:
+            start = int(np.searchsorted(dates, pd.Timestamp(date_from).value, side='left'))
+        if date_to is not None:
+            end = int(np.searchsorted(dates, pd.Timestamp(date_to).value, side='right'))
+
+        index = pd.DatetimeIndex(dates[start:end].view('datetime64[ns]'), name='date')
+        return pd.DataFrame(values[start:end], index=index, columns=OHLCV_COLUMNS, copy=False)
+
+    def merge(self, symbol: str, df: pd.DataFrame) -> Dict[str, Any]:
+        """
+        Merge newly fetched bars into the store (new rows win on duplicate dates)
+
+        Args:
+            symbol: Stock symbol
+            df: DataFrame with OHLCV columns and a date index
+
+        Returns:
+            Updated metadata
+        """
+        if df.empty:
+            return self.get_meta(symbol)
+
+        new_dates = pd.DatetimeIndex(df.index)
+        if new_dates.tz is not None:
+            new_dates = new_dates.tz_convert('UTC').tz_localize(None)
+        new_dates = new_dates.normalize().as_unit('ns').asi8
+        new_values = df[OHLCV_COLUMNS].to_numpy(dtype=np.float64)
+
+        with self._locked(symbol) as symbol_dir:
+            existing = self.read(symbol)
+            if not existing.empty:
+                old_dates = existing.index.as_unit('ns').asi8
+                keep = ~np.isin(old_dates, new_dates)
+                new_dates = np.concatenate([old_dates[keep], new_dates])
+                new_values = np.concatenate([existing.to_numpy()[keep], new_values])
+                del existing
+
+            # Sort and drop duplicates within the fetched batch (last wins)
+            order = np.argsort(new_dates, kind='stable')
+            dates, values = new_dates[order], new_values[order]
+            last_of_run = np.append(dates[1:] != dates[:-1], True)
+            bars = np.empty(int(last_of_run.sum()), dtype=BAR_DTYPE)
+            bars['date'], bars['ohlcv'] = dates[last_of_run], values[last_of_run]
+            self._atomic_write(os.path.join(symbol_dir, 'bars.npy'), lambda f: np.save(f, bars))
+
+            return self._write_meta(symbol, symbol_dir, {
+                'first_date': pd.Timestamp(bars['date'][0]).strftime('%Y-%m-%d'),
+                'last_date': pd.Timestamp(bars['date'][-1]).strftime('%Y-%m-%d'),
+                'rows': int(len(bars))
+            })
+
+# Global bar store instance
+bar_store = BarStore()
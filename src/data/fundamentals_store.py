@@ -0,0 +1,271 @@
+"""
+Local TTL cache of per-symbol fundamentals (yfinance info and statements).
+"""
+import os
+import re
+import time
+import pickle
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Callable, List, Optional
+from src.config import get_settings
+
+settings = get_settings()
+
+# Snapshots kept in memory; the rest are read back from disk
+FUNDAMENTALS_MEMORY_ENTRIES = 512
+
+STATEMENT_FIELDS = ('financials', 'balance_sheet', 'cash_flow')
+
+class FundamentalsStore:
+    """
+    On-disk fundamentals cache, one pickled snapshot per symbol.
+
+    A snapshot holds the raw ``info`` dict and the financials, balance sheet
+    and cash flow DataFrames with the time they were fetched. Snapshots are
+    fresh for ``ttl`` seconds; a stale one is still served while a
+    background fetch replaces it, so only never-seen symbols wait on the
+    network. ``refresh_universe`` fills the cache concurrently.
+    """
+
+    def __init__(self, root: Optional[str] = None, ttl: Optional[int] = None,
+                 workers: Optional[int] = None, max_memory_entries: int = FUNDAMENTALS_MEMORY_ENTRIES):
+        self.root = root or settings.data_store.fundamentals_dir
+        self.ttl = ttl if ttl is not None else settings.data_store.fundamentals_ttl
+        self.workers = workers or settings.data_store.fundamentals_refresh_workers
+        self.max_memory_entries = max_memory_entries
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._pending = set()
+        self._executor = None
+        self._refresh_thread = None
+        self._stop_refresh = threading.Event()
+
+    def _path(self, symbol: str) -> str:
+        safe_symbol = re.sub(r'[^A-Za-z0-9._-]', '_', symbol.upper())
+        return os.path.join(self.root, f"{safe_symbol}.pkl")
+
+    def _remember(self, snapshot: Dict[str, Any]) -> None:
+        with self._lock:
+            self._memory[snapshot['symbol']] = snapshot
+            self._memory.move_to_end(snapshot['symbol'])
+            while len(self._memory) > self.max_memory_entries:
+                self._memory.popitem(last=False)
+
+    def _read(self, symbol: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(symbol), 'rb') as f:
+                snapshot = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Warning: Could not read fundamentals for {symbol}: {e}")
+            return None
+        self._remember(snapshot)
+        return snapshot
+
+    def _write(self, snapshot: Dict[str, Any]) -> None:
+        path = self._path(snapshot['symbol'])
+        try:
+            os.makedirs(self.root, exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(snapshot, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Warning: Could not persist fundamentals for {snapshot['symbol']}: {e}")
+
+    def cached_symbols(self) -> Dict[str, int]:
+        """
+        Symbols with a stored snapshot and the snapshot files' mtimes
+
+        Returns:
+            Dictionary mapping each (file-safe) symbol to its mtime in nanoseconds
+        """
+        try:
+            entries = os.scandir(self.root)
+        except FileNotFoundError:
+            return {}
+        with entries:
+            return {entry.name[:-4]: entry.stat().st_mtime_ns for entry in entries
+                    if entry.name.endswith('.pkl') and entry.is_file()}
+
+    def peek(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """
+        Stored snapshot for a symbol as currently on disk, without fetching it
+
+        Reads the file rather than the in-memory copy, which may predate a
+        refresh made by another process.
+        """
+        return self._read(symbol.upper())
+
+    def is_fresh(self, snapshot: Dict[str, Any]) -> bool:
+        """Whether a snapshot was fetched within the TTL"""
+        return time.time() - snapshot['fetched_at'] < self.ttl
+
+    @staticmethod
+    def fetch(symbol: str) -> Dict[str, Any]:
+        """
+        Fetch a symbol's info and statements from yfinance
+
+        Args:
+            symbol: Stock symbol
+
+        Returns:
+            Snapshot dictionary with 'symbol', 'fetched_at', 'info', one
+            DataFrame per STATEMENT_FIELDS entry and the extracted 'statements'
+            (StatementSnapshot)
+        """
+        from src.analysis.fundamental import FundamentalAnalysis
+        from src.analysis.statements import StatementSnapshot
+
+        analyzer = FundamentalAnalysis(symbol)
+        snapshot = {'symbol': symbol.upper(), 'fetched_at': time.time(), 'info': analyzer.info}
+        for field in STATEMENT_FIELDS:
+            snapshot[field] = getattr(analyzer, field)
+        snapshot['statements'] = StatementSnapshot.from_raw(snapshot)
+        return snapshot
+
+    def refresh(self, symbol: str) -> Dict[str, Any]:
+        """
+        Fetch a symbol now and store the snapshot
+
+        A fetch that returned nothing at all (unknown symbol or upstream
+        failure) is returned but not stored, so it does not replace older data.
+
+        Args:
+            symbol: Stock symbol
+
+        Returns:
+            Snapshot dictionary
+        """
+        snapshot = self.fetch(symbol)
+        if snapshot['info'] or any(not snapshot[field].empty for field in STATEMENT_FIELDS):
+            self._write(snapshot)
+            self._remember(snapshot)
+        return snapshot
+
+    def _refresh_in_background(self, symbol: str) -> None:
+        """Queue a refresh unless one is already pending for the symbol"""
+        with self._lock:
+            if symbol in self._pending:
+                return
+            self._pending.add(symbol)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='fundamentals')
+
+        def _run():
+            try:
+                self.refresh(symbol)
+            except Exception as e:
+                print(f"Warning: Could not refresh fundamentals for {symbol}: {e}")
+            finally:
+                with self._lock:
+                    self._pending.discard(symbol)
+
+        self._executor.submit(_run)
+
+    def get(self, symbol: str) -> Dict[str, Any]:
+        """
+        Get a symbol's snapshot, fetching it only if none is stored
+
+        Args:
+            symbol: Stock symbol
+
+        Returns:
+            Snapshot dictionary (possibly stale while a refresh is in flight)
+        """
+        symbol = symbol.upper()
+        with self._lock:
+            snapshot = self._memory.get(symbol)
+            if snapshot is not None:
+                self._memory.move_to_end(symbol)
+
+        # Another process may have refreshed the file since it was loaded
+        if snapshot is None or not self.is_fresh(snapshot):
+            snapshot = self._read(symbol) or snapshot
+        if snapshot is None:
+            return self.refresh(symbol)
+        if not self.is_fresh(snapshot):
+            self._refresh_in_background(symbol)
+        return snapshot
+
+    def refresh_universe(self, symbols: List[str], force: bool = False,
+                         max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Fetch every symbol without a fresh snapshot, concurrently
+
+        Args:
+            symbols: Stock symbols
+            force: Refetch fresh snapshots as well
+            max_workers: Concurrent fetches (defaults to settings.data_store.fundamentals_refresh_workers)
+
+        Returns:
+            Dictionary with 'refreshed', 'skipped' and 'failed' counts and 'elapsed' seconds
+        """
+        start = time.perf_counter()
+        symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+        if not force:
+            stale = []
+            for symbol in symbols:
+                snapshot = self._memory.get(symbol) or self._read(symbol)
+                if snapshot is None or not self.is_fresh(snapshot):
+                    stale.append(symbol)
+        else:
+            stale = symbols
+
+        failed = []
+        if stale:
+            with ThreadPoolExecutor(max_workers=min(max_workers or self.workers, len(stale))) as executor:
+                for symbol, snapshot in zip(stale, executor.map(self.refresh, stale)):
+                    if not snapshot['info']:
+                        failed.append(symbol)
+
+        return {
+            'refreshed': len(stale) - len(failed),
+            'skipped': len(symbols) - len(stale),
+            'failed': failed,
+            'elapsed': time.perf_counter() - start
+        }
+
+    def start_refresh_job(self, symbols: Optional[Callable[[], List[str]]] = None,
+                          interval: Optional[int] = None) -> None:
+        """
+        Refresh the universe in a daemon thread now and every ``interval`` seconds
+
+        Args:
+            symbols: Callable returning the symbols (defaults to the scan universe)
+            interval: Seconds between refreshes (defaults to
+                settings.data_store.fundamentals_refresh_interval; 0 disables the job)
+        """
+        interval = interval if interval is not None else settings.data_store.fundamentals_refresh_interval
+        if interval <= 0 or (self._refresh_thread is not None and self._refresh_thread.is_alive()):
+            return
+        if symbols is None:
+            from src.analysis.scanner import resolve_universe
+            symbols = resolve_universe
+
+        def _loop():
+            while not self._stop_refresh.is_set():
+                try:
+                    summary = self.refresh_universe(symbols())
+                    if summary['failed']:
+                        print(f"Warning: Fundamentals refresh failed for {', '.join(summary['failed'])}")
+                except Exception as e:
+                    print(f"Warning: Fundamentals refresh failed: {e}")
+                self._stop_refresh.wait(interval)
+
+        self._stop_refresh.clear()
+        self._refresh_thread = threading.Thread(target=_loop, name='fundamentals-refresh', daemon=True)
+        self._refresh_thread.start()
+
+    def shutdown(self) -> None:
+        """Stop the refresh job and background fetches"""
+        self._stop_refresh.set()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+# Global fundamentals store instance
+fundamentals_store = FundamentalsStore()
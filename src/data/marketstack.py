@@ -1,15 +1,153 @@
 """
 MarketStack API client for fetching stock data.
 """
+import asyncio
+import httpx
 import requests
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from src.config import get_settings
+from src.data.bar_store import bar_store
+from src.data.async_http import async_http_client
 import time
 
 settings = get_settings()
 
+EOD_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+def _bars_frame(rows: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Convert MarketStack data rows into a date-indexed OHLCV DataFrame"""
+    if not rows:
+        return pd.DataFrame()
+    df = pd.DataFrame(rows)
+    df['date'] = pd.to_datetime(df['date'])
+    df = df.sort_values('date')
+    df.set_index('date', inplace=True)
+    return df[EOD_COLUMNS]
+
+def _page_params(params: Dict[str, Any], offset: int) -> Dict[str, Any]:
+    """Query parameters for the page of a paginated endpoint starting at offset"""
+    return {**params, 'limit': settings.marketstack.page_limit, 'offset': offset}
+
+def _next_offset(page: Dict[str, Any], offset: int) -> Optional[int]:
+    """Offset of the page after ``page`` (fetched at offset), or None if it was the last"""
+    pagination = page.get('pagination') or {}
+    count = pagination.get('count', len(page['data']))
+    total = pagination.get('total')
+    offset += count
+    return None if count == 0 or total is None or offset >= total else offset
+
+def _eod_params(symbol: str, date_from: str, date_to: Optional[str] = None) -> Dict[str, Any]:
+    """eod query parameters for one symbol and date range"""
+    params = {
+        'symbols': symbol,
+        'date_from': date_from
+    }
+    if date_to:
+        params['date_to'] = date_to
+    return params
+
+def _eod_frame(rows: Optional[List[Dict[str, Any]]]) -> Optional[pd.DataFrame]:
+    """OHLCV DataFrame for the rows of an eod request, or None if it failed"""
+    return None if rows is None else _bars_frame(rows)
+
+def _batch_requests(symbols: List[str], days: int) -> Tuple[List[str], str, List[Dict[str, Any]]]:
+    """
+    Plan the eod requests for a multi-symbol fetch
+    
+    Returns:
+        Tuple of (unique upper-case symbols, date_from, eod query parameters
+        per chunk of settings.marketstack.max_symbols_per_request symbols)
+    """
+    date_from = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+    unique_symbols = list(dict.fromkeys(symbol.upper() for symbol in symbols))
+    chunk_size = settings.marketstack.max_symbols_per_request
+    chunks = [{'symbols': ','.join(unique_symbols[start:start + chunk_size]), 'date_from': date_from}
+              for start in range(0, len(unique_symbols), chunk_size)]
+    return unique_symbols, date_from, chunks
+
+def _covered_from(meta: Dict[str, Any], date_from: str, frame: pd.DataFrame) -> str:
+    """
+    Start of the gap-free range the store covers once a frame fetched from
+    date_from up to today is merged
+
+    Args:
+        meta: Bar store metadata from before the merge
+        date_from: Start date (YYYY-MM-DD) the frame was requested from
+        frame: Non-empty fetched bars
+
+    Returns:
+        New covered_from date (YYYY-MM-DD)
+    """
+    if 'last_date' not in meta:
+        return date_from
+    covered_from = meta.get('covered_from', meta['first_date'])
+    
+    # Bars missing between the stored range and the fetched one: only the fetched range is gap-free
+    next_date = (datetime.strptime(meta['last_date'], '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d')
+    if date_from > next_date:
+        return date_from
+    
+    # Extend the covered range back only if the fetched bars reach the stored ones
+    if frame.index[-1].strftime('%Y-%m-%d') >= meta['first_date']:
+        return min(date_from, covered_from)
+    return covered_from
+
+def _batch_frames(records: List[Dict[str, Any]], symbols: List[str], date_from: str,
+                  use_store: Optional[bool]) -> Dict[str, pd.DataFrame]:
+    """Split a multi-symbol eod payload per symbol, merging it into the bar store"""
+    frames = {}
+    if records:
+        columns = ['symbol', 'date', 'open', 'high', 'low', 'close', 'volume']
+        df = pd.DataFrame.from_records(records, columns=columns)
+        df['date'] = pd.to_datetime(df['date'])
+        df = df.sort_values(['symbol', 'date']).set_index('date')
+        frames = {symbol: group[columns[2:]] for symbol, group in df.groupby('symbol', sort=False)}
+    
+    if use_store is None:
+        use_store = settings.data_store.bar_store_enabled
+    if use_store:
+        now = time.time()
+        for symbol, frame in frames.items():
+            covered_from = _covered_from(bar_store.get_meta(symbol), date_from, frame)
+            bar_store.merge(symbol, frame)
+            bar_store.update_meta(symbol, last_checked=now, covered_from=covered_from)
+    
+    return {symbol: frames.get(symbol, pd.DataFrame()) for symbol in symbols}
+
+def plan_bar_store_fetches(symbol: str, date_from: str) -> List[Tuple[str, Optional[str], Dict[str, Any]]]:
+    """
+    Work out which date ranges are missing from the local bar store
+    
+    Args:
+        symbol: Stock symbol
+        date_from: Earliest date (YYYY-MM-DD) the caller needs
+        
+    Returns:
+        List of (date_from, date_to, metadata updates) to fetch and merge
+    """
+    meta = bar_store.get_meta(symbol)
+    now = time.time()
+    
+    if 'last_date' not in meta:
+        return [(date_from, None, {'covered_from': date_from, 'last_checked': now})]
+    
+    plan = []
+    
+    # Backfill history older than anything requested before
+    covered_from = meta.get('covered_from', meta['first_date'])
+    if date_from < covered_from:
+        date_to = (datetime.strptime(covered_from, '%Y-%m-%d') - timedelta(days=1)).strftime('%Y-%m-%d')
+        plan.append((date_from, date_to, {'covered_from': date_from}))
+    
+    # Append bars published since the last stored date
+    if now - meta.get('last_checked', 0) >= settings.data_store.bar_refresh_interval:
+        next_date = (datetime.strptime(meta['last_date'], '%Y-%m-%d') + timedelta(days=1)).strftime('%Y-%m-%d')
+        plan.append((next_date, None, {'last_checked': now}))
+    
+    return plan
+
 class MarketStackClient:
     """Client for interacting with MarketStack API"""
     
@@ -30,35 +168,108 @@ class MarketStackClient:
             print(f"Error fetching data from MarketStack: {e}")
             return {}
     
-    def get_stock_data(self, symbol: str, days: int = 365) -> pd.DataFrame:
+    def _request_all_pages(self, endpoint: str, params: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Request every page of a paginated endpoint by following pagination.offset
+        
+        Args:
+            endpoint: API endpoint
+            params: Query parameters (limit/offset are managed here)
+            
+        Returns:
+            Combined list of data rows, or None if any request failed
+        """
+        rows = []
+        offset = 0
+        
+        while offset is not None:
+            page = self._make_request(endpoint, _page_params(params, offset))
+            if 'data' not in page:
+                return None
+            rows.extend(page['data'])
+            offset = _next_offset(page, offset)
+        
+        return rows
+    
+    def _fetch_eod(self, symbol: str, date_from: str, date_to: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """
+        Fetch end-of-day bars for a date range from the eod endpoint
+        
+        Args:
+            symbol: Stock symbol
+            date_from: Inclusive start date (YYYY-MM-DD)
+            date_to: Optional inclusive end date (YYYY-MM-DD)
+            
+        Returns:
+            DataFrame with OHLCV data, or None if the request failed
+        """
+        return _eod_frame(self._request_all_pages('eod', _eod_params(symbol, date_from, date_to)))
+    
+    def _sync_bar_store(self, symbol: str, date_from: str) -> None:
+        """
+        Bring the local bar store up to date, fetching only missing ranges
+        
+        Args:
+            symbol: Stock symbol
+            date_from: Earliest date (YYYY-MM-DD) the caller needs
+        """
+        for range_from, range_to, meta_updates in plan_bar_store_fetches(symbol, date_from):
+            df = self._fetch_eod(symbol, range_from, range_to)
+            if df is not None:
+                bar_store.merge(symbol, df)
+                bar_store.update_meta(symbol, **meta_updates)
+    
+    def get_stock_data(self, symbol: str, days: int = 365, use_store: Optional[bool] = None) -> pd.DataFrame:
         """
         Get historical stock data (OHLCV) for a symbol
         
         Args:
             symbol: Stock symbol (e.g., 'AAPL')
             days: Number of days of historical data
+            use_store: Serve from the local bar store, fetching only missing
+                dates (defaults to settings.data_store.bar_store_enabled)
             
         Returns:
-            DataFrame with OHLCV data
+            DataFrame with OHLCV data (a read-only view when served from the store)
         """
         date_from = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
         
-        params = {
-            'symbols': symbol,
-            'date_from': date_from,
-            'limit': 1000
-        }
+        if use_store is None:
+            use_store = settings.data_store.bar_store_enabled
+        if not use_store:
+            df = self._fetch_eod(symbol, date_from)
+            return df if df is not None else pd.DataFrame()
         
-        data = self._make_request('eod', params)
+        self._sync_bar_store(symbol, date_from)
+        return bar_store.read(symbol, date_from)
+    
+    def get_stock_data_batch(self, symbols: List[str], days: int = 365, use_store: Optional[bool] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Get historical stock data for many symbols with as few requests as possible
         
-        if 'data' in data and data['data']:
-            df = pd.DataFrame(data['data'])
-            df['date'] = pd.to_datetime(df['date'])
-            df = df.sort_values('date')
-            df.set_index('date', inplace=True)
-            return df[['open', 'high', 'low', 'close', 'volume']]
+        Symbols are packed into comma-separated eod requests of up to
+        settings.marketstack.max_symbols_per_request, every page is followed,
+        and the combined payload is split per symbol in a single groupby.
         
-        return pd.DataFrame()
+        Args:
+            symbols: Stock symbols
+            days: Number of days of historical data
+            use_store: Also merge the fetched bars into the local bar store
+                (defaults to settings.data_store.bar_store_enabled)
+            
+        Returns:
+            Dictionary mapping each symbol to its OHLCV DataFrame
+            (empty DataFrame for symbols with no data)
+        """
+        unique_symbols, date_from, chunks = _batch_requests(symbols, days)
+        
+        records = []
+        for params in chunks:
+            rows = self._request_all_pages('eod', params)
+            if rows:
+                records.extend(rows)
+        
+        return _batch_frames(records, unique_symbols, date_from, use_store)
     
     def get_intraday_data(self, symbol: str, interval: str = '1min') -> pd.DataFrame:
         """
@@ -79,14 +290,7 @@ class MarketStackClient:
         
         data = self._make_request('intraday', params)
         
-        if 'data' in data and data['data']:
-            df = pd.DataFrame(data['data'])
-            df['date'] = pd.to_datetime(df['date'])
-            df = df.sort_values('date')
-            df.set_index('date', inplace=True)
-            return df[['open', 'high', 'low', 'close', 'volume']]
-        
-        return pd.DataFrame()
+        return _bars_frame(data.get('data'))
     
     def get_company_info(self, symbol: str) -> Dict[str, Any]:
         """
@@ -154,5 +358,93 @@ class MarketStackClient:
         
         return pd.DataFrame()
 
-# Global client instance
+class AsyncMarketStackClient:
+    """Non-blocking MarketStack client on the shared async connection pool"""
+    
+    def __init__(self):
+        self.api_key = settings.marketstack.api_key
+        self.base_url = settings.marketstack.base_url
+    
+    async def _make_request(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Make a request to MarketStack API with error handling"""
+        params = {**params, 'access_key': self.api_key}
+        
+        try:
+            return await async_http_client.get_json('marketstack', f"{self.base_url}/{endpoint}", params)
+        except httpx.HTTPError as e:
+            print(f"Error fetching data from MarketStack: {e}")
+            return {}
+    
+    async def _request_all_pages(self, endpoint: str, params: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+        """Request every page of a paginated endpoint (see MarketStackClient)"""
+        rows = []
+        offset = 0
+        
+        while offset is not None:
+            page = await self._make_request(endpoint, _page_params(params, offset))
+            if 'data' not in page:
+                return None
+            rows.extend(page['data'])
+            offset = _next_offset(page, offset)
+        
+        return rows
+    
+    async def _fetch_eod(self, symbol: str, date_from: str, date_to: Optional[str] = None) -> Optional[pd.DataFrame]:
+        """Fetch end-of-day bars for a date range (None if the request failed)"""
+        return _eod_frame(await self._request_all_pages('eod', _eod_params(symbol, date_from, date_to)))
+    
+    async def get_stock_data(self, symbol: str, days: int = 365, use_store: Optional[bool] = None) -> pd.DataFrame:
+        """
+        Coroutine version of MarketStackClient.get_stock_data
+        
+        Missing ranges are fetched concurrently before reading the local store.
+        """
+        date_from = (datetime.now() - timedelta(days=days)).strftime('%Y-%m-%d')
+        
+        if use_store is None:
+            use_store = settings.data_store.bar_store_enabled
+        if not use_store:
+            df = await self._fetch_eod(symbol, date_from)
+            return df if df is not None else pd.DataFrame()
+        
+        plan = plan_bar_store_fetches(symbol, date_from)
+        frames = await asyncio.gather(*(self._fetch_eod(symbol, range_from, range_to)
+                                        for range_from, range_to, _ in plan))
+        for df, (_, _, meta_updates) in zip(frames, plan):
+            if df is not None:
+                bar_store.merge(symbol, df)
+                bar_store.update_meta(symbol, **meta_updates)
+        
+        return bar_store.read(symbol, date_from)
+    
+    async def get_stock_data_batch(self, symbols: List[str], days: int = 365,
+                                   use_store: Optional[bool] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Coroutine version of MarketStackClient.get_stock_data_batch
+        
+        The per-chunk requests run concurrently.
+        """
+        unique_symbols, date_from, chunks = _batch_requests(symbols, days)
+        
+        pages = await asyncio.gather(*(self._request_all_pages('eod', params) for params in chunks))
+        records = [row for rows in pages if rows for row in rows]
+        
+        return _batch_frames(records, unique_symbols, date_from, use_store)
+    
+    async def get_intraday_data(self, symbol: str, interval: str = '1min') -> pd.DataFrame:
+        """
+        Coroutine version of MarketStackClient.get_intraday_data
+        """
+        params = {
+            'symbols': symbol,
+            'interval': interval,
+            'limit': 1000
+        }
+        
+        data = await self._make_request('intraday', params)
+        
+        return _bars_frame(data.get('data'))
+
+# Global client instances
 marketstack_client = MarketStackClient()
+async_marketstack_client = AsyncMarketStackClient()
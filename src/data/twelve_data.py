@@ -1,74 +1,111 @@
 """
 Module for fetching and processing data from the Twelve Data API.
 """
+import asyncio
 import requests
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 from src.config import get_settings
+from src.data.async_http import async_http_client
 
 # Get configuration
 settings = get_settings()
 
+# Shared session so repeated calls reuse pooled connections
+session = requests.Session()
+
+def _params(symbol: Optional[str] = None, **extra: Any) -> Dict[str, Any]:
+    """Build query parameters with the API key"""
+    params = {"apikey": settings.twelve_data.api_key, **extra}
+    if symbol is not None:
+        params["symbol"] = symbol
+    return params
+
+def _get(path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """GET a Twelve Data endpoint over the shared session"""
+    response = session.get(f"{settings.twelve_data.base_url}/{path}", params=params,
+                           timeout=settings.http.timeout)
+    response.raise_for_status()
+    return response.json()
+
+async def _get_async(path: str, params: Dict[str, Any]) -> Dict[str, Any]:
+    """GET a Twelve Data endpoint over the shared async connection pool"""
+    return await async_http_client.get_json("twelve_data", f"{settings.twelve_data.base_url}/{path}", params)
+
 def fetch_stock_data(symbol: str) -> Dict[str, Any]:
     """
     Fetch stock data including OHLCV and volume.
     """
-    endpoint = f"{settings.twelve_data.base_url}/time_series"
-    params = {
-        "symbol": symbol,
-        "interval": "1h",
-        "apikey": settings.twelve_data.api_key
-    }
-    response = requests.get(endpoint, params=params)
-    response.raise_for_status()
-    return response.json()
+    return _get("time_series", _params(symbol, interval="1h"))
 
 def fetch_financial_statements(symbol: str) -> Dict[str, Any]:
     """
     Fetch financial statements like income statement, balance sheet, and cash flow.
     """
-    endpoint = f"{settings.twelve_data.base_url}/financials"
-    params = {
-        "symbol": symbol,
-        "apikey": settings.twelve_data.api_key
-    }
-    response = requests.get(endpoint, params=params)
-    response.raise_for_status()
-    return response.json()
+    return _get("financials", _params(symbol))
 
 def fetch_company_info(symbol: str) -> Dict[str, Any]:
     """
     Fetch company info like market cap, sector, and industry ratios.
     """
-    endpoint = f"{settings.twelve_data.base_url}/company_info"
-    params = {
-        "symbol": symbol,
-        "apikey": settings.twelve_data.api_key
-    }
-    response = requests.get(endpoint, params=params)
-    response.raise_for_status()
-    return response.json()
+    return _get("company_info", _params(symbol))
 
 def fetch_economic_data() -> Dict[str, Any]:
     """
     Fetch economic data like interest rates, inflation, and GDP growth.
     """
-    endpoint = f"{settings.twelve_data.base_url}/economic_data"
-    params = {
-        "apikey": settings.twelve_data.api_key
-    }
-    response = requests.get(endpoint, params=params)
-    response.raise_for_status()
-    return response.json()
+    return _get("economic_data", _params())
 
 def fetch_news_sentiment(symbol: str) -> Dict[str, Any]:
     """
     Fetch news sentiment and analysis for a specific company.
     """
-    endpoint = f"{settings.twelve_data.base_url}/news_sentiment"
-    params = {
-        "symbol": symbol,
-        "apikey": settings.twelve_data.api_key
+    return _get("news_sentiment", _params(symbol))
+
+async def fetch_stock_data_async(symbol: str) -> Dict[str, Any]:
+    """
+    Coroutine version of fetch_stock_data.
+    """
+    return await _get_async("time_series", _params(symbol, interval="1h"))
+
+async def fetch_financial_statements_async(symbol: str) -> Dict[str, Any]:
+    """
+    Coroutine version of fetch_financial_statements.
+    """
+    return await _get_async("financials", _params(symbol))
+
+async def fetch_company_info_async(symbol: str) -> Dict[str, Any]:
+    """
+    Coroutine version of fetch_company_info.
+    """
+    return await _get_async("company_info", _params(symbol))
+
+async def fetch_economic_data_async() -> Dict[str, Any]:
+    """
+    Coroutine version of fetch_economic_data.
+    """
+    return await _get_async("economic_data", _params())
+
+async def fetch_news_sentiment_async(symbol: str) -> Dict[str, Any]:
+    """
+    Coroutine version of fetch_news_sentiment.
+    """
+    return await _get_async("news_sentiment", _params(symbol))
+
+async def fetch_symbol_overview_async(symbol: str) -> Dict[str, Any]:
+    """
+    Fetch price, fundamentals, company info and sentiment for a symbol concurrently.
+
+    Failed requests are reported per section instead of failing the whole call.
+    """
+    sections = {
+        "stock_data": fetch_stock_data_async(symbol),
+        "financial_statements": fetch_financial_statements_async(symbol),
+        "company_info": fetch_company_info_async(symbol),
+        "news_sentiment": fetch_news_sentiment_async(symbol)
     }
-    response = requests.get(endpoint, params=params)
-    response.raise_for_status()
-    return response.json()
+    results = await asyncio.gather(*sections.values(), return_exceptions=True)
+
+    overview = {"symbol": symbol}
+    for name, result in zip(sections, results):
+        overview[name] = {"error": str(result)} if isinstance(result, Exception) else result
+    return overview
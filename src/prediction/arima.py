@@ -0,0 +1,279 @@
+"""
+ARIMA subsystem: parallel order selection, per-symbol order cache and
+fitted models extended with new observations instead of refit.
+"""
+import os
+import json
+import time
+import threading
+import warnings
+import multiprocessing
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import repeat
+from typing import Dict, Any, Optional, Tuple
+from src.config import get_settings
+from src import backends
+
+settings = get_settings()
+
+# (p, q) grid searched once the differencing order d is fixed by a unit-root test
+ARIMA_MAX_P = 3
+ARIMA_MAX_Q = 3
+ARIMA_MAX_D = 2
+
+Order = Tuple[int, int, int]
+
+# Order-search pool shared by every fit in this process, as (workers, executor)
+_search_pool: Optional[Tuple[int, ProcessPoolExecutor]] = None
+_search_pool_lock = threading.Lock()
+
+def differencing_order(values: np.ndarray, max_d: int = ARIMA_MAX_D, alpha: float = 0.05) -> int:
+    """
+    Smallest d for which the differenced series passes the ADF stationarity test
+
+    Information criteria are not comparable across d, so d is fixed first.
+    """
+    stattools = backends.load('statsmodels', 'statsmodels.tsa.stattools')
+    for d in range(max_d + 1):
+        series = np.diff(values, n=d) if d else values
+        if len(series) < 20:
+            return d
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore')
+            if stattools.adfuller(series, autolag='AIC')[1] < alpha:
+                return d
+    return max_d
+
+def _fit(values: np.ndarray, order: Order) -> Any:
+    ARIMA = backends.load('statsmodels', 'statsmodels.tsa.arima.model').ARIMA
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        return ARIMA(values, order=order).fit()
+
+def _score_order(values: np.ndarray, order: Order, criterion: str) -> Tuple[Order, float]:
+    """Fit one candidate order and return its information criterion (inf on failure)"""
+    try:
+        return order, float(getattr(_fit(values, order), criterion))
+    except Exception:
+        return order, float('inf')
+
+def _order_search_pool(workers: int) -> ProcessPoolExecutor:
+    """Spawned pool for the order search, created once and reused across fits"""
+    global _search_pool
+    with _search_pool_lock:
+        if _search_pool is None or _search_pool[0] != workers:
+            if _search_pool is not None:
+                _search_pool[1].shutdown(wait=False)
+            # Spawned rather than forked from a process that may be running threads
+            _search_pool = (workers, ProcessPoolExecutor(max_workers=workers,
+                                                         mp_context=multiprocessing.get_context('spawn')))
+        return _search_pool[1]
+
+def _discard_order_search_pool(executor: ProcessPoolExecutor) -> None:
+    """Drop a broken search pool; the next search starts a new one"""
+    global _search_pool
+    with _search_pool_lock:
+        if _search_pool is not None and _search_pool[1] is executor:
+            _search_pool = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+def select_order(values: np.ndarray, criterion: Optional[str] = None,
+                 max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Choose an ARIMA order by information criterion
+
+    Args:
+        values: Observations
+        criterion: 'aic' or 'bic' (defaults to settings.model.arima_criterion)
+        max_workers: Processes fitting candidates (defaults to
+            settings.model.training_workers, 0 = CPU count). Inside a worker
+            process (compute pool, backtest) the search runs sequentially
+            instead of nesting another pool.
+
+    Returns:
+        Dictionary with 'order', 'criterion', 'score', 'candidates' and 'search_time'
+    """
+    start = time.perf_counter()
+    criterion = criterion or settings.model.arima_criterion
+    if criterion not in ('aic', 'bic'):
+        raise ValueError(f"Unknown ARIMA criterion: {criterion}")
+
+    values = np.asarray(values, dtype=np.float64)
+    d = differencing_order(values)
+    grid = [(p, d, q) for p in range(ARIMA_MAX_P + 1) for q in range(ARIMA_MAX_Q + 1)]
+    max_workers = max_workers or settings.model.training_workers or os.cpu_count() or 1
+    if multiprocessing.parent_process() is not None:
+        max_workers = 1
+
+    if max_workers == 1:
+        scores = [_score_order(values, order, criterion) for order in grid]
+    else:
+        executor = _order_search_pool(min(max_workers, len(grid)))
+        try:
+            scores = list(executor.map(_score_order, repeat(values), grid, repeat(criterion)))
+        except BrokenProcessPool:
+            _discard_order_search_pool(executor)
+            scores = [_score_order(values, order, criterion) for order in grid]
+
+    order, score = min(scores, key=lambda candidate: candidate[1])
+    if not np.isfinite(score):
+        raise ValueError("No ARIMA order could be fitted")
+
+    return {
+        'order': order,
+        'criterion': criterion,
+        'score': score,
+        'candidates': len(grid),
+        'search_time': time.perf_counter() - start
+    }
+
+class ArimaOrderCache:
+    """Chosen ARIMA order per symbol, persisted as JSON next to the model cache"""
+
+    def __init__(self, path: Optional[str] = None, max_age: Optional[int] = None):
+        self.path = path or os.path.join(settings.model.cache_dir, 'arima_orders.json')
+        self.max_age = max_age if max_age is not None else settings.model.retrain_interval
+        self._orders: Optional[Dict[str, Dict[str, Any]]] = None
+        self._lock = threading.Lock()
+
+    def _read(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"Warning: Could not read ARIMA order cache {self.path}: {e}")
+            return {}
+
+    def get(self, symbol: str) -> Optional[Order]:
+        """
+        Cached order for a symbol, if chosen within max_age seconds
+
+        Args:
+            symbol: Stock symbol
+
+        Returns:
+            (p, d, q) tuple or None
+        """
+        with self._lock:
+            if self._orders is None or symbol.upper() not in self._orders:
+                self._orders = self._read()
+            entry = self._orders.get(symbol.upper())
+        if entry is None or time.time() - entry['selected_at'] >= self.max_age:
+            return None
+        return tuple(entry['order'])
+
+    def put(self, symbol: str, selection: Dict[str, Any]) -> None:
+        """
+        Store the selection returned by select_order
+
+        Args:
+            symbol: Stock symbol
+            selection: Result of select_order
+        """
+        entry = {
+            'order': list(selection['order']),
+            'criterion': selection['criterion'],
+            'score': selection['score'],
+            'selected_at': time.time()
+        }
+        with self._lock:
+            # Merge with entries written by other processes
+            self._orders = {**self._read(), symbol.upper(): entry}
+            try:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                with open(tmp_path, 'w') as f:
+                    json.dump(self._orders, f)
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                print(f"Warning: Could not persist ARIMA order for {symbol}: {e}")
+
+class ArimaForecaster:
+    """
+    ARIMA model whose fitted state-space results are extended with new
+    observations (statsmodels ``extend``) instead of being refit.
+    """
+
+    def __init__(self, order: Optional[Order] = None):
+        self.order = order
+        self.selection: Optional[Dict[str, Any]] = None
+        self.results = None
+        self.last_index = None
+        self.nobs = 0
+        self.fit_time = None
+        self.forecast_time = None
+
+    def fit(self, series: pd.Series) -> 'ArimaForecaster':
+        """
+        Fit on a series, selecting the order first if none was given
+
+        Args:
+            series: Observations with a sortable index
+
+        Returns:
+            self
+        """
+        values = series.to_numpy(dtype=np.float64)
+        if self.order is None:
+            self.selection = select_order(values)
+            self.order = self.selection['order']
+
+        start = time.perf_counter()
+        self.results = _fit(values, self.order)
+        self.fit_time = time.perf_counter() - start
+        self.last_index = series.index[-1]
+        self.nobs = len(values)
+        return self
+
+    def _new_observations(self, series: pd.Series) -> np.ndarray:
+        return series[series.index > self.last_index].to_numpy(dtype=np.float64)
+
+    def append(self, series: pd.Series) -> int:
+        """
+        Extend the fitted model with the observations after last_index
+
+        The parameters stay fixed; only the state is filtered forward, so
+        this costs O(new observations).
+
+        Args:
+            series: Series containing (at least) the new observations
+
+        Returns:
+            Number of observations added
+        """
+        new = self._new_observations(series)
+        if len(new):
+            self.results = self.results.extend(new)
+            self.last_index = series.index[-1]
+            self.nobs += len(new)
+        return len(new)
+
+    def forecast(self, steps: int, series: Optional[pd.Series] = None) -> np.ndarray:
+        """
+        Forecast the next ``steps`` observations
+
+        Args:
+            steps: Observations ahead
+            series: Optional newer data; observations after last_index are
+                filtered in for this forecast without changing the model
+
+        Returns:
+            Array of forecasts
+        """
+        start = time.perf_counter()
+        results = self.results
+        if series is not None:
+            new = self._new_observations(series)
+            if len(new):
+                results = results.extend(new)
+        values = np.asarray(results.forecast(steps), dtype=np.float64)
+        self.forecast_time = time.perf_counter() - start
+        return values
+
+# Global ARIMA order cache instance
+arima_orders = ArimaOrderCache()
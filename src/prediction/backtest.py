@@ -0,0 +1,402 @@
+"""
+Walk-forward backtesting of the StockPredictor model zoo.
+
+Each symbol's feature matrix is built once; folds are row ranges of it.
+Models are the direct multi-horizon regressors StockPredictor serves,
+trained on the same lead targets with the same purge; a signal is taken
+from their forecast ``horizon`` bars ahead and held for that many bars.
+Folds are grouped into segments that start with a full refit and then
+update the fitted estimators incrementally (see ml_models.incremental_fit),
+so segments are independent and are scored in parallel across processes.
+"""
+import os
+import time
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
+from src.config import get_settings
+from src import backends
+from src.prediction.features import FeatureBuilder, horizon_targets
+from src.prediction.ml_models import (
+    StockPredictor, MODEL_GRAPH_FEATURES, generate_recommendation, incremental_fit, _direct_model
+)
+
+settings = get_settings()
+
+TRADING_DAYS = 252
+
+# Position held over the signal's horizon for each recommendation
+POSITIONS = {'BUY': 1.0, 'SELL': -1.0, 'HOLD': 0.0}
+
+def walk_forward_folds(n_rows: int, train_size: int, test_size: int,
+                       window: str = 'expanding') -> List[Tuple[int, int, int]]:
+    """
+    Row bounds of the walk-forward folds
+
+    Args:
+        n_rows: Rows in the feature matrix
+        train_size: Rows in the first (or every, for 'rolling') training window
+        test_size: Rows scored per fold
+        window: 'expanding' (train from the first row) or 'rolling' (fixed length)
+
+    Returns:
+        List of (train_start, train_end, test_end) row indices
+    """
+    if window not in ('expanding', 'rolling'):
+        raise ValueError(f"Unknown backtest window: {window}")
+
+    folds = []
+    train_end = train_size
+    while train_end < n_rows:
+        test_end = min(train_end + test_size, n_rows)
+        train_start = 0 if window == 'expanding' else train_end - train_size
+        folds.append((train_start, train_end, test_end))
+        train_end = test_end
+    return folds
+
+def _regression_metrics(y_true: np.ndarray, y_pred: np.ndarray) -> Dict[str, float]:
+    """Metrics averaged over the horizon columns, plus RMSE per horizon"""
+    sk_metrics = backends.load('sklearn', 'sklearn.metrics')
+    mse = sk_metrics.mean_squared_error(y_true, y_pred)
+    horizon_mse = sk_metrics.mean_squared_error(y_true, y_pred, multioutput='raw_values')
+    return {
+        'mse': mse,
+        'mae': sk_metrics.mean_absolute_error(y_true, y_pred),
+        'r2': sk_metrics.r2_score(y_true, y_pred) if len(y_true) > 1 else float('nan'),
+        'rmse': np.sqrt(mse),
+        'horizon_rmse': np.sqrt(horizon_mse).tolist()
+    }
+
+def forecast_at(forecasts: np.ndarray, horizons: List[int], horizon: int) -> np.ndarray:
+    """
+    Row-wise value of forecast curves at one horizon, as predict_future
+
+    Args:
+        forecasts: Array of shape (rows, len(horizons))
+        horizons: Horizons of the forecast columns (ascending)
+        horizon: Bars ahead (interpolated, clamped to the outermost horizons)
+
+    Returns:
+        One value per row
+    """
+    # np.interp is linear in the values, so interpolating each unit column gives the weights
+    weights = np.array([np.interp(horizon, horizons, column) for column in np.eye(len(horizons))])
+    return forecasts @ weights
+
+def ensemble_confidence(predictions: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Row-wise ensemble mean and confidence, as create_ensemble_prediction
+
+    Args:
+        predictions: Array of shape (models, rows)
+
+    Returns:
+        Tuple of (ensemble prediction, confidence in [0, 1])
+    """
+    mean = predictions.mean(axis=0)
+    std = predictions.std(axis=0)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        confidence = np.where(mean != 0, np.clip(1 - std / mean, 0, 1), 0.0)
+    return mean, confidence
+
+def _run_segment(task: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Fit and score one segment of consecutive folds
+
+    The first fold is a full refit (fresh clones and scaler); later folds
+    update the estimators incrementally where they support it. The last
+    ``purge`` rows of every training window are dropped, as their targets
+    lie in the test block. Module-level so it can run in a process pool.
+    """
+    base = backends.load('sklearn', 'sklearn.base')
+    preprocessing = backends.load('sklearn', 'sklearn.preprocessing')
+
+    X, y = task['X'], task['y']
+    models, scaler = {}, None
+    results = []
+
+    for position, (train_start, test_start, test_end) in enumerate(task['folds']):
+        start = time.perf_counter()
+        train_end = test_start - task['purge']
+        full_refit = position == 0 or not task['incremental']
+        if full_refit:
+            scaler = preprocessing.StandardScaler().fit(X[train_start:train_end])
+        X_train = scaler.transform(X[train_start:train_end])
+        X_test = scaler.transform(X[test_start:test_end])
+        y_train, y_test = y[train_start:train_end], y[test_start:test_end]
+        new_rows = 0 if full_refit else test_start - task['folds'][position - 1][1]
+
+        metrics, predictions = {}, []
+        for name, template in task['models'].items():
+            fit_start = time.perf_counter()
+            try:
+                model = models.get(name)
+                if full_refit or model is None or incremental_fit(
+                        model, X_train[-new_rows:], y_train[-new_rows:], X_train, y_train,
+                        task['extra_estimators']) is None:
+                    model = base.clone(template).fit(X_train, y_train)
+                models[name] = model
+
+                y_pred = np.asarray(model.predict(X_test), dtype=np.float64).reshape(y_test.shape)
+                metrics[name] = _regression_metrics(y_test, y_pred)
+                predictions.append(y_pred)
+            except Exception as e:
+                models.pop(name, None)
+                metrics[name] = {'error': str(e)}
+            metrics[name]['train_time'] = time.perf_counter() - fit_start
+
+        if predictions:
+            metrics['ensemble'] = _regression_metrics(y_test, np.mean(predictions, axis=0))
+            ensemble, confidence = ensemble_confidence(np.vstack(
+                [forecast_at(y_pred, task['horizons'], task['horizon']) for y_pred in predictions]))
+        else:
+            ensemble = confidence = np.full(len(y_test), np.nan)
+
+        results.append({
+            'fold': task['first_fold'] + position,
+            'bounds': (train_start + task['offset'], train_end + task['offset'],
+                       test_start + task['offset'], test_end + task['offset']),
+            'refit': 'full' if full_refit else 'incremental',
+            'metrics': metrics,
+            'prediction': ensemble,
+            'confidence': confidence,
+            'time': time.perf_counter() - start
+        })
+
+    return results
+
+def simulate_signals(close: np.ndarray, signals: List[str], cost_bps: float = 0.0,
+                     allow_short: bool = True, horizon: int = 1) -> Tuple[Dict[str, Any], np.ndarray]:
+    """
+    Simulate trading the BUY/SELL/HOLD signals
+
+    A signal issued at a bar's close is held for ``horizon`` bars, the span
+    its forecast covers; the next signal taken is the one issued when that
+    holding period ends. Changing position costs ``cost_bps`` of notional.
+
+    Args:
+        close: Close prices of the signal bars
+        signals: Recommendation per bar (see generate_recommendation)
+        cost_bps: Transaction cost in basis points per unit of turnover
+        allow_short: Whether SELL opens a short position (otherwise it goes flat)
+        horizon: Bars each signal is held
+
+    Returns:
+        Tuple of (P&L summary, per-bar strategy returns)
+    """
+    position = np.array([POSITIONS[signal] for signal in signals], dtype=np.float64)
+    if not allow_short:
+        position = np.maximum(position, 0)
+    # Each bar keeps the position of the latest signal taken at a rebalance bar
+    position = position[np.arange(len(position)) // horizon * horizon]
+
+    market = np.zeros(len(close))
+    market[:-1] = close[1:] / close[:-1] - 1
+    turnover = np.abs(np.diff(position, prepend=0.0))
+    strategy = position * market - turnover * cost_bps / 10000
+
+    equity = np.cumprod(1 + strategy)
+    drawdown = equity / np.maximum.accumulate(equity) - 1 if len(equity) else equity
+    years = len(strategy) / TRADING_DAYS
+    volatility = strategy.std() * np.sqrt(TRADING_DAYS) if len(strategy) > 1 else 0.0
+    in_market = position != 0
+
+    summary = {
+        'total_return': float(equity[-1] - 1) if len(equity) else 0.0,
+        'annualized_return': float(equity[-1] ** (1 / years) - 1) if years > 0 and equity[-1] > 0 else 0.0,
+        'annualized_volatility': float(volatility),
+        'sharpe_ratio': float(strategy.mean() * TRADING_DAYS / volatility) if volatility else 0.0,
+        'max_drawdown': float(drawdown.min()) if len(drawdown) else 0.0,
+        'trades': int(np.count_nonzero(turnover)),
+        'exposure': float(in_market.mean()) if len(in_market) else 0.0,
+        'hit_rate': float((strategy[in_market] > 0).mean()) if in_market.any() else 0.0,
+        'buy_and_hold_return': float(close[-1] / close[0] - 1) if len(close) else 0.0,
+        'signals': {label: int(sum(signal == label for signal in signals[::horizon])) for label in POSITIONS}
+    }
+    return summary, strategy
+
+class WalkForwardBacktester:
+    """
+    Walk-forward evaluation of the StockPredictor models and their signals.
+
+    Every fold trains on the rows before its test block to predict the
+    close at every forecast horizon, scores each model and the ensemble,
+    and turns the ensemble forecast ``horizon`` bars ahead into
+    BUY/SELL/HOLD signals with generate_recommendation (forecast against
+    the signal bar's close) for a P&L simulation.
+    """
+
+    def __init__(self, train_size: int = 504, test_size: int = 63, window: str = 'expanding',
+                 models: Optional[List[str]] = None, refit_every: int = 4, extra_estimators: int = 20,
+                 cost_bps: float = 5.0, allow_short: bool = True, horizon: int = 30,
+                 max_workers: Optional[int] = None):
+        """
+        Args:
+            train_size: Rows in the first (or every, for 'rolling') training window
+                (the last max(forecast horizons) of them are purged)
+            test_size: Rows scored per fold
+            window: 'expanding' or 'rolling'
+            models: StockPredictor model names to evaluate (default: all)
+            refit_every: Folds per segment; each segment starts with a full refit
+                (1 disables incremental refits). Ignored for 'rolling', which
+                refits every fold: incremental updates cannot drop the rows
+                that leave the window
+            extra_estimators: Trees/boosting rounds added per incremental refit
+            cost_bps: Transaction cost in basis points per unit of turnover
+            allow_short: Whether SELL opens a short position
+            horizon: Bars ahead the signal forecast covers, and bars each
+                signal is held (the /predict default is 30); interpolated on
+                the settings.model.forecast_horizons curve
+            max_workers: Worker processes (defaults to settings.model.backtest_workers, 0 = CPU count)
+        """
+        if window not in ('expanding', 'rolling'):
+            raise ValueError(f"Unknown backtest window: {window}")
+        self.horizons = sorted(settings.model.forecast_horizons)
+        if horizon < 1 or max(self.horizons) >= train_size:
+            raise ValueError(f"Backtest horizon must be positive and train_size above {max(self.horizons)}")
+        self.train_size = train_size
+        self.test_size = test_size
+        self.window = window
+        self.model_names = models
+        self.refit_every = max(1, refit_every)
+        self.extra_estimators = extra_estimators
+        self.cost_bps = cost_bps
+        self.allow_short = allow_short
+        self.horizon = horizon
+        self.max_workers = max_workers or settings.model.backtest_workers or os.cpu_count() or 1
+
+    def _templates(self) -> Dict[str, Any]:
+        """Unfitted direct multi-horizon estimators, single-threaded when folds run in parallel"""
+        models = StockPredictor().models
+        if self.model_names is not None:
+            unknown = set(self.model_names) - set(models)
+            if unknown:
+                raise ValueError(f"Unknown models: {', '.join(sorted(unknown))}")
+            models = {name: models[name] for name in self.model_names}
+        if self.max_workers > 1:
+            for model in models.values():
+                if 'n_jobs' in model.get_params():
+                    model.set_params(n_jobs=1)
+        return {name: _direct_model(model) for name, model in models.items()}
+
+    def _segments(self, symbol: str, X: np.ndarray, y: np.ndarray, models: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Split a symbol's folds into independent segment tasks"""
+        folds = walk_forward_folds(len(X), self.train_size, self.test_size, self.window)
+        refit_every = self.refit_every if self.window == 'expanding' else 1
+        tasks = []
+        for first in range(0, len(folds), refit_every):
+            segment = folds[first:first + refit_every]
+            # Ship only the rows this segment touches, with fold bounds relative to them
+            offset, end = segment[0][0], segment[-1][2]
+            tasks.append({
+                'symbol': symbol,
+                'X': X[offset:end],
+                'y': y[offset:end],
+                'folds': [(a - offset, b - offset, c - offset) for a, b, c in segment],
+                'offset': offset,
+                'first_fold': first,
+                'models': models,
+                'purge': max(self.horizons),
+                'horizons': self.horizons,
+                'horizon': self.horizon,
+                'incremental': refit_every > 1,
+                'extra_estimators': self.extra_estimators
+            })
+        return tasks
+
+    def _summarize(self, symbol: str, dates: pd.Index, close: np.ndarray,
+                   folds: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Per-fold metrics plus the P&L of the stitched out-of-sample signals"""
+        folds = sorted(folds, key=lambda fold: fold['fold'])
+        if not folds:
+            return {'symbol': symbol, 'error': 'Not enough data for a single fold'}
+
+        test_rows = np.concatenate([np.arange(fold['bounds'][2], fold['bounds'][3]) for fold in folds])
+        prediction = np.concatenate([fold['prediction'] for fold in folds])
+        confidence = np.concatenate([fold['confidence'] for fold in folds])
+        close = close[test_rows]
+
+        # The ensemble forecast for t + horizon is compared with the close at t
+        signals = [generate_recommendation(price, predicted, conf) if predicted == predicted else 'HOLD'
+                   for price, predicted, conf in zip(close, prediction, confidence)]
+        pnl, strategy = simulate_signals(close, signals, self.cost_bps, self.allow_short, self.horizon)
+
+        daily = pd.DataFrame({
+            'close': close,
+            'prediction': prediction,
+            'confidence': confidence,
+            'signal': signals,
+            'strategy_return': strategy
+        }, index=dates[test_rows])
+
+        return {
+            'symbol': symbol,
+            'window': self.window,
+            'folds': [{
+                'fold': fold['fold'],
+                'train_start': str(dates[fold['bounds'][0]]),
+                'train_end': str(dates[fold['bounds'][1] - 1]),
+                'test_start': str(dates[fold['bounds'][2]]),
+                'test_end': str(dates[fold['bounds'][3] - 1]),
+                'refit': fold['refit'],
+                'time': fold['time'],
+                'metrics': fold['metrics']
+            } for fold in folds],
+            'pnl': pnl,
+            'daily': daily
+        }
+
+    def run(self, indicators: Dict[str, pd.DataFrame]) -> Dict[str, Dict[str, Any]]:
+        """
+        Backtest many symbols
+
+        Args:
+            indicators: Mapping of symbol to DataFrame with stock data and
+                technical indicators (see prepare_indicators)
+
+        Returns:
+            Mapping of symbol to {'folds', 'pnl', 'daily'} results
+        """
+        models = self._templates()
+        matrices, tasks = {}, []
+        for symbol, df in indicators.items():
+            X, close = FeatureBuilder().training_set(df)
+            # Rows whose every horizon target is known, as StockPredictor.train_models
+            Y = horizon_targets(close, self.horizons)
+            known = Y.notna().all(axis=1).to_numpy()
+            X, close, Y = X[known], close[known], Y[known]
+            matrices[symbol] = (X.index, close.to_numpy())
+            tasks += self._segments(symbol, X.to_numpy(), Y.to_numpy(), models)
+
+        outcomes = {symbol: [] for symbol in indicators}
+        if self.max_workers == 1 or len(tasks) <= 1:
+            for task in tasks:
+                outcomes[task['symbol']] += _run_segment(task)
+        else:
+            with ProcessPoolExecutor(max_workers=min(self.max_workers, len(tasks))) as executor:
+                futures = [(task['symbol'], executor.submit(_run_segment, task)) for task in tasks]
+                for symbol, future in futures:
+                    outcomes[symbol] += future.result()
+
+        return {symbol: self._summarize(symbol, *matrices[symbol], outcomes[symbol]) for symbol in indicators}
+
+    def run_symbol(self, symbol: str, indicators: pd.DataFrame) -> Dict[str, Any]:
+        """Backtest a single symbol (its segments still run in parallel)"""
+        return self.run({symbol: indicators})[symbol]
+
+def prepare_indicators(frames: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+    """
+    Compute model indicators for raw OHLCV frames, skipping empty ones
+
+    Args:
+        frames: Mapping of symbol to OHLCV DataFrame
+
+    Returns:
+        Mapping of symbol to DataFrame with indicators and model graph features
+    """
+    from src.analysis.technical_indicators import calculate_all_indicators
+    from src.analysis.indicator_graph import INDICATOR_COLUMNS
+
+    return {symbol: calculate_all_indicators(df, backend='numpy', columns=INDICATOR_COLUMNS + MODEL_GRAPH_FEATURES)
+            for symbol, df in frames.items() if not df.empty}
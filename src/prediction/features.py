@@ -0,0 +1,184 @@
+"""
+Columnar design-matrix builder shared by model training and inference.
+"""
+import numpy as np
+import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import List, Optional, Tuple
+
+# Indicator columns used as features when present in the input
+INDICATOR_FEATURES = [
+    'open', 'high', 'low', 'volume',
+    'SMA_20', 'SMA_50', 'EMA_12', 'EMA_26',
+    'RSI', 'MACD', 'MACD_Signal', 'MACD_Histogram',
+    'BB_Upper', 'BB_Middle', 'BB_Lower',
+    'Stoch_K', 'Stoch_D', 'ATR', 'ADX',
+    'OBV', 'VWAP', 'Williams_R'
+]
+
+# Percent-change features: name -> (source, periods); 'target' is the target column
+CHANGE_FEATURES = {
+    'Price_Change': ('target', 1),
+    'Price_Change_5d': ('target', 5),
+    'Price_Change_10d': ('target', 10),
+    'Volume_Change': ('volume', 1),
+}
+
+# Rolling statistics shared with the indicator graph (see MODEL_GRAPH_FEATURES)
+ROLLING_FEATURES = ['Price_Volatility', 'Volume_SMA']
+
+FEATURE_LAGS = [1, 2, 3, 5, 10]
+
+# Rows needed to build one complete feature row (the 20-bar rolling window)
+FEATURE_LOOKBACK = 20
+
+def _lag_views(x: np.ndarray, max_lag: int) -> np.ndarray:
+    """
+    Strided (n, max_lag + 1) view whose column ``max_lag - lag`` is x shifted by lag
+
+    Only the NaN-padded copy of x is allocated; the lag columns share it.
+    """
+    padded = np.concatenate([np.full(max_lag, np.nan), x])
+    return sliding_window_view(padded, max_lag + 1)
+
+def horizon_targets(y: pd.Series, horizons: List[int]) -> pd.DataFrame:
+    """
+    Direct multi-horizon targets: column h holds y h rows ahead
+
+    Args:
+        y: Target series (one row per bar)
+        horizons: Rows ahead to predict
+
+    Returns:
+        DataFrame with one '<name>_<h>d' column per horizon (NaN past the end)
+    """
+    max_horizon = max(horizons)
+    values = y.to_numpy(dtype=np.float64)
+    leads = sliding_window_view(np.concatenate([values, np.full(max_horizon, np.nan)]), max_horizon + 1)
+    return pd.DataFrame(leads[:, horizons], index=y.index, columns=[f'{y.name}_{h}d' for h in horizons])
+
+class FeatureBuilder:
+    """
+    Builds the model design matrix in one preallocated C-contiguous array.
+
+    The input DataFrame is never modified. ``schema`` fixes the column order
+    at training time; inference rebuilds only the trailing rows it needs
+    with the same schema.
+    """
+
+    def __init__(self, target_col: str = 'close', dtype: type = np.float64):
+        self.target_col = target_col
+        self.dtype = np.dtype(dtype)
+
+    def schema(self, columns: List[str]) -> List[str]:
+        """
+        Feature names, in matrix column order, for a DataFrame's columns
+
+        Args:
+            columns: Columns of the input DataFrame
+
+        Returns:
+            List of feature names
+        """
+        available = set(columns)
+        names = [col for col in INDICATOR_FEATURES if col in available]
+        names += list(CHANGE_FEATURES) + ROLLING_FEATURES
+        for lag in FEATURE_LAGS:
+            names += [f'Price_Lag_{lag}', f'Volume_Lag_{lag}']
+        return names
+
+    def _rolling_features(self, df: pd.DataFrame, target: np.ndarray, volume: np.ndarray) -> dict:
+        """Rolling statistics, reused from the input when the indicator graph produced them"""
+        if self.target_col == 'close':
+            features = {name: df[name].to_numpy(dtype=np.float64) for name in ROLLING_FEATURES if name in df.columns}
+        else:
+            features = {}
+
+        missing = [name for name in ROLLING_FEATURES if name not in features]
+        if missing:
+            from src.analysis.indicator_graph import compute_indicators
+            features.update(compute_indicators({'close': target, 'volume': volume}, missing, backend='numpy'))
+        return features
+
+    def build(self, df: pd.DataFrame, schema: Optional[List[str]] = None) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+        """
+        Build the feature matrix and target vector for every row
+
+        Args:
+            df: DataFrame with stock data and technical indicators
+            schema: Feature names to build (default: schema(df.columns));
+                names missing from df are filled with NaN
+
+        Returns:
+            Tuple of (features array of shape (rows, features), target array, feature names)
+        """
+        schema = self.schema(df.columns) if schema is None else list(schema)
+        target = df[self.target_col].to_numpy(dtype=np.float64)
+        volume = df['volume'].to_numpy(dtype=np.float64)
+
+        matrix = np.empty((len(df), len(schema)), dtype=self.dtype, order='C')
+        sources = {'target': target, 'volume': volume}
+        lags = {'Price': _lag_views(target, max(FEATURE_LAGS)), 'Volume': _lag_views(volume, max(FEATURE_LAGS))}
+        rolling = None
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            for j, name in enumerate(schema):
+                if name in CHANGE_FEATURES:
+                    source, periods = CHANGE_FEATURES[name]
+                    values = sources[source]
+                    matrix[:periods, j] = np.nan
+                    matrix[periods:, j] = values[periods:] / values[:-periods] - 1
+                elif name in ROLLING_FEATURES:
+                    if rolling is None:
+                        rolling = self._rolling_features(df, target, volume)
+                    matrix[:, j] = rolling[name]
+                elif name.startswith(('Price_Lag_', 'Volume_Lag_')):
+                    kind, _, lag = name.split('_')
+                    matrix[:, j] = lags[kind][:, max(FEATURE_LAGS) - int(lag)]
+                elif name in df.columns:
+                    matrix[:, j] = df[name].to_numpy(dtype=np.float64)
+                else:
+                    matrix[:, j] = np.nan
+
+        return matrix, target, schema
+
+    def training_set(self, df: pd.DataFrame, schema: Optional[List[str]] = None) -> Tuple[pd.DataFrame, pd.Series]:
+        """
+        Complete rows (no NaN feature or target) as a DataFrame/Series pair
+
+        The DataFrame wraps the builder's array without another copy when the
+        complete rows are contiguous (the usual leading warm-up gap).
+
+        Args:
+            df: DataFrame with stock data and technical indicators
+            schema: Feature names to build (default: schema(df.columns))
+
+        Returns:
+            Tuple of (features, target)
+        """
+        matrix, target, schema = self.build(df, schema)
+        complete = ~(np.isnan(matrix).any(axis=1) | np.isnan(target))
+        rows = np.flatnonzero(complete)
+        if rows.size and rows[-1] - rows[0] + 1 == rows.size:
+            rows = slice(rows[0], rows[-1] + 1)
+
+        index = df.index[rows]
+        X = pd.DataFrame(matrix[rows], index=index, columns=schema, copy=False)
+        y = pd.Series(target[rows], index=index, name=self.target_col)
+        return X, y
+
+    def latest(self, df: pd.DataFrame, schema: List[str]) -> pd.DataFrame:
+        """
+        Feature row for the last bar, built from the trailing FEATURE_LOOKBACK rows
+
+        Args:
+            df: DataFrame with stock data and technical indicators
+            schema: Feature names the model was trained on
+
+        Returns:
+            Single-row DataFrame with the schema's columns (missing values as 0)
+        """
+        tail = df.iloc[-FEATURE_LOOKBACK:]
+        matrix, _, _ = self.build(tail, schema)
+        row = np.where(np.isnan(matrix[-1:]), 0.0, matrix[-1:])
+        return pd.DataFrame(row, index=tail.index[-1:], columns=schema)
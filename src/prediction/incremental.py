@@ -0,0 +1,91 @@
+"""
+Incrementally updatable estimators for StockPredictor.
+
+Imported lazily (it needs scikit-learn at import time).
+"""
+import numpy as np
+from sklearn.base import BaseEstimator, RegressorMixin
+
+class RunningLinearRegression(RegressorMixin, BaseEstimator):
+    """
+    Ordinary least squares from running normal-equation accumulators
+
+    Keeps the row count, feature/target means and centered cross-product
+    matrices. ``partial_fit`` merges a batch into them (Chan's pairwise
+    update, numerically stable for raw price/volume magnitudes) and
+    re-solves, so updating costs O(batch x features^2) regardless of how
+    much history has been seen. Features are standardized inside the solve,
+    so inputs need no external scaling; collinear features get the
+    minimum-norm solution, like LinearRegression.
+    """
+
+    def __init__(self, fit_intercept: bool = True):
+        self.fit_intercept = fit_intercept
+
+    def __sklearn_tags__(self):
+        tags = super().__sklearn_tags__()
+        tags.target_tags.multi_output = True
+        return tags
+
+    def _more_tags(self):
+        return {'multioutput': True}
+
+    def fit(self, X, y) -> 'RunningLinearRegression':
+        """Fit from scratch"""
+        for name in ('n_samples_seen_', 'x_mean_', 'y_mean_', 'xx_', 'xy_'):
+            self.__dict__.pop(name, None)
+        return self.partial_fit(X, y)
+
+    def partial_fit(self, X, y) -> 'RunningLinearRegression':
+        """
+        Add a batch of rows and re-solve
+
+        Args:
+            X: Features of shape (rows, features)
+            y: Targets of shape (rows,) or (rows, targets)
+
+        Returns:
+            self
+        """
+        X = np.asarray(X, dtype=np.float64)
+        y = np.asarray(y, dtype=np.float64)
+        self._single_target = y.ndim == 1
+        Y = y.reshape(len(y), -1)
+        if len(X) == 0:
+            return self
+
+        n = len(X)
+        x_mean = X.mean(axis=0) if self.fit_intercept else np.zeros(X.shape[1])
+        y_mean = Y.mean(axis=0) if self.fit_intercept else np.zeros(Y.shape[1])
+        Xc, Yc = X - x_mean, Y - y_mean
+        xx, xy = Xc.T @ Xc, Xc.T @ Yc
+
+        if not hasattr(self, 'n_samples_seen_'):
+            self.n_samples_seen_, self.x_mean_, self.y_mean_, self.xx_, self.xy_ = n, x_mean, y_mean, xx, xy
+        else:
+            total = self.n_samples_seen_ + n
+            dx, dy = x_mean - self.x_mean_, y_mean - self.y_mean_
+            weight = self.n_samples_seen_ * n / total
+            self.xx_ = self.xx_ + xx + weight * np.outer(dx, dx)
+            self.xy_ = self.xy_ + xy + weight * np.outer(dx, dy)
+            self.x_mean_ = self.x_mean_ + dx * n / total
+            self.y_mean_ = self.y_mean_ + dy * n / total
+            self.n_samples_seen_ = total
+
+        self.n_features_in_ = X.shape[1]
+        self._solve()
+        return self
+
+    def _solve(self) -> None:
+        scale = np.sqrt(np.diag(self.xx_))
+        scale[scale == 0] = 1.0
+        coef = np.linalg.lstsq(self.xx_ / np.outer(scale, scale), self.xy_ / scale[:, None], rcond=None)[0]
+        coef = coef / scale[:, None]
+
+        self.coef_ = coef.T[0] if self._single_target else coef.T
+        intercept = self.y_mean_ - self.x_mean_ @ coef
+        self.intercept_ = float(intercept[0]) if self._single_target else intercept
+
+    def predict(self, X) -> np.ndarray:
+        X = np.asarray(X, dtype=np.float64)
+        return X @ self.coef_.T + self.intercept_
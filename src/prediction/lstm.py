@@ -0,0 +1,154 @@
+"""
+LSTM windowing, batched training input and per-symbol model files.
+"""
+import os
+import re
+import glob
+import time
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from typing import Any, List, Tuple
+from src.config import get_settings
+from src import backends
+
+settings = get_settings()
+
+SEQUENCE_LENGTH = 60
+LSTM_BATCH_SIZE = 32
+LSTM_MAX_EPOCHS = 50
+LSTM_PATIENCE = 5
+
+# Tail of the training windows held out to drive early stopping
+LSTM_VALIDATION_FRACTION = 0.1
+
+# Fewest training windows the LSTM is fitted on, and fewest validation windows
+# worth holding out (shorter histories train without a validation split)
+LSTM_MIN_TRAIN_ROWS = 32
+LSTM_MIN_VALIDATION_ROWS = 8
+
+def lstm_windows(scaled: np.ndarray, sequence_length: int, max_horizon: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Input windows and lead targets as strided views of one float32 series
+
+    Row i of ``windows`` is scaled[i:i + sequence_length]; row i of ``leads``
+    holds the following max_horizon values, so leads[:, h - 1] is the target
+    h steps ahead. Only rows whose every lead is known are included. Neither
+    array is materialized: batches are gathered from them one at a time.
+
+    Args:
+        scaled: Scaled series
+        sequence_length: Steps per input window
+        max_horizon: Longest horizon predicted
+
+    Returns:
+        Tuple of (windows of shape (rows, sequence_length, 1), leads of shape (rows, max_horizon))
+    """
+    values = np.ascontiguousarray(scaled, dtype=np.float32).reshape(-1)
+    rows = max(0, len(values) - sequence_length - max_horizon + 1)
+    windows = sliding_window_view(values, sequence_length)[:rows, :, np.newaxis]
+    leads = sliding_window_view(values[sequence_length:], max_horizon)[:rows]
+    return windows, leads
+
+def batch_dataset(windows: np.ndarray, leads: np.ndarray, horizons: List[int], start: int, stop: int,
+                  batch_size: int = LSTM_BATCH_SIZE, shuffle: bool = False) -> Any:
+    """
+    tf.data pipeline over rows [start, stop) that copies one batch at a time
+
+    Args:
+        windows: Window view from lstm_windows
+        leads: Lead view from lstm_windows
+        horizons: Horizons (steps ahead) used as target columns
+        start: First row
+        stop: Row after the last
+        batch_size: Rows per batch
+        shuffle: Reshuffle the rows every epoch
+
+    Returns:
+        Prefetching tf.data.Dataset of (windows, targets) batches
+    """
+    tf = backends.load('tensorflow')
+    columns = np.asarray(horizons) - 1
+    rows = np.arange(start, stop)
+
+    def batches():
+        order = np.random.permutation(rows) if shuffle else rows
+        for offset in range(0, len(order), batch_size):
+            index = order[offset:offset + batch_size]
+            yield windows[index], leads[index][:, columns]
+
+    signature = (tf.TensorSpec(shape=(None,) + windows.shape[1:], dtype=tf.float32),
+                 tf.TensorSpec(shape=(None, len(columns)), dtype=tf.float32))
+    return tf.data.Dataset.from_generator(batches, output_signature=signature).prefetch(tf.data.AUTOTUNE)
+
+def build_lstm(sequence_length: int, outputs: int) -> Any:
+    """Two-layer LSTM with one output per forecast horizon"""
+    keras = backends.load('tensorflow').keras
+    layers = keras.layers
+    model = keras.Sequential([
+        keras.Input(shape=(sequence_length, 1)),
+        layers.LSTM(50, return_sequences=True),
+        layers.Dropout(0.2),
+        layers.LSTM(50, return_sequences=False),
+        layers.Dropout(0.2),
+        layers.Dense(outputs)
+    ])
+    model.compile(optimizer='adam', loss='mean_squared_error')
+    return model
+
+def early_stopping(monitor: str = 'val_loss') -> Any:
+    """Stop once the monitored loss has not improved for LSTM_PATIENCE epochs, keeping the best weights"""
+    keras = backends.load('tensorflow').keras
+    return keras.callbacks.EarlyStopping(monitor=monitor, patience=LSTM_PATIENCE, restore_best_weights=True)
+
+def lstm_forecast(model: Any, window: np.ndarray) -> np.ndarray:
+    """
+    Forecast from one scaled input window
+
+    Calls the model directly rather than through ``predict``, which sets up
+    a batched input pipeline per call.
+
+    Args:
+        model: Trained LSTM
+        window: Scaled values of the last sequence_length steps
+
+    Returns:
+        Scaled forecasts, one per horizon
+    """
+    batch = np.asarray(window, dtype=np.float32).reshape(1, -1, 1)
+    return np.asarray(model(batch, training=False), dtype=np.float64)[0]
+
+def _symbol_prefix(symbol: str) -> str:
+    safe_symbol = re.sub(r'[^A-Za-z0-9._-]', '_', symbol.upper())
+    return os.path.join(settings.model.cache_dir, 'lstm', f"{safe_symbol}__")
+
+def save_lstm(model: Any, symbol: str) -> str:
+    """
+    Save a symbol's network and remove the files of its previous trainings
+
+    Each save gets a new file name, so a cached predictor still pointing at
+    an older file fails to load instead of pairing its scaler with a
+    different network.
+
+    Args:
+        model: Trained LSTM
+        symbol: Stock symbol
+
+    Returns:
+        Path of the saved model
+    """
+    prefix = _symbol_prefix(symbol)
+    os.makedirs(os.path.dirname(prefix), exist_ok=True)
+    path = f"{prefix}{time.time_ns()}.keras"
+    model.save(path)
+    for old_path in glob.glob(f"{glob.escape(prefix)}*.keras"):
+        if old_path != path:
+            try:
+                os.remove(old_path)
+            except OSError:
+                pass
+    return path
+
+def load_lstm(path: str) -> Any:
+    """Load a saved network for inference"""
+    keras = backends.load('tensorflow').keras
+    return keras.models.load_model(path, compile=False)
@@ -1,53 +1,57 @@
 """
 Machine learning models for stock price prediction.
 """
+import os
+import time
 import pandas as pd
 import numpy as np
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.linear_model import LinearRegression
-from sklearn.svm import SVR
-from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
-from sklearn.preprocessing import StandardScaler, MinMaxScaler
-from typing import Dict, Tuple, List, Any
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from typing import Dict, Tuple, List, Any, Optional
+from src.config import get_settings
+from src import backends
+from src.prediction.features import FeatureBuilder, ROLLING_FEATURES, horizon_targets
+from src.prediction import lstm
 import warnings
 warnings.filterwarnings('ignore')
 
-try:
-    import xgboost as xgb
-    XGBOOST_AVAILABLE = True
-except ImportError:
-    XGBOOST_AVAILABLE = False
-    print("XGBoost not available. Install with: pip install xgboost")
+# Availability is probed without importing; backends load on first use
+XGBOOST_AVAILABLE = backends.is_available('xgboost')
+TENSORFLOW_AVAILABLE = backends.is_available('tensorflow')
+STATSMODELS_AVAILABLE = backends.is_available('statsmodels')
 
-try:
-    import tensorflow as tf
-    from tensorflow.keras.models import Sequential
-    from tensorflow.keras.layers import LSTM, Dense, Dropout
-    TENSORFLOW_AVAILABLE = True
-except ImportError:
-    TENSORFLOW_AVAILABLE = False
-    print("TensorFlow not available. Install with: pip install tensorflow")
+settings = get_settings()
 
-try:
-    from statsmodels.tsa.arima.model import ARIMA
-    from statsmodels.tsa.seasonal import seasonal_decompose
-    STATSMODELS_AVAILABLE = True
-except ImportError:
-    STATSMODELS_AVAILABLE = False
-    print("Statsmodels not available. Install with: pip install statsmodels")
+# Bump whenever prepare_features or the model targets change so cached models are not reused
+FEATURE_SET_VERSION = 7
+
+# Rolling-statistic features that are nodes of the indicator graph; request them
+# from calculate_all_indicators to share their windows with the indicators
+MODEL_GRAPH_FEATURES = ROLLING_FEATURES
+
+# Models fed standardized features. The others are invariant to per-feature
+# scaling and take raw features, so the scaler can be updated incrementally
+# without invalidating them.
+SCALED_MODELS = ('svr',)
 
 class StockPredictor:
     """Stock price prediction using multiple ML models"""
     
-    def __init__(self):
+    def __init__(self, symbol: Optional[str] = None):
+        backends.load('sklearn')
+        from src.prediction.incremental import RunningLinearRegression
+        ensemble = backends.load('sklearn', 'sklearn.ensemble')
+        svm = backends.load('sklearn', 'sklearn.svm')
+        preprocessing = backends.load('sklearn', 'sklearn.preprocessing')
+        
         self.models = {
-            'linear_regression': LinearRegression(),
-            'random_forest': RandomForestRegressor(n_estimators=100, random_state=42),
-            'svr': SVR(kernel='rbf', C=1.0, epsilon=0.1)
+            'linear_regression': RunningLinearRegression(),
+            'random_forest': ensemble.RandomForestRegressor(n_estimators=100, random_state=42),
+            'svr': svm.SVR(kernel='rbf', C=1.0, epsilon=0.1)
         }
         
         # Add XGBoost if available
         if XGBOOST_AVAILABLE:
+            xgb = backends.load('xgboost')
             self.models['xgboost'] = xgb.XGBRegressor(
                 n_estimators=100,
                 max_depth=6,
@@ -55,10 +59,16 @@ class StockPredictor:
                 random_state=42
             )
         
-        self.scaler = StandardScaler()
-        self.lstm_scaler = MinMaxScaler()
+        self.symbol = symbol
+        self.scaler = preprocessing.StandardScaler()
+        self.lstm_scaler = preprocessing.MinMaxScaler()
+        self.feature_builder = FeatureBuilder()
+        self.feature_names: List[str] = []
+        self.horizons = sorted(settings.model.forecast_horizons)
+        self.trained_until = None
         self.is_fitted = False
         self.lstm_model = None
+        self.lstm_path = None
         self.arima_model = None
         self.model_descriptions = {
             'linear_regression': 'Linear Regression - Basic trend analysis using linear relationships',
@@ -68,11 +78,20 @@ class StockPredictor:
             'lstm': 'LSTM Neural Network - Deep learning for time series patterns',
             'arima': 'ARIMA - Statistical time series forecasting model'
         }
+    
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle support - Keras models are not picklable; they are reloaded from lstm_path"""
+        state = self.__dict__.copy()
+        state['lstm_model'] = None
+        return state
         
     def prepare_features(self, df: pd.DataFrame, target_col: str = 'close') -> Tuple[pd.DataFrame, pd.Series]:
         """
         Prepare features for machine learning
         
+        The design matrix is built column-wise in one array by FeatureBuilder;
+        df is left unchanged. The feature schema is kept for predict_future.
+        
         Args:
             df: DataFrame with stock data and technical indicators
             target_col: Target column name
@@ -80,119 +99,199 @@ class StockPredictor:
         Returns:
             Tuple of (features, target)
         """
-        # Create feature columns
-        feature_columns = [
-            'open', 'high', 'low', 'volume',
-            'SMA_20', 'SMA_50', 'EMA_12', 'EMA_26',
-            'RSI', 'MACD', 'MACD_Signal', 'MACD_Histogram',
-            'BB_Upper', 'BB_Middle', 'BB_Lower',
-            'Stoch_K', 'Stoch_D', 'ATR', 'ADX',
-            'OBV', 'VWAP', 'Williams_R'
-        ]
-        
-        # Add price-based features
-        df['Price_Change'] = df[target_col].pct_change()
-        df['Price_Change_5d'] = df[target_col].pct_change(5)
-        df['Price_Change_10d'] = df[target_col].pct_change(10)
-        df['Volume_Change'] = df['volume'].pct_change()
-        
-        # Add rolling statistics
-        df['Price_Volatility'] = df[target_col].rolling(window=20).std()
-        df['Volume_SMA'] = df['volume'].rolling(window=20).mean()
-        
-        # Add lag features
-        for lag in [1, 2, 3, 5, 10]:
-            df[f'Price_Lag_{lag}'] = df[target_col].shift(lag)
-            df[f'Volume_Lag_{lag}'] = df['volume'].shift(lag)
-        
-        # Update feature columns
-        feature_columns.extend([
-            'Price_Change', 'Price_Change_5d', 'Price_Change_10d', 'Volume_Change',
-            'Price_Volatility', 'Volume_SMA'
-        ])
-        
-        for lag in [1, 2, 3, 5, 10]:
-            feature_columns.extend([f'Price_Lag_{lag}', f'Volume_Lag_{lag}'])
-        
-        # Select features that exist in the dataframe
-        available_features = [col for col in feature_columns if col in df.columns]
-        
-        # Drop rows with NaN values
-        df_clean = df[available_features + [target_col]].dropna()
-        
-        X = df_clean[available_features]
-        y = df_clean[target_col]
-        
+        self.feature_builder = FeatureBuilder(target_col)
+        X, y = self.feature_builder.training_set(df)
+        self.feature_names = list(X.columns)
         return X, y
     
-    def train_models(self, X: pd.DataFrame, y: pd.Series) -> Dict[str, Any]:
+    def _assign_thread_budgets(self, concurrent_models: int) -> Dict[str, int]:
+        """
+        Split CPU cores between models so concurrent fits don't oversubscribe
+        
+        Only the feature models share the budget; the LSTM and ARIMA are
+        trained after them with every core.
+        
+        Args:
+            concurrent_models: Number of feature models fitted at the same time
+            
+        Returns:
+            Dictionary mapping multi-threaded model names to their thread count
+        """
+        cores = os.cpu_count() or 1
+        threaded = [name for name in ('random_forest', 'xgboost') if name in self.models]
+        if not threaded:
+            return {}
+        
+        # Single-threaded models running alongside each take one core
+        single_threaded = max(0, min(concurrent_models, len(self.models)) - len(threaded))
+        budget = max(1, (cores - single_threaded) // len(threaded)) if concurrent_models > 1 else cores
+        
+        budgets = {}
+        for name in threaded:
+            self.models[name].set_params(n_jobs=budget)
+            budgets[name] = budget
+        return budgets
+    
+    def train_models(self, X: pd.DataFrame, y: pd.Series, mode: Optional[str] = None,
+                     max_workers: Optional[int] = None) -> Dict[str, Any]:
         """
         Train all ML models
         
+        Each model is a direct multi-horizon regressor: it is fitted once on a
+        target matrix holding y 1..h rows ahead for every forecast horizon.
+        
         Args:
             X: Features
-            y: Target values
+            y: Target values (current price; horizon targets are derived from it)
+            mode: 'sequential', 'thread' or 'process' (defaults to settings.model.training_mode)
+            max_workers: Concurrent fits (defaults to settings.model.training_workers, 0 = CPU count)
             
         Returns:
-            Dictionary with training results
+            Dictionary with training results (including per-model 'train_time' in seconds)
         """
-        if len(X) < 50:
+        # Rows whose every horizon target is known
+        Y = horizon_targets(y, self.horizons)
+        known = Y.notna().all(axis=1).to_numpy()
+        X_direct, Y = X[known], Y[known]
+        
+        if len(X_direct) < 50:
             raise ValueError("Not enough data points for training. Need at least 50 samples.")
         
-        # Split data (80% train, 20% test)
-        split_idx = int(len(X) * 0.8)
-        X_train, X_test = X[:split_idx], X[split_idx:]
-        y_train, y_test = y[:split_idx], y[split_idx:]
+        mode = mode or settings.model.training_mode
+        if mode not in ('sequential', 'thread', 'process'):
+            raise ValueError(f"Unknown training mode: {mode}")
+        max_workers = max_workers or settings.model.training_workers or os.cpu_count() or 1
+        
+        # Split data (80% train, 20% test); training targets must not reach into the test period
+        split_idx = int(len(X_direct) * 0.8)
+        train_end = max(split_idx - max(self.horizons), split_idx // 2)
+        X_train, X_test = X_direct[:train_end], X_direct[split_idx:]
+        y_train, y_test = Y[:train_end], Y[split_idx:]
         
-        # Scale features
+        self.models = {name: _direct_model(model) for name, model in self.models.items()}
+        
+        # Scale features (only the scale-sensitive models use them)
         X_train_scaled = self.scaler.fit_transform(X_train)
         X_test_scaled = self.scaler.transform(X_test)
+        raw_args = (X_train.to_numpy(), y_train, X_test.to_numpy(), y_test)
+        scaled_args = (X_train_scaled, y_train, X_test_scaled, y_test)
+        fit_args = {name: scaled_args if name in SCALED_MODELS else raw_args for name in self.models}
+        
+        # Time-series models train on the target series alone
+        series_jobs = {}
+        if TENSORFLOW_AVAILABLE:
+            series_jobs['lstm'] = lambda: self.train_lstm_model(y)
+        if STATSMODELS_AVAILABLE:
+            series_jobs['arima'] = lambda: self.train_arima_model(y)
         
         results = {}
         
-        # Train each model
+        if mode == 'sequential' or max_workers == 1:
+            self._assign_thread_budgets(1)
+            for model_name, model in self.models.items():
+                _, results[model_name] = _fit_and_score(model, *fit_args[model_name])
+        
+        elif mode == 'thread':
+            self._assign_thread_budgets(min(max_workers, len(self.models)))
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {name: executor.submit(_fit_and_score, model, *fit_args[name])
+                           for name, model in self.models.items()}
+                for model_name, future in futures.items():
+                    results[model_name] = future.result()[1]
+        
+        else:
+            # Fitted estimators come back from the workers
+            self._assign_thread_budgets(min(max_workers, len(self.models)))
+            with ProcessPoolExecutor(max_workers=min(max_workers, len(self.models))) as executor:
+                futures = {name: executor.submit(_fit_and_score, model, *fit_args[name])
+                           for name, model in self.models.items()}
+                for model_name, future in futures.items():
+                    try:
+                        self.models[model_name], results[model_name] = future.result()
+                    except Exception as e:
+                        results[model_name] = {'error': str(e)}
+        
+        # The series models use every core themselves (TensorFlow threads, the
+        # ARIMA order search's processes) and keep state on self, so they run
+        # after the budgeted fits instead of alongside them
+        for model_name, job in series_jobs.items():
+            results[model_name] = _timed(job)
+        
+        # Keep the historical ordering of the results dict
+        order = list(self.models) + list(series_jobs)
+        results = {name: results[name] for name in order}
+
+        # update_models only feeds partial_fit the rows after trained_until, so
+        # the purged and hold-out rows are merged in once scoring is done
+        X_rest, Y_rest = X_direct[train_end:], Y[train_end:].to_numpy()
         for model_name, model in self.models.items():
-            try:
-                # Train model
-                model.fit(X_train_scaled, y_train)
-                
-                # Make predictions
-                y_pred = model.predict(X_test_scaled)
-                
-                # Calculate metrics
-                mse = mean_squared_error(y_test, y_pred)
-                mae = mean_absolute_error(y_test, y_pred)
-                r2 = r2_score(y_test, y_pred)
-                
-                results[model_name] = {
-                    'mse': mse,
-                    'mae': mae,
-                    'r2': r2,
-                    'rmse': np.sqrt(mse)
-                }
-                
-            except Exception as e:
-                results[model_name] = {
-                    'error': str(e)
-                }
+            if hasattr(model, 'partial_fit') and 'error' not in results[model_name]:
+                scale = self.scaler.transform if model_name in SCALED_MODELS else np.asarray
+                model.partial_fit(scale(X_rest), Y_rest)
+
+        self.trained_until = X_direct.index[-1]
+        self.is_fitted = True
+        return results
+    
+    def update_models(self, X: pd.DataFrame, y: pd.Series) -> Dict[str, Any]:
+        """
+        Update fitted models with the rows that became trainable since the last fit
         
-        # Train LSTM model if TensorFlow is available
-        if TENSORFLOW_AVAILABLE:
+        A row becomes trainable once its longest-horizon target is known. The
+        scaler is updated with partial_fit; estimators with partial_fit see
+        only the new rows, forests grow extra trees and XGBoost continues
+        boosting on the trailing settings.model.incremental_window rows, and
+        anything else is refit on that window. Cost is bounded by the window,
+        not the history; a full train_models run is still due every
+        retrain interval.
+        
+        Args:
+            X: Features for the full history, built with the trained schema
+            y: Target values
+            
+        Returns:
+            Dictionary with per-model update method, new row count and 'train_time'
+        """
+        if not self.is_fitted:
+            return self.train_models(X, y)
+        
+        Y = horizon_targets(y, self.horizons)
+        known = Y.notna().all(axis=1).to_numpy()
+        new = known & (X.index > self.trained_until)
+        if not new.any():
+            return {}
+        
+        X_new, Y_new = X[new].to_numpy(), Y[new].to_numpy()
+        window = slice(-settings.model.incremental_window, None)
+        X_window, Y_window = X[known].to_numpy()[window], Y[known].to_numpy()[window]
+        self.scaler.partial_fit(X_new)
+        
+        results = {}
+        for model_name, model in self.models.items():
+            start = time.perf_counter()
+            scale = self.scaler.transform if model_name in SCALED_MODELS else (lambda values: values)
             try:
-                lstm_results = self.train_lstm_model(df, target_col)
-                results['lstm'] = lstm_results
+                method = incremental_fit(model, scale(X_new), Y_new, scale(X_window), Y_window,
+                                         settings.model.incremental_estimators)
+                if method is None:
+                    model.fit(scale(X_window), Y_window)
+                    method = 'refit_window'
+                results[model_name] = {'update': method, 'new_rows': len(X_new)}
             except Exception as e:
-                results['lstm'] = {'error': str(e)}
+                results[model_name] = {'error': str(e)}
+            results[model_name]['train_time'] = time.perf_counter() - start
         
-        # Train ARIMA model if statsmodels is available
-        if STATSMODELS_AVAILABLE:
+        # ARIMA filters the new closes into its state without refitting
+        if self.arima_model is not None:
+            start = time.perf_counter()
             try:
-                arima_results = self.train_arima_model(df[target_col])
-                results['arima'] = arima_results
+                added = self.arima_model.append(y)
+                results['arima'] = {'update': 'extend', 'new_rows': added}
             except Exception as e:
                 results['arima'] = {'error': str(e)}
+            results['arima']['train_time'] = time.perf_counter() - start
         
-        self.is_fitted = True
+        self.trained_until = X.index[known][-1]
         return results
     
     def predict(self, X: pd.DataFrame) -> Dict[str, np.ndarray]:
@@ -213,7 +312,7 @@ class StockPredictor:
         
         for model_name, model in self.models.items():
             try:
-                pred = model.predict(X_scaled)
+                pred = model.predict(X_scaled if model_name in SCALED_MODELS else np.asarray(X))
                 predictions[model_name] = pred
             except Exception as e:
                 predictions[model_name] = f"Error: {str(e)}"
@@ -224,39 +323,46 @@ class StockPredictor:
         """
         Predict future stock prices
         
+        Every model returns its whole forecast curve (one value per trained
+        horizon) from a single predict call. The point prediction for ``days``
+        is interpolated on that curve and clamped to the outermost horizons.
+        
         Args:
             df: Historical data with features
             days: Number of days to predict
             
         Returns:
-            Dictionary with predictions and confidence intervals
+            Dictionary with predictions, confidence intervals and per-model
+            'forecast' lists aligned with self.horizons
         """
         if not self.is_fitted:
             raise ValueError("Models must be trained first")
         
-        # Get the latest data point
-        latest_data = df.iloc[-1:].copy()
+        # Features for the latest data point, in the order the models were trained on
+        X_latest = self.feature_builder.latest(df, self.feature_names)
+        X_scaled = self.scaler.transform(X_latest)
+        
+        # Simple confidence interval (using historical volatility)
+        historical_volatility = df['close'].pct_change().std()
+        horizons = np.asarray(self.horizons)
         
         predictions = {}
         
         for model_name, model in self.models.items():
             try:
-                # Prepare features for the latest data point
-                X_latest = latest_data[[col for col in latest_data.columns if col != 'close']].fillna(0)
-                X_scaled = self.scaler.transform(X_latest)
+                # One batched call for all horizons
+                X_model = X_scaled if model_name in SCALED_MODELS else X_latest.to_numpy()
+                forecast = np.asarray(model.predict(X_model), dtype=np.float64).reshape(-1)
+                pred = float(np.interp(days, horizons, forecast))
                 
-                # Make prediction
-                pred = model.predict(X_scaled)[0]
-                
-                # Simple confidence interval (using historical volatility)
-                historical_volatility = df['close'].pct_change().std()
                 confidence_interval = pred * historical_volatility * np.sqrt(days)
                 
                 predictions[model_name] = {
                     'prediction': pred,
                     'confidence_interval': confidence_interval,
                     'upper_bound': pred + confidence_interval,
-                    'lower_bound': pred - confidence_interval
+                    'lower_bound': pred - confidence_interval,
+                    'forecast': forecast.tolist()
                 }
                 
             except Exception as e:
@@ -264,97 +370,295 @@ class StockPredictor:
                     'error': str(e)
                 }
         
+        lstm_model = self._lstm_for_inference()
+        if lstm_model is not None:
+            try:
+                closes = df['close'].to_numpy(dtype=np.float32)[-lstm.SEQUENCE_LENGTH:]
+                if len(closes) < lstm.SEQUENCE_LENGTH:
+                    raise ValueError(f"Need {lstm.SEQUENCE_LENGTH} closes for the LSTM, got {len(closes)}")
+                window = self.lstm_scaler.transform(closes.reshape(-1, 1))
+                forecast = self._lstm_unscale(lstm.lstm_forecast(lstm_model, window))
+                pred = float(np.interp(days, horizons, forecast))
+                confidence_interval = pred * historical_volatility * np.sqrt(days)
+                predictions['lstm'] = {
+                    'prediction': pred,
+                    'confidence_interval': confidence_interval,
+                    'upper_bound': pred + confidence_interval,
+                    'lower_bound': pred - confidence_interval,
+                    'forecast': forecast.tolist()
+                }
+            except Exception as e:
+                predictions['lstm'] = {
+                    'error': str(e)
+                }
+        
+        if self.arima_model is not None:
+            try:
+                # Closes newer than the fitted state are filtered in for this forecast only
+                path = self.arima_model.forecast(int(horizons[-1]), df['close'])
+                forecast = path[horizons - 1]
+                pred = float(np.interp(days, horizons, forecast))
+                confidence_interval = pred * historical_volatility * np.sqrt(days)
+                predictions['arima'] = {
+                    'prediction': pred,
+                    'confidence_interval': confidence_interval,
+                    'upper_bound': pred + confidence_interval,
+                    'lower_bound': pred - confidence_interval,
+                    'forecast': forecast.tolist(),
+                    'forecast_time': self.arima_model.forecast_time
+                }
+            except Exception as e:
+                predictions['arima'] = {
+                    'error': str(e)
+                }
+        
         return predictions
     
-    def train_lstm_model(self, df: pd.DataFrame, target_col: str, sequence_length: int = 60) -> Dict[str, Any]:
+    def _lstm_unscale(self, values: np.ndarray) -> np.ndarray:
+        """Map scaled LSTM outputs of any shape back to prices"""
+        values = np.asarray(values, dtype=np.float64)
+        return self.lstm_scaler.inverse_transform(values.reshape(-1, 1)).reshape(values.shape)
+    
+    def _lstm_for_inference(self) -> Any:
+        """The trained LSTM, reloaded from its per-symbol file after unpickling"""
+        if self.lstm_model is None and self.lstm_path and TENSORFLOW_AVAILABLE:
+            try:
+                self.lstm_model = lstm.load_lstm(self.lstm_path)
+            except Exception as e:
+                print(f"Warning: Could not load LSTM model {self.lstm_path}: {e}")
+                self.lstm_path = None
+        return self.lstm_model
+    
+    def train_lstm_model(self, series: pd.Series) -> Dict[str, Any]:
         """
         Train LSTM model for time series prediction
-        """
-        # Prepare data for LSTM
-        data = df[target_col].values.reshape(-1, 1)
-        scaled_data = self.lstm_scaler.fit_transform(data)
-        
-        # Create sequences
-        X, y = [], []
-        for i in range(sequence_length, len(scaled_data)):
-            X.append(scaled_data[i-sequence_length:i, 0])
-            y.append(scaled_data[i, 0])
-        
-        X, y = np.array(X), np.array(y)
-        X = np.reshape(X, (X.shape[0], X.shape[1], 1))
-        
-        # Split data
-        split_idx = int(len(X) * 0.8)
-        X_train, X_test = X[:split_idx], X[split_idx:]
-        y_train, y_test = y[:split_idx], y[split_idx:]
-        
-        # Build LSTM model
-        model = Sequential()
-        model.add(LSTM(50, return_sequences=True, input_shape=(X_train.shape[1], 1)))
-        model.add(Dropout(0.2))
-        model.add(LSTM(50, return_sequences=False))
-        model.add(Dropout(0.2))
-        model.add(Dense(1))
-        
-        model.compile(optimizer='adam', loss='mean_squared_error')
         
-        # Train model
-        model.fit(X_train, y_train, epochs=50, batch_size=32, verbose=0)
-        
-        # Make predictions
-        predictions = model.predict(X_test)
+        Input windows and targets are strided float32 views of the scaled
+        series and are gathered one batch at a time, so memory beyond the
+        series itself does not grow with its length. The network predicts
+        every forecast horizon directly, stops early on a validation tail
+        of the training rows (on the training loss when the history is too
+        short to spare one) and, when the predictor has a symbol, is saved
+        so cached predictors can reload it.
         
-        # Transform back to original scale
-        predictions = self.lstm_scaler.inverse_transform(predictions)
-        y_test_scaled = self.lstm_scaler.inverse_transform(y_test.reshape(-1, 1))
+        Args:
+            series: Target series
+            
+        Returns:
+            Dictionary with metrics, per-horizon RMSE and epochs run
+        """
+        sequence_length = lstm.SEQUENCE_LENGTH
+        horizons = np.asarray(self.horizons)
+        max_horizon = int(horizons[-1])
+        values = series.to_numpy(dtype=np.float32).reshape(-1, 1)
+        
+        # Rows are windows. Rows before the test split whose targets reach into
+        # it are purged, at most half of them as in train_models
+        rows = len(values) - sequence_length - max_horizon + 1
+        split_idx = int(rows * 0.8)
+        usable = max(split_idx - max_horizon, split_idx // 2)
+        if usable < lstm.LSTM_MIN_TRAIN_ROWS or rows - split_idx < 2:
+            return {'error': f"Not enough data points for the LSTM ({len(values)} rows)"}
+        
+        # A validation tail, purged from the fitted rows in turn, only when the
+        # history leaves enough rows for both
+        val_rows = int(usable * lstm.LSTM_VALIDATION_FRACTION)
+        train_end = usable - val_rows - max_horizon
+        validate = val_rows >= lstm.LSTM_MIN_VALIDATION_ROWS and train_end >= lstm.LSTM_MIN_TRAIN_ROWS
+        if not validate:
+            train_end = usable
+        
+        # Scale on the training period only
+        self.lstm_scaler.fit(values[:train_end + sequence_length])
+        scaled = self.lstm_scaler.transform(values)
+        windows, leads = lstm.lstm_windows(scaled, sequence_length, max_horizon)
+        
+        train_data = lstm.batch_dataset(windows, leads, self.horizons, 0, train_end, shuffle=True)
+        val_data = lstm.batch_dataset(windows, leads, self.horizons, usable - val_rows, usable) if validate else None
+        test_data = lstm.batch_dataset(windows, leads, self.horizons, split_idx, rows)
+        
+        # Build and train LSTM model
+        model = lstm.build_lstm(sequence_length, len(horizons))
+        history = model.fit(train_data, validation_data=val_data, epochs=lstm.LSTM_MAX_EPOCHS,
+                            callbacks=[lstm.early_stopping('val_loss' if validate else 'loss')], verbose=0)
+        
+        # Make predictions and transform back to original scale
+        predictions = self._lstm_unscale(model.predict(test_data, verbose=0))
+        actual = self._lstm_unscale(leads[split_idx:rows][:, horizons - 1])
         
         # Calculate metrics
-        mse = mean_squared_error(y_test_scaled, predictions)
-        mae = mean_absolute_error(y_test_scaled, predictions)
-        r2 = r2_score(y_test_scaled, predictions)
+        sk_metrics = backends.load('sklearn', 'sklearn.metrics')
+        mse = sk_metrics.mean_squared_error(actual, predictions)
+        mae = sk_metrics.mean_absolute_error(actual, predictions)
+        r2 = sk_metrics.r2_score(actual, predictions)
+        horizon_mse = sk_metrics.mean_squared_error(actual, predictions, multioutput='raw_values')
         
         self.lstm_model = model
+        if self.symbol:
+            try:
+                self.lstm_path = lstm.save_lstm(model, self.symbol)
+            except Exception as e:
+                print(f"Warning: Could not save LSTM model for {self.symbol}: {e}")
         
         return {
             'mse': mse,
             'mae': mae,
             'r2': r2,
-            'rmse': np.sqrt(mse)
+            'rmse': np.sqrt(mse),
+            'horizon_rmse': np.sqrt(horizon_mse).tolist(),
+            'epochs': len(history.history['loss']),
+            'validation': validate
         }
     
     def train_arima_model(self, series: pd.Series) -> Dict[str, Any]:
         """
         Train ARIMA model for time series prediction
+        
+        The order comes from the per-symbol cache, or from a parallel
+        information-criterion search that is then cached. After scoring on
+        the hold-out 20% the fitted state is extended over it (no refit), so
+        the model ends at the last observation.
         """
         # Prepare data
         train_size = int(len(series) * 0.8)
         train_data = series[:train_size]
         test_data = series[train_size:]
         
-        # Fit ARIMA model (using auto-selected parameters)
         try:
-            model = ARIMA(train_data, order=(1, 1, 1))
-            fitted_model = model.fit()
+            from src.prediction.arima import ArimaForecaster, arima_orders
+            
+            order = arima_orders.get(self.symbol) if self.symbol else None
+            forecaster = ArimaForecaster(order).fit(train_data)
+            if forecaster.selection is not None and self.symbol:
+                arima_orders.put(self.symbol, forecaster.selection)
             
             # Make predictions
-            predictions = fitted_model.forecast(steps=len(test_data))
+            predictions = forecaster.forecast(len(test_data))
             
             # Calculate metrics
-            mse = mean_squared_error(test_data, predictions)
-            mae = mean_absolute_error(test_data, predictions)
-            r2 = r2_score(test_data, predictions)
+            sk_metrics = backends.load('sklearn', 'sklearn.metrics')
+            mse = sk_metrics.mean_squared_error(test_data, predictions)
+            mae = sk_metrics.mean_absolute_error(test_data, predictions)
+            r2 = sk_metrics.r2_score(test_data, predictions)
             
-            self.arima_model = fitted_model
+            forecaster.append(test_data)
+            self.arima_model = forecaster
             
             return {
                 'mse': mse,
                 'mae': mae,
                 'r2': r2,
-                'rmse': np.sqrt(mse)
+                'rmse': np.sqrt(mse),
+                'order': list(forecaster.order),
+                'order_cached': forecaster.selection is None,
+                'order_search_time': forecaster.selection['search_time'] if forecaster.selection else 0.0,
+                'fit_time': forecaster.fit_time,
+                'forecast_time': forecaster.forecast_time
             }
         except Exception as e:
             return {'error': str(e)}
 
+def _fit_and_score(model: Any, X_train: np.ndarray, y_train: pd.Series,
+                   X_test: np.ndarray, y_test: pd.Series) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Fit one estimator and score it on the hold-out set
+    
+    Module-level so it can run in a process pool.
+    
+    Returns:
+        Tuple of (fitted model, metrics dict with 'train_time')
+    """
+    start = time.perf_counter()
+    try:
+        # Train model
+        model.fit(X_train, y_train)
+        
+        # Make predictions
+        y_pred = model.predict(X_test)
+        
+        # Calculate metrics
+        sk_metrics = backends.load('sklearn', 'sklearn.metrics')
+        mse = sk_metrics.mean_squared_error(y_test, y_pred)
+        mae = sk_metrics.mean_absolute_error(y_test, y_pred)
+        r2 = sk_metrics.r2_score(y_test, y_pred)
+        
+        metrics = {
+            'mse': mse,
+            'mae': mae,
+            'r2': r2,
+            'rmse': np.sqrt(mse)
+        }
+        
+        # Multi-horizon targets: error per horizon as well as the average
+        if np.ndim(y_test) == 2:
+            horizon_mse = sk_metrics.mean_squared_error(y_test, y_pred, multioutput='raw_values')
+            metrics['horizon_rmse'] = np.sqrt(horizon_mse).tolist()
+    except Exception as e:
+        metrics = {
+            'error': str(e)
+        }
+    
+    metrics['train_time'] = time.perf_counter() - start
+    return model, metrics
+
+def incremental_fit(model: Any, X_new: np.ndarray, y_new: np.ndarray, X_recent: np.ndarray,
+                    y_recent: np.ndarray, extra_estimators: int) -> Optional[str]:
+    """
+    Update a fitted estimator without refitting it on the full history
+    
+    Args:
+        model: Fitted estimator
+        X_new, y_new: Rows added since the last fit (for partial_fit)
+        X_recent, y_recent: Trailing window including the new rows (for
+            warm-started forests and continued boosting)
+        extra_estimators: Trees or boosting rounds to add
+        
+    Returns:
+        Update method used, or None if the estimator has no incremental path
+    """
+    if hasattr(model, 'partial_fit'):
+        model.partial_fit(X_new, y_new)
+        return 'partial_fit'
+    
+    params = model.get_params()
+    if 'warm_start' in params and 'n_estimators' in params:
+        model.set_params(warm_start=True, n_estimators=len(model.estimators_) + extra_estimators)
+        model.fit(X_recent, y_recent)
+        model.set_params(warm_start=False)
+        return 'warm_start'
+    
+    if hasattr(model, 'get_booster'):
+        booster = model.get_booster()
+        rounds = params['n_estimators']
+        model.set_params(n_estimators=extra_estimators)
+        model.fit(X_recent, y_recent, xgb_model=booster)
+        # A later full fit trains the configured number of rounds again
+        model.set_params(n_estimators=rounds)
+        return 'boosted'
+    
+    return None
+
+def _direct_model(model: Any) -> Any:
+    """Wrap single-output estimators so one fit/predict covers every horizon"""
+    multioutput = backends.load('sklearn', 'sklearn.multioutput')
+    if isinstance(model, multioutput.MultiOutputRegressor):
+        return model
+    if hasattr(model, '__sklearn_tags__'):
+        native = model.__sklearn_tags__().target_tags.multi_output
+    else:
+        native = model._get_tags().get('multioutput', False)
+    return model if native else multioutput.MultiOutputRegressor(model)
+
+def _timed(job) -> Dict[str, Any]:
+    """Run a training job returning a metrics dict and record its wall-clock time"""
+    start = time.perf_counter()
+    try:
+        metrics = job()
+    except Exception as e:
+        metrics = {'error': str(e)}
+    metrics['train_time'] = time.perf_counter() - start
+    return metrics
+
 def create_ensemble_prediction(predictions: Dict[str, Any]) -> Dict[str, float]:
     """
     Create ensemble prediction from multiple models
@@ -366,10 +670,13 @@ def create_ensemble_prediction(predictions: Dict[str, Any]) -> Dict[str, float]:
         Ensemble prediction with confidence metrics
     """
     valid_predictions = []
+    forecasts = []
     
     for model_name, pred_data in predictions.items():
         if isinstance(pred_data, dict) and 'prediction' in pred_data:
             valid_predictions.append(pred_data['prediction'])
+            if 'forecast' in pred_data:
+                forecasts.append(pred_data['forecast'])
     
     if not valid_predictions:
         return {'error': 'No valid predictions available'}
@@ -378,12 +685,18 @@ def create_ensemble_prediction(predictions: Dict[str, Any]) -> Dict[str, float]:
     ensemble_prediction = np.mean(valid_predictions)
     prediction_std = np.std(valid_predictions)
     
-    return {
+    result = {
         'ensemble_prediction': ensemble_prediction,
         'prediction_std': prediction_std,
         'confidence': max(0, min(1, 1 - prediction_std / ensemble_prediction)) if ensemble_prediction != 0 else 0,
         'num_models': len(valid_predictions)
     }
+    
+    # Forecast curve averaged per horizon
+    if forecasts and len(forecasts) == len(valid_predictions):
+        result['ensemble_forecast'] = np.mean(forecasts, axis=0).tolist()
+    
+    return result
 
 def generate_recommendation(current_price: float, predicted_price: float, confidence: float) -> str:
     """
@@ -0,0 +1,252 @@
+"""
+Persistent per-symbol cache of trained StockPredictor instances.
+"""
+import os
+import re
+import glob
+import time
+import pickle
+import threading
+import pandas as pd
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, Any, Optional, Tuple
+from src.config import get_settings
+from src.prediction.ml_models import StockPredictor, FEATURE_SET_VERSION
+
+settings = get_settings()
+
+def data_watermark(df: pd.DataFrame) -> str:
+    """
+    Identify the data a model was trained on by its last bar
+
+    Args:
+        df: DataFrame with stock data (date index)
+
+    Returns:
+        Filesystem-safe watermark string
+    """
+    if df.empty:
+        return 'empty'
+    try:
+        return pd.Timestamp(df.index[-1]).strftime('%Y%m%d%H%M')
+    except (TypeError, ValueError):
+        return f"rows{len(df)}"
+
+class ModelStore:
+    """
+    Two-level (memory LRU + disk) store of fitted StockPredictor instances.
+
+    Entries are keyed by symbol, feature-set version and data watermark.
+    An entry for the current watermark is reused until it is older than
+    ``retrain_interval``; when newer bars have arrived, the latest entry for
+    the symbol is still reused while it is younger than ``cache_duration``,
+    and after that it is updated incrementally with the new bars until its
+    last full training is older than ``retrain_interval``.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_entries: Optional[int] = None,
+                 cache_duration: Optional[int] = None, retrain_interval: Optional[int] = None):
+        self.cache_dir = cache_dir or settings.model.cache_dir
+        self.max_entries = max_entries or settings.model.max_cached_models
+        self.cache_duration = cache_duration if cache_duration is not None else settings.model.cache_duration
+        self.retrain_interval = retrain_interval if retrain_interval is not None else settings.model.retrain_interval
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(symbol: str, watermark: str) -> str:
+        """Build the cache key for a symbol and data watermark"""
+        safe_symbol = re.sub(r'[^A-Za-z0-9._-]', '_', symbol.upper())
+        return f"{safe_symbol}__v{FEATURE_SET_VERSION}__{watermark}"
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def _remember(self, key: str, entry: Dict[str, Any]) -> None:
+        """Insert an entry into the in-memory LRU, evicting the oldest"""
+        with self._lock:
+            self._memory[key] = entry
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _load(self, key: str) -> Optional[Dict[str, Any]]:
+        """Load an entry from memory, falling back to disk"""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                self._memory.move_to_end(key)
+                return entry
+
+        path = self._path(key)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, 'rb') as f:
+                entry = pickle.load(f)
+        except Exception as e:
+            print(f"Warning: Could not load cached model {path}: {e}")
+            return None
+
+        self._remember(key, entry)
+        return entry
+
+    def _latest_key(self, symbol: str) -> Optional[str]:
+        """Find the most recently trained key for a symbol (any watermark)"""
+        prefix = self.make_key(symbol, '')
+        candidates = {}
+
+        with self._lock:
+            for key, entry in self._memory.items():
+                if key.startswith(prefix):
+                    candidates[key] = entry['trained_at']
+
+        for path in glob.glob(os.path.join(self.cache_dir, f"{glob.escape(prefix)}*.pkl")):
+            key = os.path.basename(path)[:-len('.pkl')]
+            if key not in candidates:
+                candidates[key] = os.path.getmtime(path)
+
+        if not candidates:
+            return None
+        return max(candidates, key=candidates.get)
+
+    def get(self, symbol: str, watermark: str) -> Optional[Dict[str, Any]]:
+        """
+        Get a cached model entry if one is still valid
+
+        Args:
+            symbol: Stock symbol
+            watermark: Watermark of the data the caller is about to use
+
+        Returns:
+            Cache entry dict or None on a miss
+        """
+        now = time.time()
+
+        entry = self._load(self.make_key(symbol, watermark))
+        if entry is not None and now - entry['trained_at'] < self.retrain_interval:
+            return entry
+
+        latest_key = self._latest_key(symbol)
+        if latest_key is not None:
+            entry = self._load(latest_key)
+            if entry is not None and now - entry['trained_at'] < self.cache_duration:
+                return entry
+
+        return None
+
+    def get_updatable(self, symbol: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the latest entry for a symbol if it may be updated incrementally
+
+        Args:
+            symbol: Stock symbol
+
+        Returns:
+            Cache entry whose last full training is younger than
+            ``retrain_interval``, or None
+        """
+        latest_key = self._latest_key(symbol)
+        if latest_key is None:
+            return None
+        entry = self._load(latest_key)
+        if entry is None or time.time() - entry.get('retrained_at', entry['trained_at']) >= self.retrain_interval:
+            return None
+        return entry
+
+    def put(self, symbol: str, watermark: str, predictor: StockPredictor,
+            training_results: Dict[str, Any], retrained_at: Optional[float] = None,
+            update_results: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Store a fitted model in memory and on disk
+
+        Args:
+            symbol: Stock symbol
+            watermark: Watermark of the training data
+            predictor: Fitted StockPredictor
+            training_results: Metrics returned by train_models
+            retrained_at: Time of the last full training (default: now)
+            update_results: Results of the incremental update, if this entry is one
+
+        Returns:
+            The stored cache entry
+        """
+        key = self.make_key(symbol, watermark)
+        now = time.time()
+        entry = {
+            'symbol': symbol.upper(),
+            'watermark': watermark,
+            'trained_at': now,
+            'retrained_at': retrained_at or now,
+            'predictor': predictor,
+            'training_results': training_results,
+            'update_results': update_results
+        }
+        self._remember(key, entry)
+
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Older models for this symbol are superseded
+            prefix = self.make_key(symbol, '')
+            for path in glob.glob(os.path.join(self.cache_dir, f"{glob.escape(prefix)}*.pkl")):
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass  # removed concurrently by another worker
+            tmp_path = f"{self._path(key)}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._path(key))
+        except Exception as e:
+            print(f"Warning: Could not persist model for {symbol}: {e}")
+
+        return entry
+
+    def get_or_train(self, symbol: str, indicators: pd.DataFrame) -> Tuple[StockPredictor, Dict[str, Any], Dict[str, Any]]:
+        """
+        Return a fitted predictor for a symbol, training only on a cache miss
+
+        Args:
+            symbol: Stock symbol
+            indicators: DataFrame with stock data and technical indicators
+
+        Returns:
+            Tuple of (predictor, training results, cache info)
+        """
+        watermark = data_watermark(indicators)
+        entry = self.get(symbol, watermark)
+        cached = entry is not None
+        updated = False
+
+        if cached:
+            predictor = entry['predictor']
+        else:
+            base = self.get_updatable(symbol)
+            if base is not None:
+                # Copy so concurrent readers of the cached predictor are unaffected
+                predictor = pickle.loads(pickle.dumps(base['predictor'], protocol=pickle.HIGHEST_PROTOCOL))
+                X, y = predictor.feature_builder.training_set(indicators, predictor.feature_names)
+                update_results = predictor.update_models(X, y)
+                entry = self.put(symbol, watermark, predictor, base['training_results'],
+                                 retrained_at=base.get('retrained_at', base['trained_at']),
+                                 update_results=update_results)
+                updated = True
+            else:
+                predictor = StockPredictor(symbol)
+                X, y = predictor.prepare_features(indicators)
+                training_results = predictor.train_models(X, y)
+                entry = self.put(symbol, watermark, predictor, training_results)
+
+        cache_info = {
+            'cached': cached,
+            'updated': updated,
+            'model_age_seconds': round(time.time() - entry['trained_at'], 3),
+            'trained_at': datetime.fromtimestamp(entry['trained_at']).isoformat(),
+            'retrained_at': datetime.fromtimestamp(entry.get('retrained_at', entry['trained_at'])).isoformat(),
+            'data_watermark': entry['watermark']
+        }
+        return predictor, entry['training_results'], cache_info
+
+# Global model store instance
+model_store = ModelStore()
@@ -0,0 +1,75 @@
+"""
+End-to-end prediction pipeline shared by the API and background workers.
+"""
+import pandas as pd
+from typing import Dict, Any
+from src.data.marketstack import marketstack_client
+from src.analysis.technical_indicators import calculate_all_indicators
+from src.analysis.indicator_graph import INDICATOR_COLUMNS
+from src.prediction.ml_models import MODEL_GRAPH_FEATURES, create_ensemble_prediction, generate_recommendation
+from src.prediction.model_store import model_store
+
+def run_prediction(symbol: str, days: int = 30) -> Dict[str, Any]:
+    """
+    Fetch data, compute indicators, train (or reuse) models and predict
+
+    Args:
+        symbol: Stock symbol
+        days: Number of days to predict
+
+    Returns:
+        Dictionary with training results, predictions and recommendation
+
+    Raises:
+        LookupError: If no stock data is available for the symbol
+    """
+    return predict_from_data(symbol, marketstack_client.get_stock_data(symbol), days)
+
+def predict_from_data(symbol: str, stock_data: pd.DataFrame, days: int = 30) -> Dict[str, Any]:
+    """
+    The CPU-bound part of run_prediction, for data that was already fetched
+
+    Args:
+        symbol: Stock symbol
+        stock_data: OHLCV DataFrame for the symbol
+        days: Number of days to predict
+
+    Returns:
+        Dictionary with training results, predictions and recommendation
+
+    Raises:
+        LookupError: If stock_data is empty
+    """
+    if stock_data.empty:
+        raise LookupError("Stock data not found")
+
+    # Model rolling features share the Bollinger/volume windows in one graph pass
+    indicators = calculate_all_indicators(stock_data, columns=INDICATOR_COLUMNS + MODEL_GRAPH_FEATURES)
+
+    # Reuse a cached model or prepare features and train
+    predictor, training_results, cache_info = model_store.get_or_train(symbol, indicators)
+
+    # Predict future prices
+    future_predictions = predictor.predict_future(indicators, days=days)
+
+    # Create ensemble prediction
+    ensemble_result = create_ensemble_prediction(future_predictions)
+
+    # Current price
+    current_price = indicators.iloc[-1]['close']
+
+    # Generate recommendation
+    recommendation = generate_recommendation(current_price,
+                                             ensemble_result.get('ensemble_prediction', current_price),
+                                             ensemble_result.get('confidence', 0.5))
+
+    return {
+        "symbol": symbol,
+        "training_results": training_results,
+        "model_cache": cache_info,
+        "forecast_horizons": predictor.horizons,
+        "future_predictions": future_predictions,
+        "ensemble_prediction": ensemble_result,
+        "recommendation": recommendation,
+        "current_price": current_price
+    }
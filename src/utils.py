@@ -0,0 +1,16 @@
+"""
+Small helpers shared across packages.
+"""
+import math
+import numpy as np
+from typing import Any
+
+def json_value(value: Any) -> Any:
+    """Convert NumPy scalars to JSON-safe Python values (NaN becomes None)"""
+    if isinstance(value, (np.bool_, bool)):
+        return bool(value)
+    if isinstance(value, (np.integer, int)):
+        return int(value)
+    if isinstance(value, (np.floating, float)):
+        return None if math.isnan(value) else float(value)
+    return value